@@ -1,10 +1,14 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from api.auth.views import CustomUserViewSet
+from api.v1.accounts.views import CustomUserViewSet
 
+from api.v1.changes.views import ChangeLogViewSet
 from api.v1.product.views import CategoryViewSet, ProductViewSet
+from api.v1.product.async_views import CategoryAsyncView, ProductAsyncView
+from api.v1.reservation.views import ReservationViewSet
 from api.v1.store.views import StoreViewSet
+from api.v1.store.async_views import StoreAsyncView
 
 router = DefaultRouter(trailing_slash=False)
 
@@ -18,10 +22,13 @@ urlpatterns.extend(
         path("user/create/", CustomUserViewSet.as_view({"post": "create"}), name="user-create"),
         path("user/update/<int:pk>/", CustomUserViewSet.as_view({"put": "update"}), name="user-update"),
         path("user/delete/<int:pk>/", CustomUserViewSet.as_view({"delete": "destroy"}), name="user-delete"),
+        path("user/bulk/create/", CustomUserViewSet.as_view({"post": "bulk_create"}), name="user-bulk-create"),
 
 
         # category
         path("category/", CategoryViewSet.as_view({"get": "list"}), name="category-list"),
+        path("category/<int:pk>/", CategoryViewSet.as_view({"get": "retrieve"}), name="category-detail"),
+        path("category/<int:pk>/stats/", CategoryViewSet.as_view({"get": "stats"}), name="category-stats"),
         path("category/create/", CategoryViewSet.as_view({"post": "create"}), name="category-create"),
         path("category/update/<pk>/", CategoryViewSet.as_view({"put": "update"}), name="category-update"),
         path("category/delete/<pk>/", CategoryViewSet.as_view({"delete": "destroy"}), name="category-delete"),
@@ -29,16 +36,44 @@ urlpatterns.extend(
 
         # product
         path("product/", ProductViewSet.as_view({"get": "list"}), name="product-list"),
+        path("product/<int:pk>/", ProductViewSet.as_view({"get": "retrieve"}), name="product-detail"),
         path("product/create/", ProductViewSet.as_view({"post": "create"}), name="product-create"),
         path("product/update/<pk>/", ProductViewSet.as_view({"put": "update"}), name="product-update"),
         path("product/delete/<pk>/", ProductViewSet.as_view({"delete": "destroy"}), name="product-delete"),
+        path("product/search/", ProductViewSet.as_view({"get": "search"}), name="product-search"),
+        path("product/export/", ProductViewSet.as_view({"get": "export"}), name="product-export"),
+        path("product/bulk/create/", ProductViewSet.as_view({"post": "bulk_create"}), name="product-bulk-create"),
+        path("product/bulk/update/", ProductViewSet.as_view({"put": "bulk_update"}), name="product-bulk-update"),
+        path("product/bulk/delete/", ProductViewSet.as_view({"delete": "bulk_destroy"}), name="product-bulk-delete"),
 
 
         # Store
         path("store/", StoreViewSet.as_view({"get": "list"}), name="store-list"),
+        path("store/<int:pk>/", StoreViewSet.as_view({"get": "retrieve"}), name="store-detail"),
+        path("store/<int:pk>/stats/", StoreViewSet.as_view({"get": "stats"}), name="store-stats"),
         path("store/create/", StoreViewSet.as_view({"post": "create"}), name="store-create"),
-        path("store/update/<uuid:pk>/", StoreViewSet.as_view({"put": "update"}), name="store-update"),
-        path("store/delete/<uuid:pk>/", StoreViewSet.as_view({"delete": "delete"}), name="store-delete"),
+        path("store/update/<int:pk>/", StoreViewSet.as_view({"put": "update"}), name="store-update"),
+        path("store/delete/<int:pk>/", StoreViewSet.as_view({"delete": "delete"}), name="store-delete"),
+
+
+        # stock reservations
+        path("reservation/create/", ReservationViewSet.as_view({"post": "create"}), name="reservation-create"),
+        path("reservation/<int:pk>/", ReservationViewSet.as_view({"get": "retrieve"}), name="reservation-detail"),
+        path("reservation/<int:pk>/release/", ReservationViewSet.as_view({"post": "release"}), name="reservation-release"),
+        path("reservation/<int:pk>/commit/", ReservationViewSet.as_view({"post": "commit"}), name="reservation-commit"),
+
+
+        # incremental sync
+        path("changes/", ChangeLogViewSet.as_view({"get": "list"}), name="changes"),
+
+
+        # async read path (ASGI)
+        path("async/category/", CategoryAsyncView.as_view(), name="async-category-list"),
+        path("async/category/<int:pk>/", CategoryAsyncView.as_view(), name="async-category-detail"),
+        path("async/product/", ProductAsyncView.as_view(), name="async-product-list"),
+        path("async/product/<int:pk>/", ProductAsyncView.as_view(), name="async-product-detail"),
+        path("async/store/", StoreAsyncView.as_view(), name="async-store-list"),
+        path("async/store/<int:pk>/", StoreAsyncView.as_view(), name="async-store-detail"),
     ]
 )
 
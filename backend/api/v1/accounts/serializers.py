@@ -0,0 +1,35 @@
+# serializers.py
+
+from rest_framework import serializers
+from apps.accounts.models import CustomUser
+from utils.sparse_fields import SparseFieldsMixin
+
+class CustomUserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = CustomUser
+        fields = [
+            'id', 
+            'role', 
+            'email', 
+            'is_staff', 
+            'is_active'
+        ]
+
+
+class UserBulkItemSerializer(serializers.ModelSerializer):
+    """
+    One user of a bulk import. Email uniqueness is checked for the whole
+    payload at once in apps.accounts.bulk, not per item.
+    """
+    email = serializers.EmailField()
+    password = serializers.CharField(write_only=True)
+
+    class Meta:
+        model = CustomUser
+        fields = [
+            'email', 
+            'password', 
+            'role', 
+            'is_staff', 
+            'is_active'
+        ]
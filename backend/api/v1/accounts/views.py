@@ -6,22 +6,31 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from django.http import Http404
 
+from apps.accounts.bulk import MAX_BULK_USERS, bulk_create_users
 from apps.accounts.models import CustomUser
-from .serializers import CustomUserSerializer
+from apps.common.bulk import BulkResult
+from .serializers import CustomUserSerializer, UserBulkItemSerializer
 from utils.customer_logger import log_error, log_warning
+from utils.db_router import ReplicaReadMixin
+from utils.query_planner import QueryPlanMixin
+from utils.values_serializer import ValuesListMixin
 
 
-class CustomUserViewSet(viewsets.ModelViewSet):
+class CustomUserViewSet(ReplicaReadMixin, QueryPlanMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = CustomUser.objects.all()
     serializer_class = CustomUserSerializer
+    keyset_ordering = ("id",)
     # permission_classes = [permissions.IsAuthenticated]
 
     @swagger_auto_schema(
         method="get",
-        operation_description="Получить список пользователей.",
+        operation_description="Получить список пользователей. fields - список полей через запятую.",
         operation_summary="Получить список пользователей",
         operation_id="list_user",
         tags=["Пользователь"],
+        manual_parameters=[
+            openapi.Parameter("fields", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ],
         responses={
             200: openapi.Response(description="OK - Список пользователей получено успешно."),
             401: openapi.Response(description="Ошибка аутентификации"),
@@ -32,8 +41,7 @@ class CustomUserViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         try:
             queryset = self.get_queryset()
-            serializer = self.get_serializer(queryset, many=True)
-            return Response(serializer.data)
+            return self.get_paginated_response(self.serialize_page(queryset))
         except Exception as ex:
             log_error(self, ex)
             return Response(
@@ -67,6 +75,57 @@ class CustomUserViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+    @swagger_auto_schema(
+        method="post",
+        operation_description=(
+            f"Импорт пользователей пакетом (список объектов с email и password, до {MAX_BULK_USERS} "
+            "за запрос). Пароли хешируются параллельно, подписчики получают одно уведомление. "
+            "Большие списки импортируются командой manage.py import_users."
+        ),
+        operation_summary="Пакетный импорт пользователей",
+        operation_id="bulk_create_user",
+        tags=["Пользователь"],
+        request_body=UserBulkItemSerializer(many=True),
+        responses={
+            201: openapi.Response(description="Created - Все пользователи успешно созданы."),
+            207: openapi.Response(description="Multi-Status - Часть пользователей не создана, см. errors."),
+            400: openapi.Response(description="Bad Request - Некорректный запрос"),
+        },
+    )
+    @action(detail=False, methods=['post'])
+    def bulk_create(self, request, *args, **kwargs):
+        try:
+            items = request.data
+            if not isinstance(items, list):
+                raise ValueError("Ожидается список объектов")
+            if len(items) > MAX_BULK_USERS:
+                raise ValueError(
+                    f"Не более {MAX_BULK_USERS} объектов за запрос, "
+                    "для больших списков используйте manage.py import_users"
+                )
+            result = BulkResult(len(items))
+            rows = []
+            for index, item in enumerate(items):
+                serializer = UserBulkItemSerializer(data=item)
+                if serializer.is_valid():
+                    rows.append((index, serializer.validated_data))
+                else:
+                    result.fail(index, serializer.errors)
+            bulk_create_users(rows, result)
+            if not result.errors:
+                response_status = status.HTTP_201_CREATED
+            elif result.succeeded:
+                response_status = status.HTTP_207_MULTI_STATUS
+            else:
+                response_status = status.HTTP_400_BAD_REQUEST
+            return Response(result.as_dict(), status=response_status)
+        except Exception as ex:
+            log_error(self, ex)
+            return Response(
+                {"Сообщение": str(ex)}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
     @swagger_auto_schema(
         method="get",
         operation_description="Получить профиль пользователя.",
@@ -83,8 +142,7 @@ class CustomUserViewSet(viewsets.ModelViewSet):
     def retrieve(self, request, *args, **kwargs):
         try:
             instance = self.get_object()
-            serializer = self.get_serializer(instance)
-            return Response(serializer.data)
+            return Response(self.serialize_object(instance))
         except Http404 as ex:
             log_warning(self, ex)
             return Response(
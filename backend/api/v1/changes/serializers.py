@@ -0,0 +1,17 @@
+from rest_framework import serializers
+from apps.common.models import ChangeLog
+
+
+
+class ChangeLogSerializer(serializers.ModelSerializer):
+    seq = serializers.IntegerField(source='id', read_only=True)
+
+    class Meta:
+        model = ChangeLog
+        fields = [
+            'seq',
+            'entity',
+            'object_id',
+            'operation',
+            'created_at'
+        ]
@@ -0,0 +1,67 @@
+from rest_framework import viewsets, status
+from rest_framework.response import Response
+from rest_framework.decorators import action
+
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+from apps.common.models import ChangeLog
+from .serializers import ChangeLogSerializer
+from utils.customer_logger import log_error
+from utils.db_router import ReplicaReadMixin
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+
+
+def read_changes(since, limit):
+    """Rows after ``since`` plus whether more are waiting (one extra row is fetched to tell)."""
+    rows = list(ChangeLog.objects.since(since, limit + 1))
+    return rows[:limit], len(rows) > limit
+
+
+def changes_payload(rows, since, has_more):
+    return {
+        "results": ChangeLogSerializer(rows, many=True).data,
+        "last_seq": rows[-1].pk if rows else since,
+        "has_more": has_more,
+    }
+
+
+class ChangeLogViewSet(ReplicaReadMixin, viewsets.GenericViewSet):
+    queryset = ChangeLog.objects.all()
+    serializer_class = ChangeLogSerializer
+    pagination_class = None
+
+    @swagger_auto_schema(
+        method="get",
+        operation_description=(
+            "Получить изменения после указанного номера. Клиент сохраняет last_seq "
+            "и передает его в since при следующей синхронизации; при has_more=true "
+            "запрос повторяется сразу."
+        ),
+        operation_summary="Журнал изменений",
+        tags=["Синхронизация"],
+        manual_parameters=[
+            openapi.Parameter("since", openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=0),
+            openapi.Parameter("limit", openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=DEFAULT_LIMIT),
+        ],
+        responses={
+            200: openapi.Response(description="OK - Изменения успешно получены."),
+            400: openapi.Response(description="Неверный запрос - Некорректные данные"),
+        },
+    )
+    @action(detail=False, methods=['get'])
+    def list(self, request, *args, **kwargs):
+        try:
+            since = int(request.query_params.get("since", 0))
+            limit = int(request.query_params.get("limit", DEFAULT_LIMIT))
+            limit = max(1, min(limit, MAX_LIMIT))
+            rows, has_more = read_changes(since, limit)
+            return Response(changes_payload(rows, since, has_more))
+        except Exception as ex:
+            log_error(self, ex)
+            return Response(
+                {"message": str(ex)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
@@ -0,0 +1,10 @@
+from utils.async_views import AsyncCatalogView
+from .views import CategoryViewSet, ProductViewSet
+
+
+class CategoryAsyncView(AsyncCatalogView):
+    viewset_class = CategoryViewSet
+
+
+class ProductAsyncView(AsyncCatalogView):
+    viewset_class = ProductViewSet
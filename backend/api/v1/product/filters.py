@@ -0,0 +1,33 @@
+import django_filters
+from apps.product.models import Product
+
+ProductCategory = Product.categories.through
+
+
+
+class NumberInFilter(django_filters.BaseInFilter, django_filters.NumberFilter):
+    pass
+
+
+class ProductFilter(django_filters.FilterSet):
+    store = NumberInFilter(field_name='store_id', lookup_expr='in')
+    category = NumberInFilter(method='filter_category')
+    price_min = django_filters.NumberFilter(field_name='price', lookup_expr='gte')
+    price_max = django_filters.NumberFilter(field_name='price', lookup_expr='lte')
+    availability_status = django_filters.BooleanFilter()
+
+    class Meta:
+        model = Product
+        fields = [
+            'store',
+            'category',
+            'price_min',
+            'price_max',
+            'availability_status'
+        ]
+
+    def filter_category(self, queryset, name, value):
+        # a subquery instead of a join: no duplicate rows for products in several categories
+        return queryset.filter(
+            pk__in=ProductCategory.objects.filter(category_id__in=value).values('product_id')
+        )
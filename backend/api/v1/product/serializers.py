@@ -1,8 +1,10 @@
 from rest_framework import serializers
-from apps.product.models import Product, Category
+from apps.product.models import Product, Category, CategoryStats
+from api.v1.store.serializers import StoreSerializer
+from utils.sparse_fields import SparseFieldsMixin
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = [
@@ -11,7 +13,17 @@ class CategorySerializer(serializers.ModelSerializer):
             'description'
         ]
 
-class ProductSerializer(serializers.ModelSerializer):
+class CategoryStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CategoryStats
+        fields = [
+            'category',
+            'product_count',
+            'updated_at'
+        ]
+
+
+class ProductSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     categories = CategorySerializer(many=True, read_only=True)
     
     class Meta:
@@ -26,4 +38,41 @@ class ProductSerializer(serializers.ModelSerializer):
             'categories', 
             'store'
         ]
+        expandable_fields = {
+            'categories': (CategorySerializer, {'many': True}),
+            'store': (StoreSerializer, {}),
+        }
+
+
+class ProductBulkItemSerializer(serializers.ModelSerializer):
+    """
+    One item of a bulk payload. Relations are plain ids here: they are
+    checked for the whole batch at once in apps.product.bulk.
+    """
+    store = serializers.IntegerField()
+    categories = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    class Meta:
+        model = Product
+        fields = [
+            'name', 
+            'description', 
+            'price', 
+            'quantity_in_stock', 
+            'availability_status', 
+            'categories', 
+            'store'
+        ]
+
+
+class ProductBulkUpdateItemSerializer(ProductBulkItemSerializer):
+    id = serializers.IntegerField()
+
+    class Meta(ProductBulkItemSerializer.Meta):
+        fields = ['id'] + ProductBulkItemSerializer.Meta.fields
 
+    def validate(self, attrs):
+        # validated with partial=True, which would otherwise make ``id`` optional
+        if "id" not in attrs:
+            raise serializers.ValidationError({"id": ["This field is required."]})
+        return attrs
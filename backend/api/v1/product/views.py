@@ -1,37 +1,69 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.utils.urls import replace_query_param
 
-from django.http import Http404
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, StreamingHttpResponse
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-from apps.product.models import Category, Product
-from .serializers import CategorySerializer, ProductSerializer
+from apps.common.bulk import BulkResult
+from apps.product.bulk import (
+    MAX_BULK_ITEMS,
+    bulk_create_products,
+    bulk_delete_products,
+    bulk_update_products,
+)
+from apps.product.export import EXPORT_FORMATS, aiter_product_chunks, alines, export_lines, iter_products
+from apps.product.facets import facet_counts
+from apps.product.models import Category, CategoryStats, Product
+from apps.product.search import get_search_index
+from apps.product.stats import rebuild_category_stats
+from apps.store.models import Store
+from .filters import ProductFilter
+from .serializers import (
+    CategorySerializer,
+    CategoryStatsSerializer,
+    ProductBulkItemSerializer,
+    ProductBulkUpdateItemSerializer,
+    ProductSerializer,
+)
 from utils.customer_logger import log_error, log_warning
+from utils.db_router import ReplicaReadMixin
+from utils.pagination import decode_cursor, encode_cursor
+from utils.query_planner import QueryPlanMixin
+from utils.values_serializer import ValuesListMixin
+from utils.response_cache import cache_response, conditional_response
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ReplicaReadMixin, QueryPlanMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    keyset_ordering = ("name", "id")
+    version_keys = ("category",)
     # permission_classes = [permissions.IsAuthenticated]
 
     @swagger_auto_schema(
         method="get",
-        operation_description="Получить список категорий.",
+        operation_description="Получить список категорий. fields - список полей через запятую.",
         operation_summary="Список категорий",
         tags=["Категория"],
+        manual_parameters=[
+            openapi.Parameter("fields", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ],
         responses={
             200: openapi.Response(description="OK - Список категорий успешно получен."),
             400: openapi.Response(description="Неверный запрос - Некорректные данные"),
         },
     )
     @action(detail=False, methods=['get'])
+    @conditional_response
+    @cache_response
     def list(self, request, *args, **kwargs):
         try:
-            queryset = self.get_queryset()
-            serializer = self.get_serializer(queryset, many=True)
-            return Response(serializer.data)
+            queryset = self.filter_queryset(self.get_queryset())
+            return self.get_paginated_response(self.serialize_page(queryset))
         except Exception as ex:
             log_error(self, ex)
             return Response(
@@ -40,6 +72,56 @@ class CategoryViewSet(viewsets.ModelViewSet):
             )
         
 
+    @swagger_auto_schema(
+        method="get",
+        operation_description="Получить информацию о категории.",
+        operation_summary="Информация о категории",
+        tags=["Категория"],
+        responses={
+            200: openapi.Response(description="OK - Информация о категории успешно получена."),
+            404: openapi.Response(description="Не найдено - Категория не найдена"),
+        },
+    )
+    @action(detail=True, methods=['get'])
+    @conditional_response
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            instance = self.get_object()
+            return Response(self.serialize_object(instance))
+        except Http404 as ex:
+            log_warning(self, ex)
+            return Response(
+                {"message": "Категория не найдена"}, 
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+    @swagger_auto_schema(
+        method="get",
+        operation_description="Получить количество продуктов в категории (поддерживается инкрементально).",
+        operation_summary="Статистика категории",
+        tags=["Категория"],
+        responses={
+            200: openapi.Response(description="OK - Статистика категории успешно получена.", schema=CategoryStatsSerializer),
+            404: openapi.Response(description="Не найдено - Категория не найдена"),
+        },
+    )
+    @action(detail=True, methods=['get'])
+    def stats(self, request, *args, **kwargs):
+        try:
+            category = self.get_object()
+            stats = CategoryStats.objects.filter(category=category).first()
+            if stats is None:
+                rebuild_category_stats([category.pk])
+                stats = CategoryStats.objects.get(category=category)
+            return Response(CategoryStatsSerializer(stats).data)
+        except Http404 as ex:
+            log_warning(self, ex)
+            return Response(
+                {"message": "Категория не найдена"}, 
+                status=status.HTTP_404_NOT_FOUND
+            )
+
     @swagger_auto_schema(
         method="put",
         operation_description="Обновить информацию о категории.",
@@ -117,27 +199,56 @@ class CategoryViewSet(viewsets.ModelViewSet):
             )
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(ReplicaReadMixin, QueryPlanMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
+    filterset_class = ProductFilter
+    keyset_ordering = ("name", "id")
+    expand_version_keys = {"categories": "category", "store": "store"}
     # permission_classes = [permissions.IsAuthenticated]
 
+    @property
+    def version_keys(self):
+        # a list narrowed to stores only goes stale when those stores' products change
+        stores = self.request.query_params.get("store", "") if self.action == "list" else ""
+        store_ids = stores.split(",") if stores else []
+        if store_ids and all(store_id.isdigit() for store_id in store_ids):
+            # unknown ids hold no products, they don't need a key of their own
+            existing = Store.objects.filter(pk__in=store_ids).order_by("pk").values_list("pk", flat=True)
+            return (*(f"product:store:{store_id}" for store_id in existing), "category")
+        return ("product", "category")
+
     @swagger_auto_schema(
         method="get",
-        operation_description="Получить список продуктов.",
+        operation_description=(
+            "Получить список продуктов. Фильтры: store и category (id через запятую), "
+            "price_min, price_max, availability_status. С facets=1 в ответ добавляются "
+            "количества по магазинам, категориям и ценовым диапазонам. "
+            "fields - список полей через запятую, expand - store и/или categories "
+            "вложенными объектами."
+        ),
         operation_summary="Список продуктов",
         tags=["Продукт"],
+        manual_parameters=[
+            openapi.Parameter("facets", openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN, default=False),
+            openapi.Parameter("fields", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter("expand", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ],
         responses={
             200: openapi.Response(description="OK - Список продуктов успешно получен."),
             400: openapi.Response(description="Неверный запрос - Некорректные данные"),
         },
     )
     @action(detail=False, methods=['get'])
+    @conditional_response
+    @cache_response
     def list(self, request, *args, **kwargs):
         try:
-            queryset = self.get_queryset()
-            serializer = self.get_serializer(queryset, many=True)
-            return Response(serializer.data)
+            queryset = self.filter_queryset(self.get_queryset())
+            response = self.get_paginated_response(self.serialize_page(queryset))
+            if request.query_params.get("facets") in ("1", "true", "True"):
+                response.data["facets"] = facet_counts(self.filter_queryset(Product.objects.all()))
+            return response
         except Exception as ex:
             log_error(self, ex)
             return Response(
@@ -146,6 +257,91 @@ class ProductViewSet(viewsets.ModelViewSet):
             )
 
 
+    @swagger_auto_schema(
+        method="get",
+        operation_description="Получить информацию о продукте. Параметры fields и expand как в списке.",
+        operation_summary="Информация о продукте",
+        tags=["Продукт"],
+        manual_parameters=[
+            openapi.Parameter("fields", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter("expand", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ],
+        responses={
+            200: openapi.Response(description="OK - Информация о продукте успешно получена."),
+            404: openapi.Response(description="Не найдено - Продукт не найден"),
+        },
+    )
+    @action(detail=True, methods=['get'])
+    @conditional_response
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            instance = self.get_object()
+            return Response(self.serialize_object(instance))
+        except Http404 as ex:
+            log_warning(self, ex)
+            return Response(
+                {"message": "Продукт не найден"}, 
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+    @swagger_auto_schema(
+        method="get",
+        operation_description=(
+            "Полнотекстовый поиск по названию и описанию продукта и названиям его категорий. "
+            "Слова запроса ищутся по префиксу, результаты отсортированы по релевантности."
+        ),
+        operation_summary="Поиск продуктов",
+        tags=["Продукт"],
+        manual_parameters=[
+            openapi.Parameter("q", openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True),
+            openapi.Parameter("page_size", openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter("cursor", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ],
+        responses={
+            200: openapi.Response(description="OK - Результаты поиска."),
+            400: openapi.Response(description="Неверный запрос - Пустой запрос или некорректный курсор"),
+        },
+    )
+    @action(detail=False, methods=['get'])
+    @conditional_response
+    @cache_response
+    def search(self, request, *args, **kwargs):
+        try:
+            query = request.query_params.get("q", "").strip()
+            if not query:
+                raise ValueError("Параметр q обязателен")
+            index = get_search_index()
+            if index is None:
+                raise ValueError("Поиск не поддерживается этой базой данных")
+
+            paginator = self.paginator
+            page_size = paginator.get_page_size(request)
+            cursor = request.query_params.get(paginator.cursor_query_param)
+            after = decode_cursor(cursor, 2) if cursor else None
+
+            hits = index.search(query, limit=page_size + 1, after=after)
+            page = hits[:page_size]
+            products = self.get_queryset().in_bulk([pk for _, pk in page])
+            serializer = self.get_serializer(
+                [products[pk] for _, pk in page if pk in products], many=True
+            )
+
+            next_link = None
+            if len(hits) > page_size:
+                next_link = replace_query_param(
+                    request.build_absolute_uri(),
+                    paginator.cursor_query_param,
+                    encode_cursor(page[-1]),
+                )
+            return Response({"next": next_link, "results": serializer.data})
+        except Exception as ex:
+            log_error(self, ex)
+            return Response(
+                {"message": str(ex.detail) if hasattr(ex, "detail") else str(ex)}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
     @swagger_auto_schema(
         method="post",
         operation_description="Создать продукт.",
@@ -219,4 +415,148 @@ class ProductViewSet(viewsets.ModelViewSet):
             return Response(
                 {"message": "Продукт не найден"}, 
                 status=status.HTTP_404_NOT_FOUND
-            )
\ No newline at end of file
+            )
+
+    def validate_bulk_items(self, serializer_class, items, result, partial=False):
+        rows = []
+        for index, item in enumerate(items):
+            serializer = serializer_class(data=item, partial=partial)
+            if serializer.is_valid():
+                rows.append((index, serializer.validated_data))
+            else:
+                result.fail(index, serializer.errors)
+        return rows
+
+    def check_bulk_payload(self, items):
+        if not isinstance(items, list):
+            raise ValueError("Ожидается список объектов")
+        if len(items) > MAX_BULK_ITEMS:
+            raise ValueError(f"Не более {MAX_BULK_ITEMS} объектов за запрос")
+
+    def bulk_response(self, result, success_status=status.HTTP_200_OK):
+        if not result.errors:
+            response_status = success_status
+        elif result.succeeded:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(result.as_dict(), status=response_status)
+
+    @swagger_auto_schema(
+        method="post",
+        operation_description="Создать продукты пакетом (список объектов, до 50000 за запрос).",
+        operation_summary="Пакетное создание продуктов",
+        tags=["Продукт"],
+        request_body=ProductBulkItemSerializer(many=True),
+        responses={
+            201: openapi.Response(description="Created - Все продукты успешно созданы."),
+            207: openapi.Response(description="Multi-Status - Часть продуктов не создана, см. errors."),
+            400: openapi.Response(description="Неверный запрос - Некорректные данные"),
+        },
+    )
+    @action(detail=False, methods=['post'])
+    def bulk_create(self, request, *args, **kwargs):
+        try:
+            self.check_bulk_payload(request.data)
+            result = BulkResult(len(request.data))
+            rows = self.validate_bulk_items(ProductBulkItemSerializer, request.data, result)
+            bulk_create_products(rows, result)
+            return self.bulk_response(result, status.HTTP_201_CREATED)
+        except Exception as ex:
+            log_error(self, ex)
+            return Response(
+                {"message": str(ex)}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    @swagger_auto_schema(
+        method="put",
+        operation_description="Обновить продукты пакетом (список объектов с id, до 50000 за запрос).",
+        operation_summary="Пакетное обновление продуктов",
+        tags=["Продукт"],
+        request_body=ProductBulkUpdateItemSerializer(many=True),
+        responses={
+            200: openapi.Response(description="OK - Все продукты успешно обновлены."),
+            207: openapi.Response(description="Multi-Status - Часть продуктов не обновлена, см. errors."),
+            400: openapi.Response(description="Неверный запрос - Некорректные данные"),
+        },
+    )
+    @action(detail=False, methods=['put'])
+    def bulk_update(self, request, *args, **kwargs):
+        try:
+            self.check_bulk_payload(request.data)
+            result = BulkResult(len(request.data))
+            rows = self.validate_bulk_items(
+                ProductBulkUpdateItemSerializer, request.data, result, partial=True
+            )
+            bulk_update_products(rows, result)
+            return self.bulk_response(result)
+        except Exception as ex:
+            log_error(self, ex)
+            return Response(
+                {"message": str(ex)}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    @swagger_auto_schema(
+        method="delete",
+        operation_description="Удалить продукты пакетом (список id, до 50000 за запрос).",
+        operation_summary="Пакетное удаление продуктов",
+        tags=["Продукт"],
+        request_body=openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER)),
+        responses={
+            204: openapi.Response(description="No Content - Все продукты успешно удалены."),
+            207: openapi.Response(description="Multi-Status - Часть продуктов не найдена, см. errors."),
+            404: openapi.Response(description="Not Found - Продукты не найдены"),
+        },
+    )
+    @action(detail=False, methods=['delete'])
+    def bulk_destroy(self, request, *args, **kwargs):
+        try:
+            self.check_bulk_payload(request.data)
+            ids = [int(pk) for pk in request.data]
+            result = BulkResult(len(ids))
+            bulk_delete_products(ids, result)
+            if not result.errors:
+                return Response(status=status.HTTP_204_NO_CONTENT)
+            return self.bulk_response(result)
+        except Exception as ex:
+            log_error(self, ex)
+            return Response(
+                {"message": str(ex)}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    @swagger_auto_schema(
+        method="get",
+        operation_description="Выгрузить весь каталог продуктов потоком (NDJSON или CSV) с id магазина и категорий.",
+        operation_summary="Экспорт продуктов",
+        tags=["Продукт"],
+        manual_parameters=[
+            openapi.Parameter(
+                "type", openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                enum=[*EXPORT_FORMATS], default="ndjson",
+            ),
+        ],
+        responses={
+            200: openapi.Response(description="OK - Выгрузка продуктов."),
+            400: openapi.Response(description="Неверный запрос - Неизвестный формат"),
+        },
+    )
+    @action(detail=False, methods=['get'])
+    def export(self, request, *args, **kwargs):
+        export_type = request.query_params.get("type", "ndjson")
+        if export_type not in EXPORT_FORMATS:
+            return Response(
+                {"message": f"Неизвестный формат: {export_type}"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        content_type, header, render_lines = EXPORT_FORMATS[export_type]
+        if isinstance(request._request, ASGIRequest):
+            # ASGI reads a sync iterator to the end before sending anything
+            lines = alines(header, render_lines, aiter_product_chunks())
+        else:
+            lines = export_lines(header, render_lines, iter_products())
+        response = StreamingHttpResponse(lines, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="products.{export_type}"'
+        return response
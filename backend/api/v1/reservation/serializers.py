@@ -0,0 +1,37 @@
+from rest_framework import serializers
+from apps.product.models import Reservation, ReservationItem
+
+
+
+class ReservationItemSerializer(serializers.ModelSerializer):
+    product = serializers.IntegerField(source='product_id')
+    quantity = serializers.IntegerField(min_value=1)
+
+    class Meta:
+        model = ReservationItem
+        fields = [
+            'product',
+            'quantity'
+        ]
+
+
+class ReservationSerializer(serializers.ModelSerializer):
+    items = ReservationItemSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Reservation
+        fields = [
+            'id',
+            'status',
+            'items',
+            'created_at',
+            'expires_at'
+        ]
+
+
+class ReserveSerializer(serializers.Serializer):
+    items = ReservationItemSerializer(many=True, allow_empty=False)
+    ttl = serializers.IntegerField(
+        min_value=1, required=False,
+        help_text="Через сколько секунд неподтвержденный резерв возвращается на склад",
+    )
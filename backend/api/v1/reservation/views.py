@@ -0,0 +1,147 @@
+from rest_framework import viewsets, status
+from rest_framework.response import Response
+from rest_framework.decorators import action
+
+from django.http import Http404
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+from apps.product.models import Reservation
+from apps.product.stock import InsufficientStock, ReservationStateError, commit, release, reserve
+from .serializers import ReservationSerializer, ReserveSerializer
+from utils.customer_logger import log_error, log_warning
+from utils.db_router import ReplicaReadMixin
+
+
+class ReservationViewSet(ReplicaReadMixin, viewsets.GenericViewSet):
+    """
+    Stock reservations: the only way to change ``quantity_in_stock`` under
+    concurrency without losing updates, unlike a PUT of the whole product.
+    """
+    queryset = Reservation.objects.prefetch_related('items')
+    serializer_class = ReservationSerializer
+    pagination_class = None
+
+    def state_error(self, ex):
+        if ex.status is None:
+            return Response({"message": str(ex)}, status=status.HTTP_404_NOT_FOUND)
+        return Response(
+            {"message": str(ex), "status": ex.status},
+            status=status.HTTP_409_CONFLICT
+        )
+
+    @swagger_auto_schema(
+        method="post",
+        operation_description=(
+            "Зарезервировать товары: все позиции списываются со склада в одной транзакции "
+            "или не списывается ничего. Товар с нулевым остатком становится недоступным."
+        ),
+        operation_summary="Резервирование товаров",
+        tags=["Резерв"],
+        request_body=ReserveSerializer,
+        responses={
+            201: openapi.Response(description="Created - Товары зарезервированы.", schema=ReservationSerializer),
+            400: openapi.Response(description="Неверный запрос - Некорректные данные"),
+            409: openapi.Response(description="Conflict - Недостаточно товара, см. shortages"),
+        },
+    )
+    @action(detail=False, methods=['post'])
+    def create(self, request, *args, **kwargs):
+        try:
+            serializer = ReserveSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            data = serializer.validated_data
+            items = [(item['product_id'], item['quantity']) for item in data['items']]
+            user = request.user if request.user.is_authenticated else None
+            reservation = reserve(items, user=user, ttl=data.get('ttl'))
+            return Response(
+                ReservationSerializer(reservation).data,
+                status=status.HTTP_201_CREATED
+            )
+        except InsufficientStock as ex:
+            return Response(
+                {
+                    "message": str(ex),
+                    "shortages": [
+                        {"product": product_id, "available": available}
+                        for product_id, available in ex.shortages.items()
+                    ],
+                },
+                status=status.HTTP_409_CONFLICT
+            )
+        except Exception as ex:
+            log_error(self, ex)
+            return Response(
+                {"message": str(ex)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    @swagger_auto_schema(
+        method="get",
+        operation_description="Получить резерв.",
+        operation_summary="Информация о резерве",
+        tags=["Резерв"],
+        responses={
+            200: openapi.Response(description="OK - Резерв успешно получен."),
+            404: openapi.Response(description="Не найдено - Резерв не найден"),
+        },
+    )
+    @action(detail=True, methods=['get'])
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            return Response(self.get_serializer(self.get_object()).data)
+        except Http404 as ex:
+            log_warning(self, ex)
+            return Response(
+                {"message": "Резерв не найден"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+    @swagger_auto_schema(
+        method="post",
+        operation_description="Отменить резерв и вернуть товары на склад.",
+        operation_summary="Отмена резерва",
+        tags=["Резерв"],
+        responses={
+            200: openapi.Response(description="OK - Товары возвращены на склад."),
+            404: openapi.Response(description="Не найдено - Резерв не найден"),
+            409: openapi.Response(description="Conflict - Резерв уже подтвержден или отменен"),
+        },
+    )
+    @action(detail=True, methods=['post'])
+    def release(self, request, pk=None, *args, **kwargs):
+        try:
+            return Response(self.get_serializer(release(int(pk))).data)
+        except ReservationStateError as ex:
+            return self.state_error(ex)
+        except Exception as ex:
+            log_error(self, ex)
+            return Response(
+                {"message": str(ex)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    @swagger_auto_schema(
+        method="post",
+        operation_description="Подтвердить резерв: товары проданы и не вернутся на склад.",
+        operation_summary="Подтверждение резерва",
+        tags=["Резерв"],
+        responses={
+            200: openapi.Response(description="OK - Резерв подтвержден."),
+            404: openapi.Response(description="Не найдено - Резерв не найден"),
+            409: openapi.Response(description="Conflict - Резерв уже подтвержден или отменен"),
+        },
+    )
+    @action(detail=True, methods=['post'])
+    def commit(self, request, pk=None, *args, **kwargs):
+        try:
+            return Response(self.get_serializer(commit(int(pk))).data)
+        except ReservationStateError as ex:
+            return self.state_error(ex)
+        except Exception as ex:
+            log_error(self, ex)
+            return Response(
+                {"message": str(ex)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
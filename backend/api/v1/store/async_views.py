@@ -0,0 +1,6 @@
+from utils.async_views import AsyncCatalogView
+from .views import StoreViewSet
+
+
+class StoreAsyncView(AsyncCatalogView):
+    viewset_class = StoreViewSet
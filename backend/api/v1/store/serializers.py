@@ -1,9 +1,11 @@
 from rest_framework import serializers
-from apps.store.models import Store
+from apps.store.models import Store, StoreStats
+from api.v1.accounts.serializers import CustomUserSerializer
+from utils.sparse_fields import SparseFieldsMixin
 
 
 
-class StoreSerializer(serializers.ModelSerializer):
+class StoreSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Store
         fields = [
@@ -12,3 +14,19 @@ class StoreSerializer(serializers.ModelSerializer):
             'locations', 
             'manager'
         ]
+        expandable_fields = {
+            'manager': (CustomUserSerializer, {}),
+        }
+
+
+class StoreStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StoreStats
+        fields = [
+            'store',
+            'product_count',
+            'available_count',
+            'units_in_stock',
+            'inventory_value',
+            'updated_at'
+        ]
@@ -6,32 +6,48 @@ from django.http import Http404
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-from apps.store.models import Store
-from .serializers import StoreSerializer
+from apps.product.stats import rebuild_store_stats
+from apps.store.models import Store, StoreStats
+from .serializers import StoreSerializer, StoreStatsSerializer
 from utils.customer_logger import log_error, log_warning
+from utils.db_router import ReplicaReadMixin
+from utils.query_planner import QueryPlanMixin
+from utils.values_serializer import ValuesListMixin
+from utils.response_cache import cache_response, conditional_response
 
 
-class StoreViewSet(viewsets.ModelViewSet):
+class StoreViewSet(ReplicaReadMixin, QueryPlanMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Store.objects.all()
     serializer_class = StoreSerializer
+    keyset_ordering = ("name", "id")
+    version_keys = ("store",)
+    expand_version_keys = {"manager": "user"}
     # permission_classes = [permissions.IsAuthenticated]
 
     @swagger_auto_schema(
         method="get",
-        operation_description="Получить список магазинов.",
+        operation_description=(
+            "Получить список магазинов. fields - список полей через запятую, "
+            "expand=manager - менеджер вложенным объектом."
+        ),
         operation_summary="Список магазинов",
         tags=["Магазин"],
+        manual_parameters=[
+            openapi.Parameter("fields", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter("expand", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ],
         responses={
             200: openapi.Response(description="OK - Список магазинов успешно получен."),
             400: openapi.Response(description="Неверный запрос - Некорректные данные"),
         },
     )
     @action(detail=False, methods=['get'])
+    @conditional_response
+    @cache_response
     def list(self, request, *args, **kwargs):
         try:
-            queryset = self.get_queryset()
-            serializer = self.get_serializer(queryset, many=True)
-            return Response(serializer.data)
+            queryset = self.filter_queryset(self.get_queryset())
+            return self.get_paginated_response(self.serialize_page(queryset))
         except Exception as ex:
             log_error(self, ex)
             return Response(
@@ -41,20 +57,25 @@ class StoreViewSet(viewsets.ModelViewSet):
 
     @swagger_auto_schema(
         method="get",
-        operation_description="Получить информацию о магазине.",
+        operation_description="Получить информацию о магазине. Параметры fields и expand как в списке.",
         operation_summary="Информация о магазине",
         tags=["Магазин"],
+        manual_parameters=[
+            openapi.Parameter("fields", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter("expand", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ],
         responses={
             200: openapi.Response(description="OK - Информация о магазине успешно получена."),
             404: openapi.Response(description="Не найдено - Магазин не найден"),
         },
     )
     @action(detail=True, methods=['get'])
+    @conditional_response
+    @cache_response
     def retrieve(self, request, *args, **kwargs):
         try:
             instance = self.get_object()
-            serializer = self.get_serializer(instance)
-            return Response(serializer.data)
+            return Response(self.serialize_object(instance))
         except Http404 as ex:
             log_warning(self, ex)
             return Response(
@@ -62,6 +83,35 @@ class StoreViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
+    @swagger_auto_schema(
+        method="get",
+        operation_description=(
+            "Получить сводку по товарам магазина: количество товаров, доступных товаров, "
+            "единиц на складе и стоимость запасов. Значения поддерживаются инкрементально."
+        ),
+        operation_summary="Статистика магазина",
+        tags=["Магазин"],
+        responses={
+            200: openapi.Response(description="OK - Статистика магазина успешно получена.", schema=StoreStatsSerializer),
+            404: openapi.Response(description="Не найдено - Магазин не найден"),
+        },
+    )
+    @action(detail=True, methods=['get'])
+    def stats(self, request, *args, **kwargs):
+        try:
+            store = self.get_object()
+            stats = StoreStats.objects.filter(store=store).first()
+            if stats is None:
+                rebuild_store_stats([store.pk])
+                stats = StoreStats.objects.get(store=store)
+            return Response(StoreStatsSerializer(stats).data)
+        except Http404 as ex:
+            log_warning(self, ex)
+            return Response(
+                {"message": "Магазин не найден"}, 
+                status=status.HTTP_404_NOT_FOUND
+            )
+
     @swagger_auto_schema(
         method="put",
         operation_description="Обновить информацию о магазине.",
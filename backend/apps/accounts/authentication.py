@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .models import CustomUser
+
+
+def auth_cache():
+    return caches[getattr(settings, "AUTH_CACHE_ALIAS", "auth")]
+
+
+def _key(user_id):
+    return f"user:{user_id}"
+
+
+def cached_user(user_id):
+    """
+    The CustomUser with primary key ``user_id``, from the auth cache when
+    it is there, or None. Entries expire after the cache's TIMEOUT and are
+    dropped by apps.accounts.signals whenever the user is saved, deleted or
+    has a token blacklisted - in this process's cache only, unless the
+    ``auth`` cache is shared (see AUTH_CACHE_BACKEND in core.settings).
+    """
+    cache = auth_cache()
+    key = _key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = CustomUser._default_manager.filter(pk=user_id).first()
+        if user is not None:
+            cache.set(key, user)
+    return user
+
+
+def forget_user(user_id):
+    auth_cache().delete(_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that reads the token's user through ``cached_user``."""
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_FIELD not in ("pk", CustomUser._meta.pk.name):
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            user = cached_user(user_id)
+        except (TypeError, ValueError):
+            user = None
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend whose ``get_user`` goes through ``cached_user``: the
+    session lookup of AuthenticationMiddleware and of the channels
+    AuthMiddlewareStack on WebSocket connects.
+    """
+
+    def get_user(self, user_id):
+        try:
+            user = cached_user(user_id)
+        except (TypeError, ValueError):
+            return None
+        return user if user is not None and self.user_can_authenticate(user) else None
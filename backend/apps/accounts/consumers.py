@@ -1,25 +1,95 @@
-from channels.generic.websocket import WebsocketConsumer
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
 import json
-from asgiref.sync import async_to_sync
 
-class NotificationConsumer(WebsocketConsumer):
-    def connect(self):
-        self.group_name = 'user_notifications'
-        async_to_sync(self.channel_layer.group_add)(
+from api.v1.changes.views import MAX_LIMIT, changes_payload, read_changes
+from utils.realtime import TOPIC_RE, bind_consumer_loop, topic_group
+
+MAX_TOPICS = 100
+
+
+class NotificationConsumer(AsyncWebsocketConsumer):
+    """
+    Pushes user notifications to everyone, plus change deltas for the topics
+    a client subscribes to:
+
+        {"action": "subscribe", "topic": "store:5:products"}
+        {"action": "unsubscribe", "topic": "category:3"}
+
+    After a reconnect a client replays what it missed from the change log
+    and keeps asking while "has_more" is true:
+
+        {"action": "resume", "since": 1042}
+    """
+    group_name = 'user_notifications'
+
+    async def connect(self):
+        self.topics = set()
+        bind_consumer_loop()
+        await self.channel_layer.group_add(
             self.group_name,
             self.channel_name
         )
-        self.accept()
+        await self.accept()
 
-    def disconnect(self, close_code):
-        async_to_sync(self.channel_layer.group_discard)(
+    async def disconnect(self, close_code):
+        await self.channel_layer.group_discard(
             self.group_name,
             self.channel_name
         )
+        for topic in self.topics:
+            await self.channel_layer.group_discard(topic_group(topic), self.channel_name)
+
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            content = json.loads(text_data or '')
+            if content.get('action') == 'resume':
+                return await self.resume(content)
+            action, topic = content['action'], content['topic']
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return await self.send_error('Expected {"action": ..., "topic": ...}')
+
+        if not isinstance(topic, str) or not TOPIC_RE.match(topic):
+            return await self.send_error(f'Unknown topic: {topic}')
+
+        if action == 'subscribe':
+            if topic not in self.topics and len(self.topics) >= MAX_TOPICS:
+                return await self.send_error(f'At most {MAX_TOPICS} topics per connection')
+            self.topics.add(topic)
+            await self.channel_layer.group_add(topic_group(topic), self.channel_name)
+        elif action == 'unsubscribe':
+            self.topics.discard(topic)
+            await self.channel_layer.group_discard(topic_group(topic), self.channel_name)
+        else:
+            return await self.send_error(f'Unknown action: {action}')
+        await self.send(text_data=json.dumps({'action': action, 'topic': topic, 'ok': True}))
+
+    async def resume(self, content):
+        since = content.get('since')
+        if not isinstance(since, int) or isinstance(since, bool) or since < 0:
+            return await self.send_error('Expected {"action": "resume", "since": <seq>}')
+        payload = await self.read_changes(since)
+        await self.send(text_data=json.dumps(
+            {'action': 'resume', **payload},
+            ensure_ascii=False,
+        ))
+
+    @database_sync_to_async
+    def read_changes(self, since):
+        rows, has_more = read_changes(since, MAX_LIMIT)
+        return changes_payload(rows, since, has_more)
+
+    async def send_error(self, message):
+        await self.send(text_data=json.dumps({'error': message}))
 
-    def receive(self, text_data):
-        pass
+    async def send_notification(self, event):
+        await self.send(text_data=json.dumps({
+            'message': event['message'],
+            'count': event.get('count', 1),
+        }))
 
-    def send_notification(self, event):
-        message = event['message']
-        self.send(text_data=json.dumps({'message': message}))
+    async def send_deltas(self, event):
+        await self.send(text_data=json.dumps(
+            {'topic': event['topic'], 'deltas': event['deltas']},
+            ensure_ascii=False,
+        ))
@@ -0,0 +1,50 @@
+import csv
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.v1.accounts.serializers import UserBulkItemSerializer
+from apps.accounts.bulk import bulk_create_users
+from apps.common.bulk import BulkResult
+
+
+class Command(BaseCommand):
+    help = (
+        "Import users from a CSV file with an email,password[,role,is_staff,is_active] header. "
+        "Passwords are hashed in a process pool, users are inserted in one transaction and "
+        "subscribers get a single notification."
+    )
+    stealth_options = ("stdin",)
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file, - for stdin")
+        parser.add_argument("--workers", type=int, help="hashing processes, default: all cores")
+
+    def handle(self, *args, **options):
+        if options["workers"] is not None and options["workers"] < 1:
+            raise CommandError("--workers must be positive")
+        try:
+            if options["path"] == "-":
+                items = list(csv.DictReader(options.get("stdin", sys.stdin)))
+            else:
+                with open(options["path"], newline="", encoding="utf-8-sig") as source:
+                    items = list(csv.DictReader(source))
+        except OSError as ex:
+            raise CommandError(ex)
+
+        result = BulkResult(len(items))
+        rows = []
+        for index, item in enumerate(items):
+            # empty cells fall back to the model defaults
+            serializer = UserBulkItemSerializer(data={key: value for key, value in item.items() if key and value})
+            if serializer.is_valid():
+                rows.append((index, serializer.validated_data))
+            else:
+                result.fail(index, serializer.errors)
+        bulk_create_users(rows, result, workers=options["workers"])
+
+        for error in result.as_dict()["errors"]:
+            # line 1 is the header
+            self.stderr.write(f"line {error['index'] + 2}: {error['errors']}")
+        message = f"Imported {result.succeeded} of {len(items)} users"
+        self.stdout.write(self.style.SUCCESS(message) if not result.errors else self.style.WARNING(message))
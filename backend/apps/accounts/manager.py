@@ -1,6 +1,9 @@
 from django.contrib.auth.base_user import BaseUserManager
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 
+BULK_BATCH_SIZE = 1000
+
 
 class UserManager(BaseUserManager):
     def create_user(self, email, role=None, password=None, **extra_fields):
@@ -24,3 +27,31 @@ class UserManager(BaseUserManager):
         extra_fields.setdefault('is_staff', True)
         extra_fields.setdefault('is_active', True)
         return self.create_user(email, password=password, **extra_fields)
+
+    def bulk_create_users(self, rows, workers=None, batch_size=BULK_BATCH_SIZE):
+        """
+        ``create_user`` for many users at once. ``rows`` are dicts with
+        ``email``, ``password`` and optional model fields. Passwords are
+        hashed in a process pool before the transaction starts, users are
+        inserted with ``bulk_create`` and listeners get one
+        ``users_bulk_created`` signal instead of a post_save per user.
+        """
+        from .passwords import hash_passwords
+        from .signals import users_bulk_created
+
+        rows = list(rows)
+        for data in rows:
+            if not data.get("email"):
+                raise ValueError(_('The Email field must be set'))
+            if not data.get("password"):
+                raise ValueError(_("The password must be set"))
+        hashed = hash_passwords([data["password"] for data in rows], workers=workers)
+
+        users = []
+        for data, password in zip(rows, hashed):
+            fields = {key: value for key, value in data.items() if key not in ("email", "password")}
+            users.append(self.model(email=self.normalize_email(data["email"]), password=password, **fields))
+        with transaction.atomic(using=self._db):
+            users = self.bulk_create(users, batch_size=batch_size)
+            users_bulk_created.send(sender=self.model, user_ids=[user.pk for user in users])
+        return users
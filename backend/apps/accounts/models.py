@@ -3,10 +3,11 @@ from django.contrib.auth.base_user import AbstractBaseUser
 from django.contrib.auth.models import PermissionsMixin
 from django.utils.translation import gettext_lazy as _
 from apps.accounts.manager import UserManager
+from apps.common.models import TrackedFieldsMixin
 
 
 
-class CustomUser(AbstractBaseUser, PermissionsMixin):
+class CustomUser(TrackedFieldsMixin, AbstractBaseUser, PermissionsMixin):
 
     ROLE_CHOICES = (
         ('manager', 'Manager'),
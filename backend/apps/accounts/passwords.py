@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _setup_worker():
+    django.setup()
+
+
+def hash_workers():
+    return getattr(settings, "PASSWORD_HASH_WORKERS", None) or os.cpu_count() or 1
+
+
+def _new_pool(workers):
+    # spawn, not fork: the caller may be a threaded server holding locks
+    # and database connections a forked child would inherit
+    context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(workers, mp_context=context, initializer=_setup_worker)
+
+
+def shared_pool():
+    """
+    The ``hash_workers()`` processes this process hashes in, started on
+    first use and kept: starting workers and running ``django.setup()`` in
+    each costs more than hashing an API-sized batch.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _new_pool(hash_workers())
+        return _pool
+
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+
+
+def hash_passwords(passwords, workers=None):
+    """
+    ``make_password`` for every password, spread over a process pool: the
+    hashers are CPU-bound by design and hold the GIL, so threads would not
+    help. Order is kept. A single password, or a single worker, is hashed
+    in this process. Without ``workers`` the batch goes to ``shared_pool``,
+    with it to a pool of its own (``import_users --workers``).
+    """
+    passwords = list(passwords)
+    # resolved here and pickled, so workers hash with this process's settings
+    hash_password = partial(make_password, hasher=get_hasher())
+    size = min(workers or hash_workers(), len(passwords))
+    if size <= 1:
+        return [hash_password(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (size * 4))
+    if workers is not None:
+        with _new_pool(size) as pool:
+            return list(pool.map(hash_password, passwords, chunksize=chunksize))
+    pool = shared_pool()
+    try:
+        return list(pool.map(hash_password, passwords, chunksize=chunksize))
+    except BrokenProcessPool:
+        # a worker died; the next batch starts a fresh pool
+        _discard_pool(pool)
+        raise
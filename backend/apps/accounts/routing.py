@@ -1,10 +1,10 @@
 from django.urls import path
 from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.auth import AuthMiddlewareStack
-from .consumers import UserNotificationConsumer
+from .consumers import NotificationConsumer
 
 websocket_urlpatterns = [
-    path('ws/user-notifications/', UserNotificationConsumer.as_asgi()),
+    path('ws/user-notifications/', NotificationConsumer.as_asgi()),
 ]
 
 application = ProtocolTypeRouter({
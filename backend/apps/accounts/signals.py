@@ -1,17 +1,97 @@
-from django.db.models.signals import post_save
-from django.dispatch import receiver
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from apps.common.models import ChangeLog, ModelVersion
+from utils.realtime import notifications
+from .authentication import forget_user
 from .models import CustomUser
 
+# Sent once per UserManager.bulk_create_users call, which bypasses post_save.
+# Arguments: user_ids.
+users_bulk_created = Signal()
+
+
+def user_created_event(count):
+    if count == 1:
+        message = 'New user has been created!'
+    else:
+        message = f'{count} new users have been created!'
+    return {
+        'type': 'send_notification',
+        'message': message,
+        'count': count,
+    }
+
+
+def notify_users_created(count=1):
+    notifications.add('user_notifications', 'user_created', user_created_event, count=count)
+
+
 @receiver(post_save, sender=CustomUser)
 def send_user_notification(sender, instance, created, **kwargs):
+    # after commit: nobody should hear about a user that gets rolled back,
+    # and the request thread never waits on the channel layer
     if created:
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            'user_notifications',
-            {
-                'type': 'send_notification',
-                'message': 'New user has been created!'
-            }
-        )
\ No newline at end of file
+        transaction.on_commit(notify_users_created)
+
+
+@receiver(users_bulk_created, sender=CustomUser)
+def send_bulk_user_notification(sender, user_ids, **kwargs):
+    # one aggregated notification for the whole import
+    if user_ids:
+        transaction.on_commit(lambda: notify_users_created(len(user_ids)))
+
+
+def user_changed(instance, created):
+    # a login only moves last_login, which is in no API response
+    return created or bool(instance.get_changed_fields().keys() - {'last_login'})
+
+
+@receiver(post_save, sender=CustomUser)
+def bump_user_version(sender, instance, created, **kwargs):
+    # stores embed their manager with ?expand=manager
+    if user_changed(instance, created):
+        ModelVersion.objects.bump('user')
+
+
+@receiver(post_delete, sender=CustomUser)
+def bump_deleted_user_version(sender, instance, **kwargs):
+    ModelVersion.objects.bump('user')
+
+
+@receiver(users_bulk_created, sender=CustomUser)
+def bump_bulk_user_version(sender, user_ids, **kwargs):
+    ModelVersion.objects.bump('user')
+
+
+@receiver(post_save, sender=CustomUser)
+def log_user_save(sender, instance, created, **kwargs):
+    if user_changed(instance, created):
+        ChangeLog.objects.record('user', instance.pk, 'create' if created else 'update')
+
+
+@receiver(users_bulk_created, sender=CustomUser)
+def log_bulk_user_create(sender, user_ids, **kwargs):
+    ChangeLog.objects.record_many('user', user_ids, 'create')
+
+
+@receiver(post_delete, sender=CustomUser)
+def log_user_delete(sender, instance, **kwargs):
+    ChangeLog.objects.record('user', instance.pk, 'delete')
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def forget_cached_user(sender, instance, **kwargs):
+    user_id = instance.pk
+    forget_user(user_id)
+    # again after commit: a request may have cached the old row in between
+    transaction.on_commit(lambda: forget_user(user_id))
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def forget_blacklisted_token_user(sender, instance, created, **kwargs):
+    user_ids = OutstandingToken.objects.filter(pk=instance.token_id).values_list('user_id', flat=True)
+    for user_id in user_ids:
+        if user_id is not None:
+            forget_user(user_id)
@@ -0,0 +1,63 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.accounts.authentication import CachedJWTAuthentication, CachedModelBackend, auth_cache
+
+pytestmark = pytest.mark.django_db
+
+
+def is_cached(user):
+    return auth_cache().get(f"user:{user.pk}") is not None
+
+
+def test_cache_hit_runs_no_queries(manager, django_assert_num_queries):
+    auth = CachedJWTAuthentication()
+    token = AccessToken.for_user(manager)
+    assert auth.get_user(token) == manager
+    assert is_cached(manager)
+    with django_assert_num_queries(0):
+        assert auth.get_user(token) == manager
+        assert CachedModelBackend().get_user(manager.pk) == manager
+
+
+def test_deactivated_user_is_rejected(manager):
+    auth = CachedJWTAuthentication()
+    token = AccessToken.for_user(manager)
+    auth.get_user(token)
+
+    manager.is_active = False
+    manager.save()
+    assert not is_cached(manager)
+    with pytest.raises(AuthenticationFailed):
+        auth.get_user(token)
+    assert CachedModelBackend().get_user(manager.pk) is None
+
+
+def test_deleted_user_is_rejected(manager):
+    auth = CachedJWTAuthentication()
+    token = AccessToken.for_user(manager)
+    auth.get_user(token)
+
+    manager.delete()
+    with pytest.raises(AuthenticationFailed):
+        auth.get_user(token)
+
+
+def test_blacklisting_drops_the_user(manager):
+    refresh = RefreshToken.for_user(manager)
+    CachedJWTAuthentication().get_user(refresh.access_token)
+    assert is_cached(manager)
+
+    refresh.blacklist()
+    assert not is_cached(manager)
+
+
+def test_request_authenticates_from_cache(api_client, manager):
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(manager)}")
+    api_client.get("/api/v1/store/")
+    with CaptureQueriesContext(connection) as queries:
+        assert api_client.get("/api/v1/store/").status_code == 200
+    assert not any('FROM "accounts_customuser"' in query["sql"] for query in queries.captured_queries)
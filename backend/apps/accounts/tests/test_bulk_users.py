@@ -0,0 +1,46 @@
+import pytest
+from django.contrib.auth.hashers import check_password
+
+from apps.accounts import passwords
+from apps.accounts.bulk import MAX_BULK_USERS
+from apps.accounts.models import CustomUser
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def fast_hashing(settings):
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+    settings.PASSWORD_HASH_WORKERS = 1
+
+
+def test_bulk_create(api_client, fast_hashing):
+    response = api_client.post(
+        "/api/v1/user/bulk/create/",
+        [{"email": "a@example.com", "password": "secret-1"}, {"email": "a@example.com", "password": "again"},
+         {"email": "b@example.com", "password": "secret-2"}],
+        format="json",
+    )
+    assert response.status_code == 207
+    assert [error["index"] for error in response.json()["errors"]] == [1]
+    user = CustomUser.objects.get(email="b@example.com")
+    assert user.check_password("secret-2")
+
+
+def test_large_imports_are_sent_to_the_command(api_client):
+    items = [{"email": f"{n}@example.com", "password": "secret"} for n in range(MAX_BULK_USERS + 1)]
+    response = api_client.post("/api/v1/user/bulk/create/", items, format="json")
+    assert response.status_code == 400
+    assert "import_users" in str(response.json())
+    assert not CustomUser.objects.exists()
+
+
+def test_hashing_reuses_one_pool(settings):
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+    settings.PASSWORD_HASH_WORKERS = 2
+    first = passwords.hash_passwords(["one", "two", "three"])
+    pool = passwords.shared_pool()
+    second = passwords.hash_passwords(["four", "five"])
+    assert passwords.shared_pool() is pool
+    assert all(check_password(raw, hashed) for raw, hashed in zip(["one", "two", "three", "four", "five"], first + second))
+    assert first[0].startswith("md5$")
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+
+from apps.accounts.models import CustomUser
+from apps.accounts.signals import user_created_event
+from core.asgi import application
+from utils.realtime import Coalescer
+
+
+def test_coalescer_folds_a_window_into_one_message():
+    @async_to_sync
+    async def scenario():
+        layer = get_channel_layer()
+        channel = await layer.new_channel()
+        await layer.group_add("coalesced", channel)
+        coalescer = Coalescer(window=0.05)
+        for count in (1, 1, 3):
+            coalescer.add("coalesced", "user_created", user_created_event, count=count)
+        message = await asyncio.wait_for(layer.receive(channel), 1)
+        assert message == {"type": "send_notification", "message": "5 new users have been created!", "count": 5}
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(layer.receive(channel), 0.2)
+
+    scenario()
+
+
+@pytest.mark.django_db
+def test_created_users_reach_connected_clients(settings, django_capture_on_commit_callbacks):
+    settings.NOTIFICATION_COALESCE_WINDOW = 0.05
+
+    def create_users():
+        with django_capture_on_commit_callbacks(execute=True):
+            CustomUser.objects.create(email="one@example.com")
+            CustomUser.objects.create(email="two@example.com")
+
+    @async_to_sync
+    async def scenario():
+        communicator = WebsocketCommunicator(application, "/ws/notifications/")
+        connected, _ = await communicator.connect()
+        assert connected
+        await sync_to_async(create_users)()
+        assert await communicator.receive_json_from(timeout=1) == {
+            "message": "2 new users have been created!", "count": 2,
+        }
+        assert await communicator.receive_nothing(timeout=0.2)
+        await communicator.disconnect()
+
+    scenario()
@@ -0,0 +1,6 @@
+from django.contrib import admin
+from .models import ChangeLog, ModelVersion
+
+
+admin.site.register(ModelVersion)
+admin.site.register(ChangeLog)
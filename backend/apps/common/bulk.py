@@ -0,0 +1,29 @@
+BATCH_SIZE = 1000
+
+
+class BulkResult:
+    """Outcome of a bulk request, reported per item index of the payload."""
+
+    def __init__(self, total):
+        self.ids = [None] * total
+        self.errors = []
+
+    def fail(self, index, errors):
+        self.errors.append({"index": index, "errors": errors})
+
+    def fail_batch(self, rows, ex):
+        for index, _ in rows:
+            self.fail(index, {"non_field_errors": [str(ex)]})
+
+    @property
+    def succeeded(self):
+        return sum(pk is not None for pk in self.ids)
+
+    def as_dict(self):
+        self.errors.sort(key=lambda error: error["index"])
+        return {"ids": self.ids, "errors": self.errors}
+
+
+def batches(rows, size=BATCH_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
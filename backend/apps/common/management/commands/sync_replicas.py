@@ -0,0 +1,54 @@
+import os
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the SQLite primary into the SQLite replicas of DATABASE_REPLICAS, for trying "
+        "replica routing locally. With --interval it keeps copying, which makes the replicas "
+        "lag behind the primary by up to that many seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, help="repeat every this many seconds")
+
+    def handle(self, *args, **options):
+        primary = connections[DEFAULT_DB_ALIAS].settings_dict
+        if not primary["ENGINE"].endswith("sqlite3"):
+            raise CommandError("Only SQLite replicas are copied; server replicas follow the primary themselves")
+        aliases = settings.DATABASE_REPLICAS
+        paths = [str(connections[alias].settings_dict["NAME"]) for alias in aliases]
+        if not paths:
+            raise CommandError("No replicas configured, set DB_REPLICAS")
+
+        while True:
+            started = time.perf_counter()
+            self.sync(str(primary["NAME"]), paths)
+            for alias in aliases:
+                # connections of this process would keep reading the replaced file
+                connections[alias].close()
+            self.stdout.write(f"Synced {len(paths)} replicas in {time.perf_counter() - started:.2f}s")
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
+
+    def sync(self, primary_path, paths):
+        source = sqlite3.connect(primary_path)
+        try:
+            for path in paths:
+                # an online backup is a consistent snapshot even while the primary
+                # takes writes; the rename swaps it in for new connections at once
+                staging = f"{path}.sync"
+                target = sqlite3.connect(staging)
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+                os.replace(staging, path)
+        finally:
+            source.close()
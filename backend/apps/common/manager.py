@@ -0,0 +1,49 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+# updated_at of a counter that has never been bumped
+NEVER_BUMPED = datetime(2000, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class ModelVersionManager(models.Manager):
+    def current(self, keys):
+        """
+        Return ``{key: ModelVersion}``. Read-only: a key that was never
+        bumped comes back as an unsaved version 0, only ``bump`` creates rows.
+        """
+        keys = list(dict.fromkeys(keys))
+        versions = {row.key: row for row in self.filter(key__in=keys)}
+        for key in keys:
+            if key not in versions:
+                versions[key] = self.model(key=key, version=0, updated_at=NEVER_BUMPED)
+        return versions
+
+    def bump(self, *keys):
+        now = timezone.now()
+        for key in dict.fromkeys(keys):
+            counter = self.filter(key=key)
+            if counter.update(version=F("version") + 1, updated_at=now):
+                continue
+            try:
+                with transaction.atomic():
+                    self.create(key=key, version=1, updated_at=now)
+            except IntegrityError:
+                # created by a concurrent bump, still has to move forward
+                counter.update(version=F("version") + 1, updated_at=now)
+
+
+class ChangeLogManager(models.Manager):
+    def record(self, entity, object_id, operation):
+        return self.create(entity=entity, object_id=str(object_id), operation=operation)
+
+    def record_many(self, entity, object_ids, operation, batch_size=1000):
+        return self.bulk_create(
+            [self.model(entity=entity, object_id=str(pk), operation=operation) for pk in object_ids],
+            batch_size=batch_size,
+        )
+
+    def since(self, seq, limit):
+        return self.filter(pk__gt=seq).order_by("pk")[:limit]
@@ -0,0 +1,89 @@
+from django.db import models
+from apps.common.manager import ChangeLogManager, ModelVersionManager
+
+
+class TrackedFieldsMixin:
+    """
+    Remembers the column values an instance was loaded with, so signal
+    handlers can tell which fields a save actually changed.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def get_loaded_value(self, attname, default=None):
+        return getattr(self, "_loaded_values", {}).get(attname, default)
+
+    def get_changed_fields(self):
+        """``{attname: new value}`` of the concrete fields that differ from the loaded row."""
+        loaded = getattr(self, "_loaded_values", None)
+        changed = {}
+        for field in self._meta.concrete_fields:
+            value = getattr(self, field.attname)
+            if loaded is None or field.attname not in loaded or loaded[field.attname] != value:
+                changed[field.attname] = value
+        return changed
+
+    def save(self, *args, **kwargs):
+        # post_save receivers run inside super().save() and still see the diff
+        super().save(*args, **kwargs)
+        self.reset_tracked_fields()
+
+    def reset_tracked_fields(self):
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname) for field in self._meta.concrete_fields
+        }
+
+
+class ModelVersion(models.Model):
+    """
+    Monotonic write counter per model ("product") or model slice
+    ("product:store:5"). Bumped on every write, read by the API to build
+    ETags and cache keys without touching the catalog tables.
+    """
+    key = models.CharField(max_length=100, primary_key=True, verbose_name="Key")
+    version = models.BigIntegerField(default=1, verbose_name="Version")
+    updated_at = models.DateTimeField(verbose_name="Updated at")
+
+    objects = ModelVersionManager()
+
+    class Meta:
+        verbose_name = "Model version"
+        verbose_name_plural = "Model versions"
+
+    def __str__(self):
+        return f"{self.key}@{self.version}"
+
+
+
+class ChangeLog(models.Model):
+    """
+    Append-only journal of writes to the synced models; the primary key is
+    the sequence number clients resume from.
+
+    Sequence numbers are handed out at insert time, so on Postgres a long
+    transaction can commit a lower seq after a client has already read a
+    higher one. Writes here are short, but clients that need a hard
+    guarantee should re-read with a small overlap.
+    """
+    OPERATION_CHOICES = (
+        ('create', 'Create'),
+        ('update', 'Update'),
+        ('delete', 'Delete'),
+    )
+    entity = models.CharField(max_length=30, verbose_name="Entity")
+    object_id = models.CharField(max_length=64, verbose_name="Object id")
+    operation = models.CharField(choices=OPERATION_CHOICES, max_length=10, verbose_name="Operation")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created at")
+
+    objects = ChangeLogManager()
+
+    class Meta:
+        verbose_name = "Change"
+        verbose_name_plural = "Change log"
+
+    def __str__(self):
+        return f"#{self.pk} {self.operation} {self.entity}:{self.object_id}"
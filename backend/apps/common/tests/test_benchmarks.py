@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from benchmarks.async_vs_sync import percentile
+from benchmarks.suite import WRITE_ROUTES, latency_stats, read_scenarios, write_payloads
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def data(manager, stores, make_product):
+    return {
+        "product_ids": [make_product().pk for _ in range(3)],
+        "store_ids": [store.pk for store in stores],
+        "user_ids": [manager.pk],
+    }
+
+
+def test_stats():
+    assert percentile([], 99) == 0.0
+    assert percentile([3, 1, 2, 4], 50) == 3
+    assert percentile(range(100), 99) == 98
+    assert latency_stats([0.1, 0.2, 0.3], 1, 2.0) == {
+        "requests": 3, "errors": 1, "rps": 1.5, "p50_ms": 200.0, "p99_ms": 300.0,
+    }
+
+
+def test_read_scenarios_hit_working_endpoints(api_client, data):
+    for name, requests in read_scenarios(data, 2, random.Random(1)).items():
+        for method, path, body in requests:
+            assert api_client.generic(method, path).status_code == 200, name
+
+
+@pytest.mark.parametrize("entity", WRITE_ROUTES)
+def test_write_scenarios_hit_working_endpoints(api_client, data, entity):
+    create, update, delete = WRITE_ROUTES[entity]
+    payload = write_payloads(entity, 0, data, random.Random(1))
+    response = api_client.post(f"/api/v1/{create}", payload, format="json")
+    assert response.status_code == 201, response.content
+    pk = response.json()["id"]
+    # the same change write_scenarios makes
+    changed = {**payload, "role": "manager"} if entity == "user" else {**payload, "name": payload["name"] + " (изм.)"}
+    assert api_client.put(f"/api/v1/{update.format(pk)}", changed, format="json").status_code == 200
+    assert api_client.delete(f"/api/v1/{delete.format(pk)}").status_code in (200, 204)
@@ -0,0 +1,79 @@
+import pytest
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+
+from apps.common.models import ChangeLog
+from core.asgi import application
+
+pytestmark = pytest.mark.django_db
+
+
+def changes(client, since=0, **params):
+    response = client.get("/api/v1/changes/", {"since": since, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_writes_are_journaled(api_client, stores, categories, make_product):
+    since = changes(api_client)["last_seq"]
+    product = make_product(categories=categories[:1])
+    product_id = product.pk
+    product.price = 1
+    product.save()
+    product.delete()
+    stores[0].delete()
+
+    rows = changes(api_client, since)["results"]
+    assert [(row["entity"], row["operation"]) for row in rows] == [
+        ("product", "create"), ("product", "update"), ("product", "update"),
+        ("product", "delete"), ("store", "delete"),
+    ]
+    assert {row["object_id"] for row in rows[:4]} == {str(product_id)}
+    assert [row["seq"] for row in rows] == sorted(row["seq"] for row in rows)
+
+
+def test_clients_sync_in_pages(api_client, make_product):
+    for _ in range(5):
+        make_product()
+    seen, since, calls = [], 0, 0
+    while True:
+        page = changes(api_client, since, limit=2)
+        calls += 1
+        seen += [row["seq"] for row in page["results"]]
+        since = page["last_seq"]
+        if not page["has_more"]:
+            break
+    assert seen == list(ChangeLog.objects.order_by("pk").values_list("pk", flat=True))
+    assert changes(api_client, since) == {"results": [], "last_seq": since, "has_more": False}
+
+
+def test_bulk_writes_are_journaled(api_client, stores):
+    items = [{"name": f"Bulk {n}", "description": "Bulk", "price": "1.00", "quantity_in_stock": 1,
+              "availability_status": True, "store": stores[0].pk} for n in range(3)]
+    since = changes(api_client)["last_seq"]
+    ids = api_client.post("/api/v1/product/bulk/create/", items, format="json").json()["ids"]
+    rows = changes(api_client, since)["results"]
+    assert [(row["object_id"], row["operation"]) for row in rows] == [(str(pk), "create") for pk in ids]
+
+
+def test_bad_since(api_client):
+    assert api_client.get("/api/v1/changes/?since=x").status_code == 400
+
+
+def test_websocket_resume(make_product):
+    make_product()
+    last = ChangeLog.objects.latest("pk").pk
+
+    @async_to_sync
+    async def scenario():
+        communicator = WebsocketCommunicator(application, "/ws/notifications/")
+        await communicator.connect()
+        await communicator.send_json_to({"action": "resume", "since": last - 1})
+        frame = await communicator.receive_json_from()
+        assert frame["action"] == "resume" and frame["last_seq"] == last and not frame["has_more"]
+        assert [row["seq"] for row in frame["results"]] == [last]
+        await communicator.send_json_to({"action": "resume", "since": -1})
+        assert "error" in await communicator.receive_json_from()
+        await communicator.disconnect()
+
+    scenario()
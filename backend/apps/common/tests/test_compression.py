@@ -0,0 +1,101 @@
+import gzip
+import json
+
+import brotli
+import pytest
+import zstandard
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from utils.compression import CODECS, encoded_etag, negotiate_encoding
+
+pytestmark = pytest.mark.django_db
+
+DECODERS = {
+    "gzip": gzip.decompress,
+    "br": brotli.decompress,
+    "zstd": lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+}
+
+
+@pytest.fixture
+def products(categories, make_product):
+    return [make_product(categories=categories[:2]) for _ in range(20)]
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br, zstd", "zstd"),
+    ("gzip, br", "br"),
+    ("gzip;q=1, br;q=0.5", "gzip"),
+    ("*", "zstd"),
+    ("br;q=0, gzip;q=0", None),
+    ("identity", None),
+    ("", None),
+])
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def test_encoded_etag():
+    assert encoded_etag('"abc"', "br") == '"abc-br"'
+    assert encoded_etag('W/"abc"', "br") == 'W/"abc"'
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+def test_list_round_trip(api_client, products, encoding):
+    plain = api_client.get("/api/v1/product/")
+    response = api_client.get("/api/v1/product/", HTTP_ACCEPT_ENCODING=encoding)
+    assert response.status_code == 200
+    assert response["Content-Encoding"] == encoding
+    assert "Accept-Encoding" in response["Vary"]
+    assert int(response["Content-Length"]) == len(response.content) < len(plain.content)
+    assert json.loads(DECODERS[encoding](response.content)) == plain.json()
+
+
+def test_small_responses_stay_plain(api_client):
+    response = api_client.get("/api/v1/product/", HTTP_ACCEPT_ENCODING="gzip")
+    assert len(response.content) < 1024
+    assert not response.has_header("Content-Encoding")
+    assert "Accept-Encoding" in response["Vary"]
+
+
+def test_other_paths_are_not_compressed(client, products):
+    response = client.get("/swagger/?format=openapi", HTTP_ACCEPT_ENCODING="gzip")
+    assert not response.has_header("Content-Encoding")
+
+
+def test_cache_hit_reuses_compressed_body(api_client, products, monkeypatch):
+    codec = CODECS["br"]
+    calls = []
+    compress = codec.compress
+    monkeypatch.setattr(codec, "compress", lambda data: calls.append(data) or compress(data))
+
+    first = api_client.get("/api/v1/product/", HTTP_ACCEPT_ENCODING="br")
+    second = api_client.get("/api/v1/product/", HTTP_ACCEPT_ENCODING="br")
+    assert len(calls) == 1
+    assert second["Content-Encoding"] == "br"
+    assert second.content == first.content
+
+
+def test_wsgi_export_streams_compressed(api_client, products):
+    plain = b"".join(api_client.get("/api/v1/product/export/?type=ndjson").streaming_content)
+    response = api_client.get("/api/v1/product/export/?type=ndjson", HTTP_ACCEPT_ENCODING="gzip")
+    assert response.streaming
+    assert response["Content-Encoding"] == "gzip"
+    assert not response.has_header("Content-Length")
+    assert gzip.decompress(b"".join(response.streaming_content)) == plain
+
+
+@async_to_sync
+async def asgi_get(url, **extra):
+    response = await AsyncClient().get(url, **extra)
+    if response.streaming:
+        return response, b"".join([chunk async for chunk in response.streaming_content])
+    return response, response.content
+
+
+def test_asgi_export_streams_compressed(products):
+    _, plain = asgi_get("/api/v1/product/export/?type=csv")
+    response, body = asgi_get("/api/v1/product/export/?type=csv", headers={"Accept-Encoding": "zstd"})
+    assert response["Content-Encoding"] == "zstd"
+    assert DECODERS["zstd"](body) == plain
@@ -0,0 +1,63 @@
+import io
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+from types import SimpleNamespace
+from unittest import mock
+
+from utils import customer_logger
+from utils.customer_logger import CustomJsonFormatter, RateLimiter, TracebackQueueHandler
+
+
+def queued_logger(name):
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(CustomJsonFormatter())
+    listener = QueueListener(queue.SimpleQueue(), handler)
+    logger = logging.getLogger(name)
+    logger.handlers = [TracebackQueueHandler(listener.queue)]
+    logger.propagate = False
+    listener.start()
+    return logger, listener, stream
+
+
+def test_records_cross_the_queue_as_json_lines():
+    logger, listener, stream = queued_logger("test.customer_logger")
+    try:
+        raise ValueError("Неверная цена")
+    except ValueError as ex:
+        logger.error("Ошибка %s", "запроса", exc_info=ex, extra={"Class": "ProductViewSet.list", "Exception": str(ex)})
+    logger.warning("Продукт не найден")
+    listener.stop()
+
+    error, warning = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert error["message"] == "Ошибка запроса"
+    assert error["Class"] == "ProductViewSet.list" and error["Exception"] == "Неверная цена"
+    assert error["traceback"].startswith("Traceback") and "ValueError: Неверная цена" in error["traceback"]
+    assert "traceback" not in warning and "Неверная" in stream.getvalue()
+
+
+def test_rate_limiter_reports_suppressed_records():
+    limiter = RateLimiter(burst=2, period=60, sample_rate=0)
+    assert [limiter.allow("key")[0] for _ in range(5)] == [True, True, False, False, False]
+    assert limiter.allow("other") == (True, 0)
+    with mock.patch("utils.customer_logger.random.random", return_value=0):
+        limiter.sample_rate = 0.5
+        assert limiter.allow("key") == (True, 3)
+    with mock.patch("utils.customer_logger.time.monotonic", return_value=10**9):
+        assert limiter.allow("key") == (True, 0)
+
+
+def test_view_errors_are_rate_limited():
+    view = SimpleNamespace(action="list")
+    logger = customer_logger.get_logger()
+    with mock.patch.object(logger, "log") as log, \
+            mock.patch.object(customer_logger, "_rate_limiter", RateLimiter(burst=1, period=60, sample_rate=0)):
+        for _ in range(3):
+            customer_logger.log_error(view, ValueError("boom"))
+        customer_logger.log_warning(view, ValueError("boom"))
+    assert log.call_count == 2
+    assert log.call_args_list[0].args[0] == logging.ERROR
+    assert log.call_args_list[0].kwargs["extra"]["Class"] == "SimpleNamespace.list"
+    assert log.call_args_list[1].args[0] == logging.WARNING
@@ -0,0 +1,86 @@
+import pytest
+from django.db import connections, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.common.models import ModelVersion
+from apps.product.models import Product
+from utils.db_router import PIN_COOKIE, ReplicaRouter, RoutingState, _routing, read_from_replica
+
+pytestmark = pytest.mark.django_db(transaction=True, databases=["default", "replica1"])
+
+
+@pytest.fixture(autouse=True)
+def replica(settings):
+    settings.DATABASE_REPLICAS = ["replica1"]
+
+
+@pytest.fixture
+def routing():
+    state = RoutingState()
+    token = _routing.set(state)
+    yield state
+    _routing.reset(token)
+
+
+def queries_by_alias(client, *args, **kwargs):
+    with CaptureQueriesContext(connections["default"]) as primary:
+        with CaptureQueriesContext(connections["replica1"]) as replica:
+            response = client.get(*args, **kwargs)
+    return response, len(primary), len(replica)
+
+
+def test_reads_go_to_the_replica(routing):
+    router = ReplicaRouter()
+    assert router.db_for_read(Product) is None
+    read_from_replica()
+    assert router.db_for_read(Product) == "replica1"
+    # the version counters are bookkeeping, writing them doesn't pin
+    assert router.db_for_write(ModelVersion) == "default"
+    assert router.db_for_read(Product) == "replica1"
+    assert router.db_for_write(Product) == "default"
+    assert router.db_for_read(Product) is None
+
+
+def test_pinned_or_written_requests_stay_on_primary(routing):
+    routing.wrote = True
+    read_from_replica()
+    assert routing.replica is None
+
+    _routing.set(RoutingState(pinned=True))
+    read_from_replica()
+    assert _routing.get().replica is None
+
+
+def test_open_transaction_reads_primary(routing):
+    read_from_replica()
+    with transaction.atomic():
+        assert ReplicaRouter().db_for_read(Product) == "default"
+
+
+def test_list_reads_from_replica_without_pinning(api_client, stores, make_product):
+    make_product()
+    response, primary, replica = queries_by_alias(api_client, f"/api/v1/product/?store={stores[0].pk}&facets=1")
+    assert response.status_code == 200
+    assert primary == 0 and replica > 0
+    assert PIN_COOKIE not in response.cookies
+
+
+def test_write_pins_client_to_primary(api_client, stores, make_product):
+    product = make_product()
+    response = api_client.put(
+        f"/api/v1/product/update/{product.pk}/",
+        {"name": "Renamed", "description": "New", "price": "12.00", "quantity_in_stock": 3,
+         "availability_status": True, "store": stores[0].pk},
+        format="json",
+    )
+    assert response.status_code == 200
+    assert response.cookies[PIN_COOKIE]["max-age"] == 5
+
+    # the cookie sticks on the client: its next read sees the write on the primary
+    response, primary, replica = queries_by_alias(api_client, f"/api/v1/product/{product.pk}/")
+    assert response.json()["name"] == "Renamed"
+    assert primary > 0 and replica == 0
+
+    api_client.cookies.pop(PIN_COOKIE)
+    response, primary, replica = queries_by_alias(api_client, f"/api/v1/product/{product.pk}/")
+    assert primary == 0 and replica > 0
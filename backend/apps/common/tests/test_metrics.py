@@ -0,0 +1,51 @@
+import re
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+
+from utils.metrics import Histogram
+
+SERVER_TIMING = re.compile(
+    r'db;dur=[\d.]+;desc="(\d+) queries", serialize;dur=[\d.]+, render;dur=[\d.]+, total;dur=[\d.]+'
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Test.", ("view",), buckets=(0.1, 1))
+    for value in (0.05, 0.5, 0.5, 3):
+        histogram.observe(value, 'a"b')
+    assert histogram.render().splitlines() == [
+        "# HELP test_seconds Test.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{view="a\\"b",le="0.1"} 1',
+        'test_seconds_bucket{view="a\\"b",le="1"} 3',
+        'test_seconds_bucket{view="a\\"b",le="+Inf"} 4',
+        'test_seconds_sum{view="a\\"b"} 4.05',
+        'test_seconds_count{view="a\\"b"} 4',
+    ]
+
+
+@pytest.mark.django_db
+def test_server_timing_counts_the_requests_queries(api_client, make_product):
+    make_product()
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get("/api/v1/product/")
+    assert int(SERVER_TIMING.fullmatch(response["Server-Timing"]).group(1)) == len(queries)
+
+    response = async_to_sync(AsyncClient().get)("/api/v1/product/?fields=id")
+    assert int(SERVER_TIMING.fullmatch(response["Server-Timing"]).group(1)) > 0
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint(api_client, make_product):
+    api_client.get("/api/v1/product/")
+    api_client.get("/api/v1/product/999999/")
+    response = api_client.get("/metrics")
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    body = response.content.decode()
+    assert 'http_request_duration_seconds_count{view="ProductViewSet.list",method="GET",status="200"}' in body
+    assert 'status="404"' in body
+    assert 'db_queries_per_request_bucket{view="ProductViewSet.retrieve",method="GET",le="+Inf"}' in body
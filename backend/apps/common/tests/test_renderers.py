@@ -0,0 +1,70 @@
+import io
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import msgpack
+import pytest
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from utils.parsers import MessagePackParser, ORJSONParser
+from utils.renderers import MessagePackRenderer, ORJSONRenderer
+
+DATA = {
+    "name": "Молоко",
+    "price": Decimal("10.50"),
+    "created": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    "note": "line break",
+    "items": [1, None, True],
+}
+
+
+def test_orjson_matches_json_renderer():
+    assert ORJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+    indented = "application/json; indent=2"
+    assert ORJSONRenderer().render(DATA, indented) == JSONRenderer().render(DATA, indented)
+
+
+def test_json_round_trip():
+    parsed = ORJSONParser().parse(io.BytesIO(ORJSONRenderer().render(DATA)))
+    assert parsed["name"] == "Молоко"
+    # a bare Decimal is a number, as with JSONRenderer; serializers send strings
+    assert parsed["price"] == 10.5
+    assert parsed["note"] == DATA["note"]
+    encoded = '{"name": "Молоко"}'.encode("cp1251")
+    assert ORJSONParser().parse(io.BytesIO(encoded), parser_context={"encoding": "cp1251"}) == {"name": "Молоко"}
+
+
+def test_msgpack_round_trip():
+    parsed = MessagePackParser().parse(io.BytesIO(MessagePackRenderer().render(DATA)))
+    assert parsed == {**DATA, "price": 10.5, "created": "2024-01-02T03:04:05Z"}
+
+
+@pytest.mark.parametrize(
+    "parser, content",
+    [(ORJSONParser(), b'{"name": '), (ORJSONParser(), b"\xff"), (MessagePackParser(), b"\xc1"), (MessagePackParser(), b"\x92\x01")],
+)
+def test_parse_errors(parser, content):
+    with pytest.raises(ParseError):
+        parser.parse(io.BytesIO(content))
+
+
+@pytest.mark.django_db
+def test_api_speaks_msgpack(api_client, stores, make_product):
+    make_product(price="10.50")
+    response = api_client.get("/api/v1/product/?format=msgpack&expand=store")
+    assert response["Content-Type"] == "application/msgpack"
+    product = msgpack.unpackb(response.content)["results"][0]
+    assert product["price"] == "10.50"
+    assert product["store"]["locations"] == "Бишкек"
+
+    response = api_client.get("/api/v1/product/", HTTP_ACCEPT="application/msgpack")
+    assert msgpack.unpackb(response.content)["results"][0]["price"] == "10.50"
+
+    body = msgpack.packb({"name": "Новый", "locations": "Ош", "manager": stores[0].manager_id})
+    response = api_client.post("/api/v1/store/create/", body, content_type="application/msgpack")
+    assert response.status_code == 201
+    assert response.json()["name"] == "Новый"
+
+    response = api_client.post("/api/v1/store/create/", b"\xc1", content_type="application/msgpack")
+    assert response.status_code == 400
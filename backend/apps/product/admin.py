@@ -1,6 +1,9 @@
 from django.contrib import admin
-from .models import Product, Category 
+from .models import Product, Category, CategoryStats, Reservation, ReservationItem
 
 
 admin.site.register(Category)
-admin.site.register(Product)
\ No newline at end of file
+admin.site.register(Product)
+admin.site.register(CategoryStats)
+admin.site.register(Reservation)
+admin.site.register(ReservationItem)
\ No newline at end of file
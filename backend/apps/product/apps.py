@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ProductConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.product'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        post_migrate.connect(install_search_index, sender=self)
+
+
+def install_search_index(using, **kwargs):
+    # the index is a raw side table (FTS5 / tsvector) that migrations don't know about
+    from .search import get_search_index
+
+    index = get_search_index(using)
+    if index is not None:
+        index.install()
@@ -0,0 +1,172 @@
+from django.db import DatabaseError, transaction
+
+from apps.common.bulk import BATCH_SIZE, batches
+from apps.store.models import Store
+from .models import Category, Product, ReservationItem
+from .signals import products_bulk_changed
+
+MAX_BULK_ITEMS = 50000
+
+ProductCategory = Product.categories.through
+
+
+def check_references(rows, result):
+    """Validate ``store`` and ``categories`` of a whole batch with one query each."""
+    store_ids = {data["store"] for _, data in rows if "store" in data}
+    category_ids = {pk for _, data in rows for pk in data.get("categories", ())}
+    stores = set(Store.objects.filter(pk__in=store_ids).values_list("pk", flat=True))
+    categories = set(Category.objects.filter(pk__in=category_ids).values_list("pk", flat=True))
+
+    valid = []
+    for index, data in rows:
+        errors = {}
+        if "store" in data and data["store"] not in stores:
+            errors["store"] = [f'Invalid pk "{data["store"]}" - object does not exist.']
+        missing = [pk for pk in data.get("categories", ()) if pk not in categories]
+        if missing:
+            errors["categories"] = [f'Invalid pk "{pk}" - object does not exist.' for pk in missing]
+        if errors:
+            result.fail(index, errors)
+        else:
+            valid.append((index, data))
+    return valid
+
+
+def _model_fields(data):
+    fields = {key: value for key, value in data.items() if key not in ("id", "categories", "store")}
+    if "store" in data:
+        fields["store_id"] = data["store"]
+    return fields
+
+
+def _link_categories(products_with_data):
+    ProductCategory.objects.bulk_create(
+        [
+            ProductCategory(product_id=product.pk, category_id=category_id)
+            for product, data in products_with_data
+            for category_id in dict.fromkeys(data.get("categories", ()))
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def bulk_create_products(rows, result):
+    """``rows`` is a list of ``(index, validated_data)``; one transaction per batch."""
+    for batch in batches(rows):
+        batch = check_references(batch, result)
+        if not batch:
+            continue
+        try:
+            with transaction.atomic():
+                products = Product.objects.bulk_create(
+                    [Product(**_model_fields(data)) for _, data in batch]
+                )
+                _link_categories(zip(products, (data for _, data in batch)))
+                products_bulk_changed.send(
+                    sender=Product,
+                    action="create",
+                    product_ids=[product.pk for product in products],
+                    store_ids={product.store_id for product in products},
+                    category_ids={pk for _, data in batch for pk in data.get("categories", ())},
+                )
+        except DatabaseError as ex:
+            result.fail_batch(batch, ex)
+            continue
+        for (index, _), product in zip(batch, products):
+            result.ids[index] = product.pk
+
+
+def bulk_update_products(rows, result):
+    for batch in batches(rows):
+        batch = check_references(batch, result)
+        if not batch:
+            continue
+        found = []
+        try:
+            with transaction.atomic():
+                # Rows are locked and read inside the transaction, and each row
+                # writes only the fields it sent: a column another row changed
+                # (stock under a concurrent reservation) is never written back
+                # from a stale read.
+                current = dict(
+                    Product.objects.select_for_update()
+                    .filter(pk__in=[data["id"] for _, data in batch])
+                    .values_list("pk", "store_id")
+                )
+                groups, store_ids = {}, set()
+                for index, data in batch:
+                    if data["id"] not in current:
+                        result.fail(index, {"id": ["Продукт не найден"]})
+                        continue
+                    fields = _model_fields(data)
+                    store_ids.add(current[data["id"]])  # the store it is moved out of
+                    store_ids.add(fields.get("store_id", current[data["id"]]))
+                    if fields:
+                        groups.setdefault(frozenset(fields), []).append(Product(pk=data["id"], **fields))
+                    found.append((index, data))
+                if not found:
+                    continue
+
+                for fields, products in groups.items():
+                    Product.objects.bulk_update(products, sorted(fields), batch_size=BATCH_SIZE)
+                relinked = [(Product(pk=data["id"]), data) for _, data in found if "categories" in data]
+                category_ids = set()
+                if relinked:
+                    links = ProductCategory.objects.filter(
+                        product_id__in=[product.pk for product, _ in relinked]
+                    )
+                    category_ids.update(links.values_list("category_id", flat=True))
+                    category_ids.update(pk for _, data in relinked for pk in data["categories"])
+                    links.delete()
+                    _link_categories(relinked)
+                products_bulk_changed.send(
+                    sender=Product,
+                    action="update",
+                    product_ids=list(dict.fromkeys(data["id"] for _, data in found)),
+                    store_ids=store_ids,
+                    category_ids=category_ids,
+                )
+        except DatabaseError as ex:
+            result.fail_batch(found, ex)
+            continue
+        for index, data in found:
+            result.ids[index] = data["id"]
+
+
+def bulk_delete_products(ids, result):
+    rows = list(enumerate(ids))
+    for batch in batches(rows):
+        existing = dict(
+            Product.objects.filter(pk__in=[pk for _, pk in batch]).values_list("pk", "store_id")
+        )
+        found = []
+        for index, pk in batch:
+            if pk in existing:
+                found.append((index, pk))
+            else:
+                result.fail(index, {"id": ["Продукт не найден"]})
+        if not found:
+            continue
+
+        product_ids = [pk for _, pk in found]
+        try:
+            with transaction.atomic():
+                # Delete without the collector: it would load every product and
+                # send per-row signals; bulk listeners get one batch signal instead.
+                links = ProductCategory.objects.filter(product_id__in=product_ids)
+                category_ids = set(links.values_list("category_id", flat=True))
+                links.delete()
+                ReservationItem.objects.filter(product_id__in=product_ids)._raw_delete(Product.objects.db)
+                Product.objects.filter(pk__in=product_ids)._raw_delete(Product.objects.db)
+                products_bulk_changed.send(
+                    sender=Product,
+                    action="delete",
+                    product_ids=product_ids,
+                    store_ids=set(existing.values()),
+                    category_ids=category_ids,
+                )
+        except DatabaseError as ex:
+            result.fail_batch(found, ex)
+            continue
+        for index, pk in found:
+            result.ids[index] = pk
@@ -0,0 +1,129 @@
+import csv
+import json
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+
+from .models import Product
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "price",
+    "quantity_in_stock",
+    "availability_status",
+    "store_id",
+)
+
+ProductCategory = Product.categories.through
+
+
+def iter_products(chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield every product as a dict with its ``category_ids``.
+    Rows come from a server-side cursor and categories are fetched with one
+    query per chunk, so memory use depends on ``chunk_size`` only.
+    """
+    rows = (
+        Product.objects.order_by("pk")
+        .values_list(*EXPORT_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield from _with_categories(chunk)
+            chunk = []
+    if chunk:
+        yield from _with_categories(chunk)
+
+
+async def aiter_product_chunks(chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    ``iter_products`` for ASGI, as lists of up to ``chunk_size`` products
+    fetched by primary key ranges, one thread hop per chunk. A sync
+    iterator would be read to the end into memory before Django streams
+    it to an ASGI server.
+    """
+    last_pk = None
+    while True:
+        chunk = await sync_to_async(_product_chunk)(last_pk, chunk_size)
+        if not chunk:
+            return
+        yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last_pk = chunk[-1]["id"]
+
+
+def _product_chunk(after_pk, chunk_size):
+    rows = Product.objects.order_by("pk")
+    if after_pk is not None:
+        rows = rows.filter(pk__gt=after_pk)
+    return list(_with_categories(list(rows.values_list(*EXPORT_FIELDS)[:chunk_size])))
+
+
+def _with_categories(chunk):
+    categories = defaultdict(list)
+    links = ProductCategory.objects.filter(
+        product_id__in=[row[0] for row in chunk]
+    ).order_by().values_list("product_id", "category_id")
+    for product_id, category_id in links:
+        categories[product_id].append(category_id)
+
+    for row in chunk:
+        product = dict(zip(EXPORT_FIELDS, row))
+        product["price"] = str(product["price"])
+        product["category_ids"] = categories.get(product["id"], [])
+        yield product
+
+
+def ndjson_lines(products):
+    for product in products:
+        yield json.dumps(product, ensure_ascii=False) + "\n"
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def csv_header():
+    return csv.writer(_Echo()).writerow([*EXPORT_FIELDS, "category_ids"])
+
+
+def csv_lines(products):
+    writer = csv.writer(_Echo())
+    for product in products:
+        yield writer.writerow(
+            [*(product[field] for field in EXPORT_FIELDS), ";".join(map(str, product["category_ids"]))]
+        )
+
+
+def export_lines(header, render_lines, products):
+    """``header()`` (formats without one have None), then ``render_lines`` over ``products``."""
+    if header is not None:
+        yield header()
+    yield from render_lines(products)
+
+
+async def alines(header, render_lines, chunks):
+    """
+    ``export_lines`` over ``aiter_product_chunks``, one piece of output per
+    chunk. The header goes out before the first chunk, so an empty catalog
+    still gets it.
+    """
+    if header is not None:
+        yield header()
+    async for products in chunks:
+        yield "".join(render_lines(products))
+
+
+# format: (content type, header line or None, line renderer)
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson; charset=utf-8", None, ndjson_lines),
+    "csv": ("text/csv; charset=utf-8", csv_header, csv_lines),
+}
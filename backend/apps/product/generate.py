@@ -0,0 +1,157 @@
+"""
+Synthetic catalog data for performance environments: users, stores,
+categories and products with their category links, written in large
+batches. Model save() and signals are bypassed, so the search index and
+the stats tables are rebuilt once at the end instead of per row.
+"""
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.db.models import Max
+
+from apps.accounts.models import CustomUser
+from apps.common.models import ModelVersion
+from apps.product.models import Category, Product
+from apps.product.search import get_search_index
+from apps.product.stats import rebuild_category_stats, rebuild_store_stats
+from apps.store.models import Store
+
+# bump when the generated content changes, so cached datasets get rebuilt
+VERSION = 2
+
+FIRST_NAMES = "айбек нурлан азамат эрлан бакыт айгерим жылдыз асель нургуль динара иван мария".split()
+LAST_NAMES = "токтогулов асанов исаков жумабаев осмонов иванов смирнов кузнецов орозбеков".split()
+CITIES = "Бишкек Ош Джалал-Абад Каракол Токмок Нарын Талас Баткен Кара-Балта Балыкчы".split()
+STREETS = "Чуй Манас Ленина Токтогула Киевская Московская Абдрахманова Ахунбаева".split()
+WORDS = (
+    "молоко хлеб сыр кофе чай масло сок вода шоколад печенье рис гречка "
+    "кабель зарядка наушники чехол лампа батарейка ноутбук монитор клавиатура мышь "
+    "футболка куртка кроссовки носки шапка рюкзак зонт перчатки ремень кошелек"
+).split()
+ADJECTIVES = "новый большой малый красный черный белый легкий прочный быстрый тихий".split()
+BRANDS = "Alatoo Tengri Issyk Ordo Sary Kok Ak Nomad Manas Tulpar".split()
+
+
+def catalog_shape(products, users=None, stores=None, categories=None):
+    """Row counts for ``products``; anything not given scales with it."""
+    return {
+        "products": products,
+        "stores": max(10, products // 1000) if stores is None else stores,
+        "categories": max(20, products // 2000) if categories is None else categories,
+        "users": max(20, products // 100) if users is None else users,
+    }
+
+
+def _product(rng, index, store_ids):
+    # roughly log-uniform prices: many cheap goods, few expensive ones
+    price = round(10 ** rng.uniform(1, 5), 2)
+    quantity = 0 if rng.random() < 0.1 else rng.randint(1, 500)
+    return Product(
+        name=f"{rng.choice(BRANDS)} {rng.choice(ADJECTIVES)} {rng.choice(WORDS)} {index}",
+        description=" ".join(rng.choices(WORDS, k=rng.randint(5, 20))),
+        price=f"{price:.2f}",
+        quantity_in_stock=quantity,
+        availability_status=quantity > 0,
+        store_id=rng.choice(store_ids),
+    )
+
+
+def _insert_links(rows):
+    """Category links straight into the through table, without building model instances."""
+    field = Product._meta.get_field("categories")
+    quote = connection.ops.quote_name
+    sql = "INSERT INTO {} ({}, {}) VALUES (%s, %s)".format(
+        quote(field.remote_field.through._meta.db_table),
+        quote(field.m2m_column_name()),
+        quote(field.m2m_reverse_name()),
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def generate_catalog(shape, batch_size=5000, seed=None, password="password", log=None):
+    """
+    Append ``shape`` rows (see ``catalog_shape``) to the default database.
+    Every user gets the same ``password``, hashed once. Returns the elapsed
+    seconds per table.
+    """
+    rng = random.Random(seed)
+    log = log or (lambda message: None)
+    timings = {}
+
+    if connection.vendor == "sqlite" and not connection.in_atomic_block:
+        with connection.cursor() as cursor:
+            # a throwaway perf database does not need fsync after every batch;
+            # SQLite refuses the change inside a caller's transaction
+            cursor.execute("PRAGMA synchronous=OFF")
+
+    started = time.perf_counter()
+    hashed = make_password(password)
+    offset = (CustomUser.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+    user_ids = []
+    for start in range(0, shape["users"], batch_size):
+        with transaction.atomic():
+            users = CustomUser.objects.bulk_create([
+                CustomUser(
+                    email=f"{rng.choice(FIRST_NAMES)}.{rng.choice(LAST_NAMES)}.{offset + index}@example.com",
+                    password=hashed,
+                    role="manager" if index % 20 == 0 else "user",
+                )
+                for index in range(start, min(start + batch_size, shape["users"]))
+            ])
+        user_ids.extend(user.pk for user in users)
+    managers = user_ids[::20] or user_ids
+    timings["users"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with transaction.atomic():
+        stores = Store.objects.bulk_create(
+            [
+                Store(
+                    name=f"{rng.choice(BRANDS)} {index}",
+                    locations=f"{rng.choice(CITIES)}, ул. {rng.choice(STREETS)} {rng.randint(1, 200)}",
+                    manager_id=rng.choice(managers),
+                )
+                for index in range(shape["stores"])
+            ],
+            batch_size=batch_size,
+        )
+        categories = Category.objects.bulk_create(
+            [
+                Category(name=f"{rng.choice(WORDS).capitalize()} {index}", description=rng.choice(ADJECTIVES))
+                for index in range(shape["categories"])
+            ],
+            batch_size=batch_size,
+        )
+    store_ids = [store.pk for store in stores]
+    category_ids = [category.pk for category in categories]
+    timings["stores, categories"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for start in range(0, shape["products"], batch_size):
+        with transaction.atomic():
+            products = Product.objects.bulk_create([
+                _product(rng, index, store_ids)
+                for index in range(start, min(start + batch_size, shape["products"]))
+            ])
+            _insert_links([
+                (product.pk, category_id)
+                for product in products
+                for category_id in rng.sample(category_ids, min(len(category_ids), rng.randint(1, 3)))
+            ])
+        if start and start % (batch_size * 20) == 0:
+            log(f"{start} products")
+    timings["products"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with transaction.atomic():
+        index = get_search_index()
+        if index is not None:
+            index.rebuild()
+        rebuild_store_stats()
+        rebuild_category_stats()
+        ModelVersion.objects.bump("product", "category", "store", "user")
+    timings["search index, stats"] = time.perf_counter() - started
+    return timings
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.product.generate import catalog_shape, generate_catalog
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic users, stores, categories and products for a performance environment. "
+        "Rows are appended with bulk inserts; signals are skipped, so the change log is not written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=10_000)
+        parser.add_argument("--users", type=int, help="default: products / 100")
+        parser.add_argument("--stores", type=int, help="default: products / 1000")
+        parser.add_argument("--categories", type=int, help="default: products / 2000")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, help="same seed, same data")
+        parser.add_argument("--password", default="password", help="password of every generated user")
+
+    def handle(self, *args, **options):
+        shape = catalog_shape(options["products"], options["users"], options["stores"], options["categories"])
+        if any(count < 0 for count in shape.values()) or options["batch_size"] < 1:
+            raise CommandError("Counts must not be negative and --batch-size must be positive")
+        if shape["products"] and not shape["stores"]:
+            raise CommandError("Products need at least one store")
+        if shape["stores"] and not shape["users"]:
+            raise CommandError("Stores need at least one user as manager")
+
+        self.stdout.write(", ".join(f"{count} {name}" for name, count in shape.items()))
+        timings = generate_catalog(
+            shape,
+            batch_size=options["batch_size"],
+            seed=options["seed"],
+            password=options["password"],
+            log=self.stdout.write if options["verbosity"] > 1 else None,
+        )
+        for name, seconds in timings.items():
+            self.stdout.write(f"  {name}: {seconds:.1f}s")
+        self.stdout.write(self.style.SUCCESS(f"Generated in {sum(timings.values()):.1f}s"))
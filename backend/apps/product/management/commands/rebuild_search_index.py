@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from apps.product.search import get_search_index
+
+
+class Command(BaseCommand):
+    help = "Create the product full-text index if needed and refill it from the catalog."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        index = get_search_index(options["database"])
+        if index is None:
+            raise CommandError("Full-text search is not supported on this database")
+        index.install()
+        with transaction.atomic(using=options["database"]):
+            index.rebuild()
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt"))
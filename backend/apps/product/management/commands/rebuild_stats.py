@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.product.stats import rebuild_category_stats, rebuild_store_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute every store and category stats row from the product table."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_store_stats()
+            rebuild_category_stats()
+        self.stdout.write(self.style.SUCCESS("Store and category stats rebuilt"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.product.stock import release_expired
+
+
+class Command(BaseCommand):
+    help = "Return the stock of held reservations whose ttl has passed. Run it from cron every minute."
+
+    def handle(self, *args, **options):
+        released = release_expired()
+        self.stdout.write(self.style.SUCCESS(f"Released {released} expired reservation(s)"))
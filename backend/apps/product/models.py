@@ -1,20 +1,25 @@
 from django.db import models
+from apps.accounts.models import CustomUser
+from apps.common.models import TrackedFieldsMixin
 from apps.store.models import Store
   
 
-class Category(models.Model):
+class Category(TrackedFieldsMixin, models.Model):
     name = models.CharField(max_length=100, verbose_name="Name")
     description = models.TextField(verbose_name="Description")
     
     class Meta:
         verbose_name = "Category"
         verbose_name_plural = "Categories"
+        indexes = [
+            models.Index(fields=["name", "id"], name="category_name_id_idx"),
+        ]
 
     def __str__(self):
         return self.name
 
 
-class Product(models.Model):
+class Product(TrackedFieldsMixin, models.Model):
     name = models.CharField(max_length=100, verbose_name="Name")
     description = models.TextField(verbose_name="Description")
     price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Price")
@@ -26,9 +31,65 @@ class Product(models.Model):
     class Meta:
         verbose_name = "Product"
         verbose_name_plural = "Products"
+        indexes = [
+            models.Index(fields=["name", "id"], name="product_name_id_idx"),
+            # filtered browse: equality column first, then the keyset sort keys
+            models.Index(fields=["store", "name", "id"], name="product_store_name_id_idx"),
+            models.Index(fields=["availability_status", "name", "id"], name="product_status_name_id_idx"),
+            models.Index(fields=["price", "id"], name="product_price_id_idx"),
+        ]
 
     def __str__(self):
         return self.name
-    
 
-  
\ No newline at end of file
+
+class CategoryStats(models.Model):
+    category = models.OneToOneField(Category, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    product_count = models.IntegerField(default=0, verbose_name="Product count")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Updated at")
+
+    class Meta:
+        verbose_name = "Category stats"
+        verbose_name_plural = "Category stats"
+
+    def __str__(self):
+        return f"{self.category_id}: {self.product_count} products"
+
+
+class Reservation(models.Model):
+    """
+    Units taken out of ``quantity_in_stock`` and held for an order until
+    they are committed (sold) or released back. See apps.product.stock.
+    """
+    STATUS_CHOICES = (
+        ('held', 'Held'),
+        ('committed', 'Committed'),
+        ('released', 'Released'),
+    )
+    status = models.CharField(choices=STATUS_CHOICES, max_length=10, default='held', verbose_name="Status")
+    user = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='reservations')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created at")
+    expires_at = models.DateTimeField(null=True, blank=True, verbose_name="Expires at")
+
+    class Meta:
+        verbose_name = "Reservation"
+        verbose_name_plural = "Reservations"
+        indexes = [
+            models.Index(fields=["status", "expires_at"], name="reservation_status_exp_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.status}"
+
+
+class ReservationItem(models.Model):
+    reservation = models.ForeignKey(Reservation, on_delete=models.CASCADE, related_name='items')
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='reservation_items')
+    quantity = models.PositiveIntegerField(verbose_name="Quantity")
+
+    class Meta:
+        verbose_name = "Reservation item"
+        verbose_name_plural = "Reservation items"
+
+    def __str__(self):
+        return f"{self.product_id} x {self.quantity}"
@@ -0,0 +1,197 @@
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .models import Category, Product
+
+ProductCategory = Product.categories.through
+
+MAX_QUERY_TERMS = 10
+ID_BATCH_SIZE = 500
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def query_terms(query):
+    """Lowercased word tokens of a user query; punctuation and operators are dropped."""
+    return [term.lower() for term in _TERM_RE.findall(query or "")][:MAX_QUERY_TERMS]
+
+
+def _batches(ids, size=ID_BATCH_SIZE):
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def _tables():
+    return {
+        "product": Product._meta.db_table,
+        "category": Category._meta.db_table,
+        "link": ProductCategory._meta.db_table,
+    }
+
+
+class SearchIndex:
+    """
+    Side table holding one search document per product: name, description
+    and the names of its categories. Kept in sync from apps.product.signals;
+    ``search()`` returns ``[(rank, product_id)]`` ordered by (rank, id), lower
+    rank first, so callers can page through it with a keyset cursor.
+    """
+
+    table = "product_search"
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    def execute(self, sql, params=()):
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def fetch(self, sql, params=()):
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def index(self, product_ids):
+        for batch in _batches(product_ids):
+            self.remove(batch)
+            self.insert(batch)
+
+    def rebuild(self):
+        self.execute(f"DELETE FROM {self.table}")
+        ids = Product.objects.using(self.using).order_by("pk").values_list("pk", flat=True)
+        for batch in _batches(ids.iterator(chunk_size=ID_BATCH_SIZE), 5000):
+            self.insert(batch)
+
+    def remove(self, product_ids):
+        for batch in _batches(product_ids):
+            placeholders = ", ".join(["%s"] * len(batch))
+            self.execute(f"DELETE FROM {self.table} WHERE {self.key} IN ({placeholders})", batch)
+
+    def search(self, query, limit, after=None):
+        terms = query_terms(query)
+        if not terms:
+            return []
+        sql, params = self.search_sql(terms)
+        if after is not None:
+            sql += " WHERE rank > %s OR (rank = %s AND id > %s)"
+            params += [after[0], after[0], after[1]]
+        return [
+            (rank, pk)
+            for pk, rank in self.fetch(f"{sql} ORDER BY rank, id LIMIT %s", params + [limit])
+        ]
+
+    def install(self):
+        raise NotImplementedError
+
+    def insert(self, product_ids):
+        raise NotImplementedError
+
+    def search_sql(self, terms):
+        """``SELECT id, rank FROM (...) hits`` for the parsed terms, plus its params."""
+        raise NotImplementedError
+
+
+class SqliteSearchIndex(SearchIndex):
+    """FTS5 table keyed by the product id, ranked with bm25 (name > categories > description)."""
+
+    key = "rowid"
+
+    def install(self):
+        self.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+            "name, categories, description, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+
+    def insert(self, product_ids):
+        placeholders = ", ".join(["%s"] * len(product_ids))
+        self.execute(
+            """
+            INSERT INTO {table} (rowid, name, categories, description)
+            SELECT p.id, p.name, coalesce((
+                SELECT group_concat(c.name, ' ') FROM {link} pc
+                JOIN {category} c ON c.id = pc.category_id
+                WHERE pc.product_id = p.id
+            ), ''), p.description
+            FROM {product} p WHERE p.id IN ({placeholders})
+            """.format(table=self.table, placeholders=placeholders, **_tables()),
+            list(product_ids),
+        )
+
+    def search_sql(self, terms):
+        match = " ".join(f'"{term}"*' for term in terms)
+        return (
+            f"SELECT id, rank FROM (SELECT rowid AS id, bm25({self.table}, 10.0, 5.0, 1.0) AS rank "
+            f"FROM {self.table} WHERE {self.table} MATCH %s) hits",
+            [match],
+        )
+
+
+class PostgresSearchIndex(SearchIndex):
+    """
+    tsvector column with a GIN index, weighted A (name), B (categories) and
+    C (description). The rank is negated ``ts_rank_cd`` so that, like bm25,
+    lower sorts first.
+    """
+
+    key = "product_id"
+    config = "simple"
+
+    def install(self):
+        self.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "product_id bigint PRIMARY KEY, document tsvector NOT NULL)"
+        )
+        self.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.table}_document_idx "
+            f"ON {self.table} USING gin (document)"
+        )
+
+    def insert(self, product_ids):
+        self.execute(
+            """
+            INSERT INTO {table} (product_id, document)
+            SELECT p.id,
+                setweight(to_tsvector(%(config)s, p.name), 'A')
+                || setweight(to_tsvector(%(config)s, coalesce((
+                    SELECT string_agg(c.name, ' ') FROM {link} pc
+                    JOIN {category} c ON c.id = pc.category_id
+                    WHERE pc.product_id = p.id
+                ), '')), 'B')
+                || setweight(to_tsvector(%(config)s, p.description), 'C')
+            FROM {product} p WHERE p.id = ANY(%(ids)s)
+            ON CONFLICT (product_id) DO UPDATE SET document = EXCLUDED.document
+            """.format(table=self.table, **_tables()),
+            {"config": self.config, "ids": list(product_ids)},
+        )
+
+    def index(self, product_ids):
+        # the insert is an upsert, no need to delete first
+        for batch in _batches(product_ids):
+            self.insert(batch)
+
+    def search_sql(self, terms):
+        query = " & ".join(f"{term}:*" for term in terms)
+        return (
+            f"SELECT id, rank FROM (SELECT product_id AS id, "
+            f"-ts_rank_cd(document, to_tsquery(%s, %s)) AS rank "
+            f"FROM {self.table} WHERE document @@ to_tsquery(%s, %s)) hits",
+            [self.config, query, self.config, query],
+        )
+
+
+SEARCH_BACKENDS = {
+    "sqlite": SqliteSearchIndex,
+    "postgresql": PostgresSearchIndex,
+}
+
+
+def get_search_index(using=DEFAULT_DB_ALIAS):
+    """The index for the database's vendor, or None when full-text search isn't supported there."""
+    backend = SEARCH_BACKENDS.get(connections[using].vendor)
+    return backend(using) if backend is not None else None
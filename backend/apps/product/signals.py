@@ -0,0 +1,292 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+
+from apps.common.models import ChangeLog, ModelVersion
+from utils.realtime import changed_by_name, publish_delta
+from .models import Category, Product
+from .search import get_search_index
+from . import stats
+
+# Sent once per batch by apps.product.bulk, which bypasses the per-row model
+# signals. Arguments: action ("create"/"update"/"delete"), product_ids, store_ids
+# and category_ids (categories that gained or lost products).
+products_bulk_changed = Signal()
+
+# Sent by apps.product.stock after conditional stock updates, which bypass
+# post_save too. Arguments: rows [(id, store_id, price, quantity_in_stock,
+# availability_status)] as they are after the change, deltas {id: units}.
+product_stock_changed = Signal()
+
+
+def product_store_ids(product):
+    """The product's store and, if it is being moved, the store it came from."""
+    return dict.fromkeys([product.get_loaded_value("store_id", product.store_id), product.store_id])
+
+
+def product_topics(store_ids, category_ids):
+    return [f"store:{store_id}:products" for store_id in store_ids] + [
+        f"category:{category_id}" for category_id in category_ids
+    ]
+
+
+@receiver([post_save, post_delete], sender=Product)
+def bump_product_version(sender, instance, **kwargs):
+    ModelVersion.objects.bump(
+        "product", *(f"product:store:{store_id}" for store_id in product_store_ids(instance))
+    )
+
+
+@receiver([post_save, post_delete], sender=Category)
+def bump_category_version(sender, instance, **kwargs):
+    # products embed their categories; product responses depend on "category" too
+    ModelVersion.objects.bump("category")
+
+
+@receiver(m2m_changed, sender=Product.categories.through)
+def remember_cleared_links(sender, instance, action, reverse, pk_set, **kwargs):
+    # post_clear has no pk_set; keep what is about to be unlinked
+    related = instance.products if reverse else instance.categories
+    if action == "pre_clear":
+        instance._cleared_pks = set(related.values_list("pk", flat=True))
+    elif action == "pre_remove":
+        # remove() reports every pk it was given, linked or not
+        instance._removed_pks = set(related.filter(pk__in=pk_set).values_list("pk", flat=True))
+
+
+def changed_link_pks(instance, action, pk_set):
+    """Related pks touched by an m2m_changed ``post_*`` action."""
+    if action == "post_clear":
+        return getattr(instance, "_cleared_pks", set())
+    return pk_set
+
+
+@receiver(m2m_changed, sender=Product.categories.through)
+def bump_product_categories_version(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        store_ids = [instance.store_id]
+    else:
+        # category.products.add(...): find the stores of the touched products
+        store_ids = Product.objects.filter(
+            pk__in=changed_link_pks(instance, action, pk_set)
+        ).values_list("store_id", flat=True).distinct()
+    ModelVersion.objects.bump("product", *(f"product:store:{store_id}" for store_id in store_ids))
+
+
+@receiver(products_bulk_changed, sender=Product)
+def bump_bulk_product_version(sender, store_ids, **kwargs):
+    ModelVersion.objects.bump("product", *(f"product:store:{store_id}" for store_id in store_ids))
+
+
+@receiver(post_save, sender=Product)
+def log_product_save(sender, instance, created, **kwargs):
+    if created or instance.get_changed_fields():
+        entry = ChangeLog.objects.record("product", instance.pk, "create" if created else "update")
+        instance._change_seq = entry.pk
+
+
+@receiver(post_delete, sender=Product)
+def log_product_delete(sender, instance, **kwargs):
+    instance._change_seq = ChangeLog.objects.record("product", instance.pk, "delete").pk
+
+
+@receiver(post_save, sender=Category)
+def log_category_save(sender, instance, created, **kwargs):
+    if created or instance.get_changed_fields():
+        ChangeLog.objects.record("category", instance.pk, "create" if created else "update")
+
+
+@receiver(post_delete, sender=Category)
+def log_category_delete(sender, instance, **kwargs):
+    ChangeLog.objects.record("category", instance.pk, "delete")
+
+
+@receiver(m2m_changed, sender=Product.categories.through)
+def log_product_categories(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    product_ids = changed_link_pks(instance, action, pk_set) if reverse else [instance.pk]
+    entries = ChangeLog.objects.record_many("product", product_ids, "update")
+    instance._change_seqs = {int(entry.object_id): entry.pk for entry in entries}
+
+
+@receiver(products_bulk_changed, sender=Product)
+def log_bulk_products(sender, action, product_ids, **kwargs):
+    ChangeLog.objects.record_many("product", product_ids, action)
+
+
+@receiver(post_save, sender=Product)
+def update_store_stats(sender, instance, created, **kwargs):
+    if created or {"store_id", "price", "quantity_in_stock", "availability_status"} & instance.get_changed_fields().keys():
+        stats.product_saved(instance, created)
+
+
+@receiver(post_delete, sender=Product)
+def update_deleted_product_stats(sender, instance, **kwargs):
+    stats.product_deleted(instance, getattr(instance, "_deleted_category_ids", []))
+
+
+@receiver(m2m_changed, sender=Product.categories.through)
+def update_category_stats(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "post_add":
+        linked, delta = pk_set, 1
+    elif action == "post_remove":
+        linked, delta = getattr(instance, "_removed_pks", set()), -1
+    elif action == "post_clear":
+        linked, delta = getattr(instance, "_cleared_pks", set()), -1
+    else:
+        return
+    if reverse:
+        stats.apply_category_delta([instance.pk], delta * len(linked))
+    else:
+        stats.apply_category_delta(linked, delta)
+
+
+@receiver(post_save, sender=Category)
+def create_category_stats(sender, instance, created, **kwargs):
+    if created:
+        stats.rebuild_category_stats([instance.pk])
+
+
+@receiver(products_bulk_changed, sender=Product)
+def rebuild_bulk_stats(sender, store_ids, category_ids=(), **kwargs):
+    # a batch touches many rows at once: recompute the few affected aggregates
+    stats.rebuild_store_stats(store_ids)
+    if category_ids:
+        stats.rebuild_category_stats(category_ids)
+
+
+def update_search_index(product_ids, removed=False):
+    index = get_search_index()
+    if index is None or not product_ids:
+        return
+    if removed:
+        index.remove(product_ids)
+    else:
+        index.index(product_ids)
+
+
+@receiver(post_save, sender=Product)
+def index_product(sender, instance, created, **kwargs):
+    if created or {"name", "description"} & instance.get_changed_fields().keys():
+        update_search_index([instance.pk])
+
+
+@receiver(post_delete, sender=Product)
+def unindex_product(sender, instance, **kwargs):
+    update_search_index([instance.pk], removed=True)
+
+
+@receiver(m2m_changed, sender=Product.categories.through)
+def index_product_categories(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        update_search_index(changed_link_pks(instance, action, pk_set) if reverse else [instance.pk])
+
+
+@receiver(post_save, sender=Category)
+def index_category_products(sender, instance, created, **kwargs):
+    if not created and "name" in instance.get_changed_fields():
+        update_search_index(list(instance.products.values_list("pk", flat=True)))
+
+
+@receiver(pre_delete, sender=Category)
+def remember_category_products(sender, instance, **kwargs):
+    instance._deleted_product_ids = list(instance.products.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Category)
+def index_deleted_category_products(sender, instance, **kwargs):
+    update_search_index(getattr(instance, "_deleted_product_ids", []))
+
+
+@receiver(products_bulk_changed, sender=Product)
+def index_bulk_products(sender, action, product_ids, **kwargs):
+    update_search_index(product_ids, removed=action == "delete")
+
+
+@receiver(post_save, sender=Product)
+def publish_product_delta(sender, instance, created, **kwargs):
+    changed = changed_by_name(Product, instance.get_changed_fields())
+    if not changed:
+        return
+    category_ids = [] if created else instance.categories.values_list("pk", flat=True)
+    publish_delta(
+        product_topics(product_store_ids(instance), category_ids),
+        "product", instance.pk, "create" if created else "update", changed,
+        seq=getattr(instance, "_change_seq", None),
+    )
+
+
+@receiver(pre_delete, sender=Product)
+def remember_product_categories(sender, instance, **kwargs):
+    # the through rows are gone by the time post_delete fires
+    instance._deleted_category_ids = list(instance.categories.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Product)
+def publish_product_delete(sender, instance, **kwargs):
+    category_ids = getattr(instance, "_deleted_category_ids", [])
+    publish_delta(
+        product_topics([instance.store_id], category_ids), "product", instance.pk, "delete",
+        seq=getattr(instance, "_change_seq", None),
+    )
+
+
+@receiver(m2m_changed, sender=Product.categories.through)
+def publish_product_categories_delta(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    pk_set = changed_link_pks(instance, action, pk_set)
+    seqs = getattr(instance, "_change_seqs", {})
+
+    if reverse:
+        products = Product.objects.filter(pk__in=pk_set).values_list("pk", "store_id")
+        touched_categories = {instance.pk}
+    else:
+        products = [(instance.pk, instance.store_id)]
+        touched_categories = set(pk_set)
+
+    links = {}
+    for product_id, category_id in Product.categories.through.objects.filter(
+        product_id__in=[pk for pk, _ in products]
+    ).values_list("product_id", "category_id"):
+        links.setdefault(product_id, []).append(category_id)
+
+    for product_id, store_id in products:
+        category_ids = links.get(product_id, [])
+        publish_delta(
+            product_topics([store_id], touched_categories | set(category_ids)),
+            "product", product_id, "update", {"categories": category_ids},
+            seq=seqs.get(product_id),
+        )
+
+
+@receiver(products_bulk_changed, sender=Product)
+def publish_bulk_product_delta(sender, action, product_ids, store_ids, **kwargs):
+    # one compact delta per store instead of one per row; clients refetch the ids
+    publish_delta(
+        product_topics(store_ids, []), "product", None, f"bulk_{action}", ids=list(product_ids)
+    )
+
+
+@receiver(product_stock_changed, sender=Product)
+def handle_stock_change(sender, rows, deltas, **kwargs):
+    store_ids = {row[1] for row in rows}
+    ModelVersion.objects.bump("product", *(f"product:store:{store_id}" for store_id in store_ids))
+    seqs = {
+        int(entry.object_id): entry.pk
+        for entry in ChangeLog.objects.record_many("product", [row[0] for row in rows], "update")
+    }
+    stats.stock_changed(rows, deltas)
+    links = {}
+    for product_id, category_id in Product.categories.through.objects.filter(
+        product_id__in=deltas
+    ).values_list("product_id", "category_id"):
+        links.setdefault(product_id, []).append(category_id)
+    for product_id, store_id, _, quantity, available in rows:
+        publish_delta(
+            product_topics([store_id], links.get(product_id, [])), "product", product_id, "update",
+            {"quantity_in_stock": quantity, "availability_status": available},
+            seq=seqs.get(product_id),
+        )
@@ -0,0 +1,141 @@
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, F, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.store.models import Store, StoreStats
+from .models import Category, CategoryStats, Product
+
+ProductCategory = Product.categories.through
+
+STORE_STATS_FIELDS = ("product_count", "available_count", "units_in_stock", "inventory_value")
+CENTS = Decimal("0.01")
+
+
+def product_contribution(price, quantity, available):
+    """What one product adds to its store's row, in STORE_STATS_FIELDS order."""
+    return (1, int(bool(available)), quantity, Decimal(price) * quantity)
+
+
+def loaded_contribution(product):
+    """The contribution of ``product`` as it is stored in the database right now."""
+    return product_contribution(
+        product.get_loaded_value("price", product.price),
+        product.get_loaded_value("quantity_in_stock", product.quantity_in_stock),
+        product.get_loaded_value("availability_status", product.availability_status),
+    )
+
+
+def apply_store_delta(store_id, delta, create_missing=True):
+    """
+    ``UPDATE ... SET field = field + delta`` on the store's row. A store
+    without a row yet (new, or never rebuilt) gets it computed from scratch,
+    which already includes the current write.
+    """
+    if not any(delta):
+        return
+    changes = {field: F(field) + value for field, value in zip(STORE_STATS_FIELDS, delta)}
+    updated = StoreStats.objects.filter(store_id=store_id).update(**changes, updated_at=timezone.now())
+    if not updated and create_missing:
+        rebuild_store_stats([store_id])
+
+
+def apply_category_delta(category_ids, delta):
+    category_ids = list(category_ids)
+    if not category_ids or not delta:
+        return
+    updated = CategoryStats.objects.filter(category_id__in=category_ids).update(
+        product_count=F("product_count") + delta, updated_at=timezone.now()
+    )
+    if updated < len(category_ids):
+        existing = CategoryStats.objects.filter(category_id__in=category_ids).values_list("category_id", flat=True)
+        rebuild_category_stats(set(category_ids) - set(existing))
+
+
+def product_saved(product, created):
+    new = product_contribution(product.price, product.quantity_in_stock, product.availability_status)
+    if created:
+        apply_store_delta(product.store_id, new)
+        return
+    old_store_id = product.get_loaded_value("store_id", product.store_id)
+    old = loaded_contribution(product)
+    if old_store_id != product.store_id:
+        apply_store_delta(old_store_id, tuple(-value for value in old))
+        apply_store_delta(product.store_id, new)
+    else:
+        apply_store_delta(product.store_id, tuple(n - o for n, o in zip(new, old)))
+
+
+def product_deleted(product, category_ids):
+    old_store_id = product.get_loaded_value("store_id", product.store_id)
+    # no row to fix means the store itself may be on its way out (cascade)
+    apply_store_delta(
+        old_store_id, tuple(-value for value in loaded_contribution(product)), create_missing=False
+    )
+    apply_category_delta(category_ids, -1)
+
+
+def stock_changed(rows, deltas):
+    """
+    Stats side of apps.product.stock: units and value move by the delta.
+    The available count only changes when a product hits or leaves zero,
+    and the flag may have been off already, so those stores are recounted.
+    """
+    store_deltas, recount = {}, set()
+    for pk, store_id, price, quantity, _ in rows:
+        delta = deltas[pk]
+        units, value = store_deltas.get(store_id, (0, 0))
+        store_deltas[store_id] = (units + delta, value + Decimal(price) * delta)
+        if quantity == 0 or quantity == delta:
+            recount.add(store_id)
+    for store_id, (units, value) in store_deltas.items():
+        if store_id not in recount:
+            apply_store_delta(store_id, (0, 0, units, value))
+    if recount:
+        rebuild_store_stats(recount)
+
+
+def rebuild_store_stats(store_ids=None):
+    """Recompute the rows of ``store_ids`` (every store when None) with one aggregate query."""
+    stores = Store.objects.all() if store_ids is None else Store.objects.filter(pk__in=store_ids)
+    totals = stores.annotate(
+        product_count=Count("products"),
+        available_count=Count("products", filter=Q(products__availability_status=True)),
+        units_in_stock=Coalesce(Sum("products__quantity_in_stock"), 0),
+        inventory_value=Coalesce(
+            Sum(F("products__price") * F("products__quantity_in_stock"), output_field=DecimalField()),
+            Decimal(0),
+            output_field=DecimalField(),
+        ),
+    ).values_list("pk", *STORE_STATS_FIELDS)
+
+    now = timezone.now()
+    StoreStats.objects.bulk_create(
+        [
+            StoreStats(
+                store_id=pk, product_count=count, available_count=available,
+                units_in_stock=units, inventory_value=Decimal(value).quantize(CENTS), updated_at=now,
+            )
+            for pk, count, available, units, value in totals.iterator(chunk_size=1000)
+        ],
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["store"],
+        update_fields=[*STORE_STATS_FIELDS, "updated_at"],
+    )
+
+
+def rebuild_category_stats(category_ids=None):
+    categories = Category.objects.all() if category_ids is None else Category.objects.filter(pk__in=category_ids)
+    now = timezone.now()
+    CategoryStats.objects.bulk_create(
+        [
+            CategoryStats(category_id=pk, product_count=count, updated_at=now)
+            for pk, count in categories.annotate(count=Count("products")).values_list("pk", "count")
+        ],
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["category"],
+        update_fields=["product_count", "updated_at"],
+    )
@@ -0,0 +1,140 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from .models import Product, Reservation, ReservationItem
+from .signals import product_stock_changed
+
+
+class StockError(Exception):
+    pass
+
+
+class InsufficientStock(StockError):
+    def __init__(self, shortages):
+        # {product_id: units available}; None when the product doesn't exist
+        self.shortages = shortages
+        super().__init__("Недостаточно товара на складе")
+
+
+class ReservationStateError(StockError):
+    def __init__(self, reservation_id, status):
+        self.reservation_id, self.status = reservation_id, status
+        super().__init__(f"Резерв #{reservation_id} уже в статусе {status}" if status else "Резерв не найден")
+
+
+def merge_items(items):
+    """``[(product_id, quantity)]`` -> ``{product_id: total}``, in id order so concurrent batches lock rows alike."""
+    merged = {}
+    for product_id, quantity in items:
+        if quantity <= 0:
+            raise ValueError("Количество должно быть положительным")
+        merged[product_id] = merged.get(product_id, 0) + quantity
+    return dict(sorted(merged.items()))
+
+
+def take_stock(product_id, quantity):
+    """
+    ``UPDATE ... SET quantity_in_stock = quantity_in_stock - n
+    WHERE id = %s AND quantity_in_stock >= n``: the check and the write are one
+    statement, so concurrent reservations can't oversell. A product that
+    runs out is marked unavailable in the same statement.
+    """
+    return Product.objects.filter(pk=product_id, quantity_in_stock__gte=quantity).update(
+        quantity_in_stock=F("quantity_in_stock") - quantity,
+        availability_status=Case(
+            When(quantity_in_stock=quantity, then=Value(False)),
+            default=F("availability_status"),
+        ),
+    )
+
+
+def return_stock(product_id, quantity):
+    return Product.objects.filter(pk=product_id).update(
+        quantity_in_stock=F("quantity_in_stock") + quantity,
+        availability_status=Case(
+            When(quantity_in_stock=0, then=Value(True)),
+            default=F("availability_status"),
+        ),
+    )
+
+
+def stock_changed(deltas):
+    rows = Product.objects.filter(pk__in=deltas).values_list(
+        "pk", "store_id", "price", "quantity_in_stock", "availability_status"
+    )
+    product_stock_changed.send(sender=Product, rows=list(rows), deltas=deltas)
+
+
+def reserve(items, user=None, ttl=None):
+    """
+    Hold every ``(product_id, quantity)`` of ``items`` or none of them.
+    Raises InsufficientStock listing what each short product has left.
+    """
+    deltas = merge_items(items)
+    with transaction.atomic():
+        short = [product_id for product_id, quantity in deltas.items() if not take_stock(product_id, quantity)]
+        if short:
+            transaction.set_rollback(True)
+        else:
+            expires_at = timezone.now() + timedelta(seconds=ttl) if ttl else None
+            reservation = Reservation.objects.create(user=user, expires_at=expires_at)
+            ReservationItem.objects.bulk_create(
+                [
+                    ReservationItem(reservation=reservation, product_id=product_id, quantity=quantity)
+                    for product_id, quantity in deltas.items()
+                ]
+            )
+            stock_changed({product_id: -quantity for product_id, quantity in deltas.items()})
+
+    if short:
+        available = dict(Product.objects.filter(pk__in=short).values_list("pk", "quantity_in_stock"))
+        raise InsufficientStock({product_id: available.get(product_id) for product_id in short})
+    return reservation
+
+
+def _finish(reservation_id, status):
+    """Move a held reservation to ``status``; the conditional update makes it happen once."""
+    moved = Reservation.objects.filter(pk=reservation_id, status="held").update(status=status)
+    if not moved:
+        current = Reservation.objects.filter(pk=reservation_id).values_list("status", flat=True).first()
+        raise ReservationStateError(reservation_id, current)
+
+
+def release(reservation_id):
+    """Put the held units back on the shelf."""
+    with transaction.atomic():
+        _finish(reservation_id, "released")
+        items = dict(
+            ReservationItem.objects.filter(reservation_id=reservation_id)
+            .order_by("product_id")
+            .values_list("product_id", "quantity")
+        )
+        returned = {product_id: quantity for product_id, quantity in items.items() if return_stock(product_id, quantity)}
+        if returned:
+            stock_changed(returned)
+    return Reservation.objects.get(pk=reservation_id)
+
+
+def commit(reservation_id):
+    """The held units are sold; stock was already taken at reserve time."""
+    with transaction.atomic():
+        _finish(reservation_id, "committed")
+    return Reservation.objects.get(pk=reservation_id)
+
+
+def release_expired(now=None):
+    """Release every held reservation past its ``expires_at``; returns how many were released."""
+    expired = Reservation.objects.filter(
+        status="held", expires_at__lte=now or timezone.now()
+    ).values_list("pk", flat=True)
+    released = 0
+    for reservation_id in list(expired):
+        try:
+            release(reservation_id)
+        except ReservationStateError:
+            continue  # committed or released concurrently
+        released += 1
+    return released
@@ -0,0 +1,39 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+pytestmark = pytest.mark.django_db
+
+
+def aget(url, **headers):
+    return async_to_sync(AsyncClient().get)(url, headers=headers)
+
+
+def test_async_routes_serve_the_viewset_actions(api_client, stores, categories, make_product):
+    product = make_product(categories=categories[:1])
+    make_product(store=stores[1])
+    for path in (
+        f"product/?store={stores[0].pk}&fields=id,name&facets=1",
+        f"product/{product.pk}/?expand=store,categories",
+        "category/?fields=id",
+        f"store/{stores[0].pk}/?expand=manager",
+    ):
+        sync_response = api_client.get(f"/api/v1/{path}")
+        async_response = aget(f"/api/v1/async/{path}")
+        assert async_response.status_code == 200
+        assert async_response.json() == sync_response.json()
+
+
+def test_async_routes_revalidate(make_product):
+    product = make_product()
+    etag = aget(f"/api/v1/async/product/{product.pk}/")["ETag"]
+    assert aget(f"/api/v1/async/product/{product.pk}/", if_none_match=etag).status_code == 304
+    product.name = "Renamed"
+    product.save()
+    assert aget(f"/api/v1/async/product/{product.pk}/", if_none_match=etag).status_code == 200
+
+
+def test_async_routes_authenticate(db):
+    assert aget("/api/v1/async/store/", authorization="Bearer invalid").status_code == 401
+    assert aget("/api/v1/async/store/999999/").status_code == 404
+    assert aget("/api/v1/async/product/?fields=nope").status_code == 400
@@ -0,0 +1,83 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.product.models import Product
+
+pytestmark = pytest.mark.django_db
+
+
+def item(store, n=0, **fields):
+    return {"name": f"Bulk {n}", "description": "Bulk", "price": "5.00", "quantity_in_stock": 1,
+            "availability_status": True, "store": store, **fields}
+
+
+def bulk_create(client, items):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post("/api/v1/product/bulk/create/", items, format="json")
+    return response, len(queries)
+
+
+def test_create_batches_queries(api_client, stores, categories):
+    cats = [category.pk for category in categories[:2]]
+    # the first write also creates the version and stats rows
+    bulk_create(api_client, [item(stores[n % 2].pk, n, categories=cats) for n in range(2)])
+    response, few = bulk_create(api_client, [item(stores[n % 2].pk, n, categories=cats) for n in range(4)])
+    assert response.status_code == 201
+    response, many = bulk_create(api_client, [item(stores[n % 2].pk, n, categories=cats) for n in range(60)])
+    assert response.status_code == 201
+    assert many == few
+    product = Product.objects.get(pk=response.json()["ids"][-1])
+    assert sorted(product.categories.values_list("pk", flat=True)) == cats
+
+
+def test_create_reports_failures_per_item(api_client, stores, categories):
+    response, _ = bulk_create(api_client, [
+        item(stores[0].pk, 0),
+        item(999999, 1),
+        item(stores[0].pk, 2, categories=[categories[0].pk, 999999]),
+        item(stores[0].pk, 3, price="-"),
+    ])
+    assert response.status_code == 207
+    data = response.json()
+    assert data["ids"][0] is not None and data["ids"][1:] == [None, None, None]
+    assert [(error["index"], *error["errors"]) for error in data["errors"]] == [
+        (1, "store"), (2, "categories"), (3, "price"),
+    ]
+    assert Product.objects.count() == 1
+
+
+def test_update_writes_only_sent_fields(api_client, stores, categories, make_product):
+    first = make_product(categories=categories[:1])
+    second = make_product(quantity=9)
+    response = api_client.put("/api/v1/product/bulk/update/", [
+        {"id": first.pk, "price": "1.50", "categories": [categories[2].pk]},
+        {"id": second.pk, "store": stores[1].pk},
+        {"id": 999999, "price": "1.00"},
+    ], format="json")
+    assert response.status_code == 207
+    assert response.json()["ids"] == [first.pk, second.pk, None]
+
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert str(first.price) == "1.50" and first.quantity_in_stock == 5
+    assert list(first.categories.values_list("pk", flat=True)) == [categories[2].pk]
+    assert second.store_id == stores[1].pk and second.quantity_in_stock == 9
+
+
+def test_delete(api_client, make_product):
+    products = [make_product() for _ in range(3)]
+    listed = api_client.get("/api/v1/product/").json()["results"]
+    assert len(listed) == 3
+
+    response = api_client.delete("/api/v1/product/bulk/delete/", [products[0].pk, 999999], format="json")
+    assert response.status_code == 207
+    response = api_client.delete("/api/v1/product/bulk/delete/", [product.pk for product in products[1:]], format="json")
+    assert response.status_code == 204
+    assert not Product.objects.exists()
+    assert api_client.get("/api/v1/product/").json()["results"] == []
+
+
+def test_payload_must_be_a_list(api_client):
+    response = api_client.post("/api/v1/product/bulk/create/", {"name": "x"}, format="json")
+    assert response.status_code == 400
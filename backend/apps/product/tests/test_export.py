@@ -0,0 +1,53 @@
+import csv
+import io
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from apps.product.export import EXPORT_FIELDS
+
+pytestmark = pytest.mark.django_db
+
+
+def wsgi_export(client, export_type):
+    response = client.get(f"/api/v1/product/export/?type={export_type}")
+    assert response.status_code == 200
+    return b"".join(response.streaming_content).decode()
+
+
+@async_to_sync
+async def asgi_export(export_type):
+    response = await AsyncClient().get(f"/api/v1/product/export/?type={export_type}")
+    assert response.status_code == 200
+    return b"".join([chunk async for chunk in response.streaming_content]).decode()
+
+
+@pytest.mark.parametrize("export_type", ["csv", "ndjson"])
+def test_asgi_and_wsgi_exports_match(api_client, categories, make_product, export_type):
+    assert asgi_export(export_type) == wsgi_export(api_client, export_type)
+    make_product(categories=categories[:2])
+    make_product(price="7.50", categories=categories[2:])
+    assert asgi_export(export_type) == wsgi_export(api_client, export_type)
+
+
+def test_export_rows(api_client, stores, categories, make_product):
+    product = make_product(price="7.50", categories=categories[:2])
+    rows = list(csv.DictReader(io.StringIO(wsgi_export(api_client, "csv"))))
+    assert list(rows[0]) == [*EXPORT_FIELDS, "category_ids"]
+    assert rows[0]["price"] == "7.50"
+    assert rows[0]["category_ids"] == f"{categories[0].pk};{categories[1].pk}"
+
+    (line,) = wsgi_export(api_client, "ndjson").splitlines()
+    assert json.loads(line) == {
+        "id": product.pk, "name": "Product", "description": "", "price": "7.50", "quantity_in_stock": 5,
+        "availability_status": True, "store_id": stores[0].pk, "category_ids": [categories[0].pk, categories[1].pk],
+    }
+
+
+def test_empty_csv_export_has_header(api_client):
+    header = ",".join([*EXPORT_FIELDS, "category_ids"]) + "\r\n"
+    assert wsgi_export(api_client, "csv") == header
+    assert asgi_export("csv") == header
+    assert asgi_export("ndjson") == ""
@@ -0,0 +1,52 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.product.facets import facet_counts
+from apps.product.models import Product
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def catalog(stores, categories, make_product):
+    return [
+        make_product(price="5.00", categories=categories[:2]),
+        make_product(price="20.00", categories=categories[:1]),
+        make_product(price="20.00", available=False),
+        make_product(store=stores[1], price="1500.00", categories=categories[1:]),
+    ]
+
+
+def test_facet_counts(stores, categories, catalog):
+    with CaptureQueriesContext(connection) as queries:
+        facets = facet_counts(Product.objects.all())
+    assert len(queries) == 1
+    assert facets == {
+        "stores": [{"id": stores[0].pk, "count": 3}, {"id": stores[1].pk, "count": 1}],
+        "categories": [
+            {"id": categories[0].pk, "count": 2},
+            {"id": categories[1].pk, "count": 2},
+            {"id": categories[2].pk, "count": 1},
+        ],
+        "price": [
+            {"min": 0, "max": 10, "count": 1},
+            {"min": 10, "max": 50, "count": 2},
+            {"min": 1000, "max": None, "count": 1},
+        ],
+    }
+
+
+def test_filters_narrow_results_and_facets(api_client, stores, categories, catalog):
+    data = api_client.get(
+        "/api/v1/product/", {"category": categories[0].pk, "price_max": 30, "facets": 1}
+    ).json()
+    assert sorted(row["id"] for row in data["results"]) == [catalog[0].pk, catalog[1].pk]
+    assert data["facets"]["stores"] == [{"id": stores[0].pk, "count": 2}]
+    assert data["facets"]["categories"] == [{"id": categories[0].pk, "count": 2}, {"id": categories[1].pk, "count": 1}]
+
+    data = api_client.get("/api/v1/product/", {"store": f"{stores[0].pk},{stores[1].pk}", "availability_status": False}).json()
+    assert [row["id"] for row in data["results"]] == [catalog[2].pk]
+    assert "facets" not in data
+
+    assert api_client.get("/api/v1/product/", {"store": "x"}).status_code == 400
@@ -0,0 +1,48 @@
+import io
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Count
+
+from apps.accounts.models import CustomUser
+from apps.product.models import Category, Product
+from apps.product.search import get_search_index
+from apps.product.tests.test_stats import assert_no_drift
+from apps.store.models import Store
+
+pytestmark = pytest.mark.django_db
+
+
+def generate(*args):
+    call_command("generate_data", *args, stdout=io.StringIO())
+
+
+def test_generates_the_requested_shape():
+    generate("--products", "120", "--users", "30", "--stores", "3", "--categories", "5", "--batch-size", "50", "--seed", "7")
+    assert (Product.objects.count(), CustomUser.objects.count(), Store.objects.count(), Category.objects.count()) == (120, 30, 3, 5)
+    links = Product.objects.annotate(links=Count("categories")).values_list("links", flat=True)
+    assert set(links) <= {1, 2, 3}
+    assert not Store.objects.exclude(manager__role="manager").exists()
+    assert CustomUser.objects.first().check_password("password")
+
+    assert_no_drift()
+    product = Product.objects.order_by("?").first()
+    assert product.pk in [pk for _, pk in get_search_index().search(product.name, limit=200)]
+
+
+def test_same_seed_same_data():
+    args = ("--products", "20", "--users", "2", "--stores", "1", "--categories", "2", "--seed", "3")
+    generate(*args)
+    first = list(Product.objects.order_by("pk").values_list("name", "price", "quantity_in_stock"))
+    Product.objects.all().delete()
+    generate(*args)
+    assert list(Product.objects.order_by("pk").values_list("name", "price", "quantity_in_stock")) == first
+
+
+@pytest.mark.parametrize(
+    "args",
+    [("--products", "-1"), ("--batch-size", "0"), ("--products", "5", "--stores", "0"), ("--stores", "2", "--users", "0")],
+)
+def test_rejects_impossible_shapes(args):
+    with pytest.raises(CommandError):
+        generate(*args)
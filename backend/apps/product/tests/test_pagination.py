@@ -0,0 +1,49 @@
+import pytest
+
+from apps.product.models import Product
+from utils.pagination import encode_cursor
+
+pytestmark = pytest.mark.django_db
+
+
+def walk(client, url):
+    pages = []
+    while url:
+        data = client.get(url).json()
+        pages.append([row["id"] for row in data["results"]])
+        url = data["next"]
+    return pages
+
+
+def test_pages_follow_the_keyset_ordering(api_client, make_product):
+    for name in ["b", "a", "b", "c", "a", "b", "a"]:
+        product = make_product()
+        Product.objects.filter(pk=product.pk).update(name=name)
+
+    pages = walk(api_client, "/api/v1/product/?page_size=3")
+    assert [len(page) for page in pages] == [3, 3, 1]
+    expected = list(Product.objects.order_by("name", "id").values_list("id", flat=True))
+    assert sum(pages, []) == expected
+
+
+def test_cursor_survives_inserts(api_client, make_product):
+    for _ in range(4):
+        make_product()
+    first = api_client.get("/api/v1/product/?page_size=2").json()
+    newer = make_product()
+    rest = walk(api_client, first["next"])
+    assert sum(rest, []) == [row["id"] for row in api_client.get("/api/v1/product/").json()["results"]][2:]
+    assert newer.pk in sum(rest, [])
+
+
+def test_store_and_user_lists_paginate(api_client, manager, stores):
+    assert sum(walk(api_client, "/api/v1/store/?page_size=1"), []) == [store.pk for store in stores]
+    assert walk(api_client, "/api/v1/user/?page_size=1") == [[manager.pk]]
+
+
+@pytest.mark.parametrize("cursor", ["garbage", encode_cursor(["a"]), encode_cursor({"a": 1})])
+def test_invalid_cursor(api_client, make_product, cursor):
+    make_product()
+    response = api_client.get(f"/api/v1/product/?cursor={cursor}")
+    assert response.status_code == 400
+    assert response.json() == {"message": "Invalid cursor"}
@@ -0,0 +1,39 @@
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.v1.product.serializers import ProductSerializer
+from apps.product.models import Category, Product
+from apps.store.models import Store
+from utils.query_planner import plan_queryset
+
+pytestmark = pytest.mark.django_db
+
+
+def count_queries(client, url):
+    caches["catalog"].clear()
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get(url).status_code == 200
+    return len(queries)
+
+
+@pytest.mark.parametrize(
+    "url",
+    ["/api/v1/product/", "/api/v1/product/?expand=store,categories", "/api/v1/store/?expand=manager", "/api/v1/category/"],
+)
+def test_list_queries_do_not_grow_with_the_page(api_client, manager, stores, categories, make_product, url):
+    make_product(categories=categories[:1])
+    few = count_queries(api_client, url)
+    for n in range(10):
+        make_product(store=stores[n % 2], categories=categories[: n % 3 + 1])
+        Store.objects.create(name=f"More {n}", locations="Ош", manager=manager)
+        Category.objects.create(name=f"More {n}", description="")
+    assert count_queries(api_client, url) == few
+
+
+def test_plan_follows_the_serializer():
+    queryset = plan_queryset(Product.objects.all(), ProductSerializer())
+    loaded, deferred = queryset.query.deferred_loading
+    assert not deferred and {"id", "name", "price", "store"} <= loaded
+    assert [lookup.prefetch_to for lookup in queryset._prefetch_related_lookups] == ["categories"]
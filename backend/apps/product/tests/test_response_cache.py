@@ -0,0 +1,59 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = pytest.mark.django_db
+
+
+def get(client, url, **extra):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, **extra)
+    assert response.status_code == 200
+    return response, len(queries)
+
+
+def test_cache_hit_reads_only_the_versions(api_client, make_product):
+    make_product()
+    first, _ = get(api_client, "/api/v1/product/")
+    second, queries = get(api_client, "/api/v1/product/")
+    assert queries == 1
+    assert second.content == first.content
+    assert second["Content-Type"] == first["Content-Type"]
+
+
+def test_writes_invalidate(api_client, stores, categories, make_product):
+    product = make_product(categories=categories[:1])
+    get(api_client, "/api/v1/product/")
+    get(api_client, "/api/v1/category/")
+    get(api_client, f"/api/v1/store/{stores[0].pk}/")
+
+    product.name = "Renamed"
+    product.save()
+    response, queries = get(api_client, "/api/v1/product/")
+    assert queries > 1
+    assert response.json()["results"][0]["name"] == "Renamed"
+    # categories and stores were not written
+    assert get(api_client, "/api/v1/category/")[1] == 1
+
+    stores[0].name = "Renamed"
+    stores[0].save()
+    assert get(api_client, f"/api/v1/store/{stores[0].pk}/")[0].json()["name"] == "Renamed"
+
+
+def test_variants_are_cached_apart(api_client, make_product):
+    make_product()
+    plain, _ = get(api_client, "/api/v1/product/")
+    narrow, queries = get(api_client, "/api/v1/product/?fields=id")
+    assert queries > 1 and narrow.content != plain.content
+    packed, queries = get(api_client, "/api/v1/product/", HTTP_ACCEPT="application/msgpack")
+    assert queries > 1 and packed["Content-Type"] == "application/msgpack"
+    assert get(api_client, "/api/v1/product/")[0].content == plain.content
+
+
+def test_errors_are_not_cached(api_client, make_product):
+    make_product()
+    for _ in range(2):
+        with CaptureQueriesContext(connection) as queries:
+            assert api_client.get("/api/v1/product/999999/").status_code == 404
+        # the versions, then the lookup itself every time
+        assert len(queries) == 2
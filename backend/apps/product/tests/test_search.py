@@ -0,0 +1,83 @@
+import pytest
+
+from apps.product.models import Product
+from apps.product.search import get_search_index, query_terms
+
+pytestmark = pytest.mark.django_db
+
+
+def search(client, query, **params):
+    response = client.get("/api/v1/product/search/", {"q": query, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def ids(data):
+    return [row["id"] for row in data["results"]]
+
+
+@pytest.fixture
+def named(make_product):
+    def make(name, description="", **kwargs):
+        product = make_product(**kwargs)
+        product.name, product.description = name, description
+        product.save()
+        return product
+
+    return make
+
+
+def test_query_terms():
+    assert query_terms('Молоко "3.2%" OR name:*') == ["молоко", "3", "2", "or", "name"]
+    assert len(query_terms("a " * 50)) == 10
+
+
+def test_matches_names_categories_and_prefixes(api_client, categories, named):
+    milk = named("Молоко Простоквашино")
+    kefir = named("Кефир", "Не молоко, но почти")
+    bread = named("Хлеб", categories=categories[:1])
+    assert ids(search(api_client, "молоко")) == [milk.pk, kefir.pk]
+    assert ids(search(api_client, "простоква")) == [milk.pk]
+    assert ids(search(api_client, categories[0].name)) == [bread.pk]
+    assert ids(search(api_client, "кефир молоко")) == [kefir.pk]
+
+
+def test_index_follows_writes(api_client, categories, named):
+    product = named("Сыр")
+    product.name = "Творог"
+    product.save()
+    assert ids(search(api_client, "сыр")) == []
+    assert ids(search(api_client, "творог")) == [product.pk]
+
+    categories[1].name = "Молочное"
+    categories[1].save()
+    product.categories.add(categories[1])
+    assert ids(search(api_client, "молочное")) == [product.pk]
+
+    Product.objects.get(pk=product.pk).delete()
+    assert ids(search(api_client, "творог")) == []
+
+
+def test_results_page_with_a_cursor(api_client, named):
+    products = [named(f"Чай {n}") for n in range(5)]
+    first = search(api_client, "чай", page_size=2)
+    seen = ids(first)
+    url = first["next"]
+    while url:
+        page = api_client.get(url).json()
+        seen += ids(page)
+        url = page["next"]
+    assert sorted(seen) == [product.pk for product in products]
+    assert len(seen) == 5
+
+
+def test_rebuild_matches_incremental_index(api_client, named):
+    named("Вода")
+    before = search(api_client, "вода")
+    get_search_index().rebuild()
+    assert search(api_client, "вода") == before
+
+
+@pytest.mark.parametrize("query", ["", "   "])
+def test_query_is_required(api_client, query):
+    assert api_client.get("/api/v1/product/search/", {"q": query}).status_code == 400
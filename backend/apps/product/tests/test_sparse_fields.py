@@ -0,0 +1,73 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.store.models import Store
+from apps.product.tests.test_versions import revalidate
+
+pytestmark = pytest.mark.django_db
+
+
+def test_fields_limit_response_and_columns(api_client, categories, make_product):
+    make_product(categories=categories[:2])
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get("/api/v1/product/?fields=id,name")
+    assert response.status_code == 200
+    assert set(response.json()["results"][0]) == {"id", "name"}
+    product_sql = [q["sql"] for q in queries.captured_queries if 'FROM "product_product"' in q["sql"]]
+    assert product_sql and not any('"description"' in sql for sql in product_sql)
+    # categories were not asked for, so the link table is never read
+    assert not any("product_product_categories" in q["sql"] for q in queries.captured_queries)
+
+
+def test_expand_nests_relations(api_client, stores, categories, make_product):
+    product = make_product(categories=categories[:2])
+    data = api_client.get(f"/api/v1/product/{product.pk}/?fields=id&expand=store,categories").json()
+    assert set(data) == {"id", "store", "categories"}
+    assert data["store"]["name"] == stores[0].name
+    assert [category["id"] for category in data["categories"]] == [category.pk for category in categories[:2]]
+
+    plain = api_client.get(f"/api/v1/product/{product.pk}/").json()
+    assert plain["store"] == stores[0].pk
+
+    store = api_client.get(f"/api/v1/store/{stores[0].pk}/?expand=manager").json()
+    assert store["manager"]["email"] == stores[0].manager.email
+
+
+@pytest.mark.parametrize("query", ["fields=id,nope", "expand=nope", "expand=description"])
+def test_unknown_names_are_rejected(api_client, make_product, query):
+    product = make_product()
+    assert api_client.get(f"/api/v1/product/?{query}").status_code == 400
+    assert api_client.get(f"/api/v1/product/{product.pk}/?{query}").status_code == 400
+
+
+def test_writes_ignore_fields(api_client, stores):
+    response = api_client.post(
+        "/api/v1/store/create/?fields=id",
+        {"name": "New", "locations": "Ош", "manager": stores[0].manager_id},
+        format="json",
+    )
+    assert response.status_code == 201
+    assert response.json()["name"] == "New"
+
+
+def test_expanded_relations_invalidate(api_client, stores, make_product):
+    product = make_product()
+    product_status = revalidate(api_client, f"/api/v1/product/{product.pk}/?expand=store")
+    store_status = revalidate(api_client, f"/api/v1/store/{stores[0].pk}/?expand=manager")
+
+    store = Store.objects.get(pk=stores[0].pk)
+    store.name = "Renamed"
+    store.save()
+    assert product_status() == 200
+
+    manager = store.manager
+    manager.email = "renamed@example.com"
+    manager.save()
+    assert store_status() == 200
+    assert api_client.get(f"/api/v1/store/{store.pk}/?expand=manager").json()["manager"]["email"] == manager.email
+
+    plain_status = revalidate(api_client, f"/api/v1/store/{store.pk}/")
+    manager.email = "again@example.com"
+    manager.save()
+    assert plain_status() == 304
@@ -0,0 +1,92 @@
+from decimal import Decimal
+
+import pytest
+
+from apps.common.bulk import BulkResult
+from apps.product.bulk import bulk_create_products, bulk_delete_products, bulk_update_products
+from apps.product.models import CategoryStats, Product
+from apps.product.stats import STORE_STATS_FIELDS, rebuild_category_stats, rebuild_store_stats
+from apps.product.stock import release, reserve
+from apps.store.models import StoreStats
+
+pytestmark = pytest.mark.django_db
+
+
+def snapshot():
+    # a store gets its row with its first product; until then it counts as empty
+    rows = StoreStats.objects.values_list("store_id", *STORE_STATS_FIELDS)
+    stores = {store_id: tuple(values) for store_id, *values in rows if any(values)}
+    categories = dict(CategoryStats.objects.values_list("category_id", "product_count"))
+    return stores, categories
+
+
+def assert_no_drift():
+    maintained = snapshot()
+    rebuild_store_stats()
+    rebuild_category_stats()
+    assert maintained == snapshot()
+
+
+def test_single_writes(stores, categories, make_product):
+    first = make_product(categories=categories[:2])
+    second = make_product(price="2.50", quantity=3, categories=[categories[2]])
+    make_product(store=stores[1], available=False, categories=categories)
+
+    first.price = Decimal("12.00")
+    first.quantity_in_stock = 7
+    first.save()
+    second.store = stores[1]
+    second.save()
+    second.availability_status = False
+    second.save()
+    first.categories.remove(categories[0])
+    first.categories.add(categories[2])
+    categories[1].products.clear()
+    assert_no_drift()
+
+    first.delete()
+    assert_no_drift()
+    assert StoreStats.objects.get(store=stores[0]).product_count == 0
+
+
+def test_unchanged_save_keeps_stats(make_product):
+    product = make_product()
+    before = snapshot()
+    Product.objects.get(pk=product.pk).save()
+    assert snapshot() == before
+
+
+def test_bulk_writes(stores, categories, make_product):
+    existing = make_product(categories=[categories[0]])
+    rows = [
+        (n, {"name": f"Bulk {n}", "description": "", "price": Decimal("3.00"), "quantity_in_stock": n,
+             "availability_status": bool(n % 2), "store": stores[n % 2].pk, "categories": [categories[n % 3].pk]})
+        for n in range(6)
+    ]
+    created = BulkResult(len(rows))
+    bulk_create_products(rows, created)
+    assert_no_drift()
+
+    updates = [
+        (0, {"id": existing.pk, "quantity_in_stock": 40, "store": stores[1].pk}),
+        (1, {"id": created.ids[1], "price": Decimal("9.99"), "categories": [categories[2].pk]}),
+        (2, {"id": created.ids[2], "availability_status": False}),
+    ]
+    bulk_update_products(updates, BulkResult(len(updates)))
+    assert_no_drift()
+
+    bulk_delete_products(created.ids[:3], BulkResult(3))
+    assert_no_drift()
+
+
+def test_reservations(make_product):
+    product = make_product(price="4.00", quantity=3)
+    other = make_product(quantity=10)
+
+    held = reserve([(product.pk, 3), (other.pk, 4)])
+    assert_no_drift()
+    assert not Product.objects.get(pk=product.pk).availability_status
+
+    release(held.pk)
+    assert_no_drift()
+    assert Product.objects.get(pk=product.pk).availability_status
@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+import pytest
+
+from apps.product.models import Product, Reservation
+from apps.product.stock import InsufficientStock, ReservationStateError, commit, release, release_expired, reserve
+
+pytestmark = pytest.mark.django_db
+
+
+def stock(product):
+    return Product.objects.values_list("quantity_in_stock", flat=True).get(pk=product.pk)
+
+
+def test_reserve_takes_all_or_nothing(make_product):
+    product, scarce = make_product(quantity=5), make_product(quantity=1)
+
+    with pytest.raises(InsufficientStock) as error:
+        reserve([(product.pk, 2), (scarce.pk, 2)])
+    assert error.value.shortages == {scarce.pk: 1}
+    assert (stock(product), stock(scarce)) == (5, 1)
+
+    reserve([(product.pk, 2), (product.pk, 3)])
+    assert stock(product) == 0
+
+
+def test_release_returns_stock_once(make_product):
+    product = make_product(quantity=5)
+    reservation = reserve([(product.pk, 4)])
+
+    assert release(reservation.pk).status == "released"
+    assert stock(product) == 5
+    with pytest.raises(ReservationStateError) as error:
+        release(reservation.pk)
+    assert error.value.status == "released"
+    assert stock(product) == 5
+
+
+def test_commit_and_release_exclude_each_other(make_product):
+    product = make_product(quantity=5)
+    reservation = reserve([(product.pk, 2)])
+
+    assert commit(reservation.pk).status == "committed"
+    with pytest.raises(ReservationStateError):
+        release(reservation.pk)
+    with pytest.raises(ReservationStateError):
+        commit(reservation.pk)
+    assert stock(product) == 3
+
+
+def test_repeated_release_request(api_client, make_product):
+    product = make_product(quantity=5)
+    response = api_client.post(
+        "/api/v1/reservation/create/", {"items": [{"product": product.pk, "quantity": 2}]}, format="json"
+    )
+    assert response.status_code == 201
+    url = f"/api/v1/reservation/{response.data['id']}/release/"
+
+    assert api_client.post(url).status_code == 200
+    repeated = api_client.post(url)
+    assert repeated.status_code == 409
+    assert repeated.data["status"] == "released"
+    assert stock(product) == 5
+
+    assert api_client.post("/api/v1/reservation/999999/release/").status_code == 404
+
+
+def test_release_expired(make_product):
+    product = make_product(quantity=10)
+    expiring = reserve([(product.pk, 2)], ttl=60)
+    kept = reserve([(product.pk, 3)])
+    committed = reserve([(product.pk, 1)], ttl=60)
+    commit(committed.pk)
+
+    assert release_expired(now=expiring.expires_at - timedelta(seconds=1)) == 0
+    assert release_expired(now=expiring.expires_at + timedelta(seconds=1)) == 1
+    assert Reservation.objects.get(pk=expiring.pk).status == "released"
+    assert Reservation.objects.get(pk=kept.pk).status == "held"
+    assert stock(product) == 6
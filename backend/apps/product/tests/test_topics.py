@@ -0,0 +1,62 @@
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.testing import WebsocketCommunicator
+
+from apps.product.models import Product
+from core.asgi import application
+from utils.realtime import merge_deltas
+
+pytestmark = pytest.mark.django_db
+
+
+def test_merge_deltas():
+    deltas = [
+        {"entity": "product", "id": 1, "op": "create", "changed": {"name": "a"}, "seq": 1},
+        {"entity": "product", "id": 1, "op": "update", "changed": {"price": "2.00"}, "seq": 2},
+        {"entity": "product", "id": 2, "op": "update", "changed": {"name": "b"}, "seq": 3},
+        {"entity": "product", "id": None, "op": "bulk_delete", "changed": {}, "ids": [3, 4]},
+        {"entity": "product", "id": 2, "op": "delete", "changed": {}, "seq": 4},
+    ]
+    assert merge_deltas(deltas) == [
+        {"entity": "product", "id": 1, "op": "create", "changed": {"name": "a", "price": "2.00"}, "seq": 2},
+        {"entity": "product", "id": 2, "op": "delete", "changed": {}, "seq": 4},
+        {"entity": "product", "id": None, "op": "bulk_delete", "changed": {}, "ids": [3, 4]},
+    ]
+
+
+def test_subscribers_get_their_stores_deltas(settings, stores, make_product, django_capture_on_commit_callbacks):
+    settings.NOTIFICATION_COALESCE_WINDOW = 0.05
+    mine, other = make_product(), make_product(store=stores[1])
+    topic = f"store:{stores[0].pk}:products"
+
+    def update(product, **fields):
+        with django_capture_on_commit_callbacks(execute=True):
+            for name, value in fields.items():
+                setattr(product, name, value)
+                product.save()
+
+    @async_to_sync
+    async def scenario():
+        communicator = WebsocketCommunicator(application, "/ws/notifications/")
+        await communicator.connect()
+        await communicator.send_json_to({"action": "subscribe", "topic": "store:x"})
+        assert await communicator.receive_json_from() == {"error": "Unknown topic: store:x"}
+        await communicator.send_json_to({"action": "subscribe", "topic": topic})
+        assert await communicator.receive_json_from() == {"action": "subscribe", "topic": topic, "ok": True}
+
+        await sync_to_async(update)(other, name="Elsewhere")
+        await sync_to_async(update)(mine, price="3.00", name="Мой")
+        frame = await communicator.receive_json_from(timeout=1)
+        assert frame["topic"] == topic
+        (delta,) = frame["deltas"]
+        assert (delta["id"], delta["op"], delta["changed"]) == (mine.pk, "update", {"price": "3.00", "name": "Мой"})
+        assert await communicator.receive_nothing(timeout=0.2)
+
+        await communicator.send_json_to({"action": "unsubscribe", "topic": topic})
+        await communicator.receive_json_from()
+        await sync_to_async(update)(mine, name="Quiet")
+        assert await communicator.receive_nothing(timeout=0.2)
+        await communicator.disconnect()
+
+    scenario()
+    assert Product.objects.get(pk=mine.pk).name == "Quiet"
@@ -0,0 +1,57 @@
+from decimal import Decimal
+
+import pytest
+from rest_framework import serializers
+
+from api.v1.product.serializers import CategorySerializer, ProductSerializer
+from api.v1.reservation.serializers import ReservationSerializer
+from apps.product.models import Product
+from utils.values_serializer import values_plan
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize(
+    "resource, query",
+    [
+        ("product", ""),
+        ("product", "?expand=store,categories"),
+        ("product", "?fields=id,price,categories"),
+        ("product", "?fields=id,store,name&expand=store"),
+        ("store", "?expand=manager"),
+        ("category", ""),
+    ],
+)
+def test_list_rows_match_the_serializer(api_client, stores, categories, make_product, resource, query):
+    # lists go through values(), detail through the serializer
+    make_product(price="1.50", categories=categories[1:])
+    make_product(store=stores[1], price="1000.00", available=False)
+    make_product(categories=categories[:1])
+    rows = api_client.get(f"/api/v1/{resource}/{query}").json()["results"]
+    assert rows
+    for row in rows:
+        assert row == api_client.get(f"/api/v1/{resource}/{row['id']}/{query}").json()
+
+
+def test_plan_matches_serializer_directly(categories, make_product):
+    product = make_product(categories=categories)
+    Product.objects.filter(pk=product.pk).update(price=Decimal("2.5"))
+    queryset = Product.objects.order_by("pk")
+    plan = values_plan(ProductSerializer())
+    assert plan.serialize(plan.queryset(queryset)) == ProductSerializer(queryset, many=True).data
+    assert values_plan(CategorySerializer()) is not None
+
+
+def test_instance_only_fields_fall_back():
+    class WithMethod(CategorySerializer):
+        label = serializers.SerializerMethodField()
+
+        def get_label(self, obj):
+            return obj.name.upper()
+
+        class Meta(CategorySerializer.Meta):
+            fields = [*CategorySerializer.Meta.fields, "label"]
+
+    assert values_plan(WithMethod()) is None
+    # reverse relations need instances
+    assert values_plan(ReservationSerializer()) is None
@@ -0,0 +1,92 @@
+import pytest
+
+from apps.common.models import ModelVersion
+
+pytestmark = pytest.mark.django_db
+
+
+def version(key):
+    return ModelVersion.objects.current([key])[key].version
+
+
+def revalidate(client, url):
+    """A callable that revalidates ``url`` with the ETag it has now."""
+    etag = client.get(url)["ETag"]
+    return lambda: client.get(url, HTTP_IF_NONE_MATCH=etag).status_code
+
+
+def test_writes_bump_versions(stores, categories, make_product):
+    product = make_product(categories=[categories[0]])
+    before = {key: version(key) for key in ("product", f"product:store:{stores[0].pk}", "category", "store")}
+
+    product.price = 20
+    product.save()
+    assert version("product") == before["product"] + 1
+    assert version(f"product:store:{stores[0].pk}") == before[f"product:store:{stores[0].pk}"] + 1
+
+    product.categories.add(categories[1])
+    assert version("product") == before["product"] + 2
+
+    categories[0].name = "Renamed"
+    categories[0].save()
+    assert version("category") == before["category"] + 1
+
+    stores[0].name = "Renamed"
+    stores[0].save()
+    assert version("store") == before["store"] + 1
+
+
+def test_list_not_modified_until_write(api_client, stores, make_product):
+    product = make_product()
+    status = revalidate(api_client, "/api/v1/product/")
+    assert status() == 304
+
+    response = api_client.put(
+        f"/api/v1/product/update/{product.pk}/",
+        {"name": "Updated", "description": "Updated", "price": "11.00", "quantity_in_stock": 1,
+         "availability_status": True, "store": stores[0].pk},
+        format="json",
+    )
+    assert response.status_code == 200
+    assert status() == 200
+    assert api_client.get("/api/v1/product/").json()["results"][0]["name"] == "Updated"
+
+
+def test_store_filtered_list_ignores_other_stores(api_client, stores, make_product):
+    make_product(store=stores[0])
+    other = make_product(store=stores[1])
+    status = revalidate(api_client, f"/api/v1/product/?store={stores[0].pk}")
+
+    other.quantity_in_stock = 0
+    other.save()
+    assert status() == 304
+
+    make_product(store=stores[0])
+    assert status() == 200
+
+
+def test_detail_not_modified_until_write(api_client, make_product):
+    product = make_product()
+    status = revalidate(api_client, f"/api/v1/product/{product.pk}/")
+    assert status() == 304
+
+    product.name = "Updated"
+    product.save()
+    assert status() == 200
+
+
+def test_reads_never_create_counters(api_client, stores, make_product):
+    make_product()
+    ModelVersion.objects.all().delete()
+
+    for query in ("", "?store=1,2,99999", "?store=123456789", "?expand=store,categories"):
+        assert api_client.get(f"/api/v1/product/{query}").status_code == 200
+    assert not ModelVersion.objects.exists()
+
+    etag = api_client.get("/api/v1/product/")["ETag"]
+    stores[0].name = "Renamed"
+    stores[0].save()
+    assert set(ModelVersion.objects.values_list("key", flat=True)) == {"store"}
+    assert api_client.get("/api/v1/product/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert api_client.get("/api/v1/product/?expand=store", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Store 
+from .models import Store, StoreStats
 
 
-admin.site.register(Store)
\ No newline at end of file
+admin.site.register(Store)
+admin.site.register(StoreStats)
\ No newline at end of file
@@ -1,7 +1,8 @@
 from django.db import models
 from apps.accounts.models import CustomUser
+from apps.common.models import TrackedFieldsMixin
 
-class Store(models.Model):
+class Store(TrackedFieldsMixin, models.Model):
     name = models.CharField(max_length=100, verbose_name="Name")
     locations = models.CharField(max_length=255, verbose_name="Locations")
     manager = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='establishments')
@@ -9,6 +10,29 @@ class Store(models.Model):
     class Meta:
         verbose_name = "Store"
         verbose_name_plural = "Stores"
+        indexes = [
+            models.Index(fields=["name", "id"], name="store_name_id_idx"),
+        ]
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+
+class StoreStats(models.Model):
+    """
+    Denormalized product aggregates of a store, maintained incrementally by
+    apps.product.stats so dashboards don't scan the product table.
+    """
+    store = models.OneToOneField(Store, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    product_count = models.IntegerField(default=0, verbose_name="Product count")
+    available_count = models.IntegerField(default=0, verbose_name="Available product count")
+    units_in_stock = models.BigIntegerField(default=0, verbose_name="Units in stock")
+    inventory_value = models.DecimalField(max_digits=18, decimal_places=2, default=0, verbose_name="Inventory value")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Updated at")
+
+    class Meta:
+        verbose_name = "Store stats"
+        verbose_name_plural = "Store stats"
+
+    def __str__(self):
+        return f"{self.store_id}: {self.product_count} products"
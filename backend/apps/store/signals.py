@@ -0,0 +1,41 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.common.models import ChangeLog, ModelVersion
+from utils.realtime import changed_by_name, publish_delta
+from .models import Store
+
+
+@receiver([post_save, post_delete], sender=Store)
+def bump_store_version(sender, instance, **kwargs):
+    ModelVersion.objects.bump("store")
+
+
+@receiver(post_save, sender=Store)
+def log_store_save(sender, instance, created, **kwargs):
+    if created or instance.get_changed_fields():
+        entry = ChangeLog.objects.record("store", instance.pk, "create" if created else "update")
+        instance._change_seq = entry.pk
+
+
+@receiver(post_delete, sender=Store)
+def log_store_delete(sender, instance, **kwargs):
+    instance._change_seq = ChangeLog.objects.record("store", instance.pk, "delete").pk
+
+
+@receiver(post_save, sender=Store)
+def publish_store_delta(sender, instance, created, **kwargs):
+    changed = changed_by_name(Store, instance.get_changed_fields())
+    if changed:
+        publish_delta(
+            [f"store:{instance.pk}"], "store", instance.pk, "create" if created else "update", changed,
+            seq=getattr(instance, "_change_seq", None),
+        )
+
+
+@receiver(post_delete, sender=Store)
+def publish_store_delete(sender, instance, **kwargs):
+    publish_delta(
+        [f"store:{instance.pk}"], "store", instance.pk, "delete",
+        seq=getattr(instance, "_change_seq", None),
+    )
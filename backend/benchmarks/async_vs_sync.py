@@ -0,0 +1,108 @@
+"""
+Compare the sync DRF list/retrieve endpoints with their async entry
+points (utils.async_views) under the same concurrency, against a running
+ASGI server:
+
+    CATALOG_CACHE_BACKEND=django.core.cache.backends.dummy.DummyCache \
+        uvicorn core.asgi:application --workers 1      # or daphne core.asgi:application
+    python benchmarks/async_vs_sync.py --base-url http://127.0.0.1:8000 --concurrency 200
+
+The dummy cache keeps both paths from being answered by the response
+cache, so they do the database and serialization work on every request.
+Reports throughput and p50/p99 latency per endpoint pair as a table,
+or as JSON with --json.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import aiohttp
+
+ENDPOINTS = [
+    ("product list", "/api/v1/product/?page_size=50", "/api/v1/async/product/?page_size=50"),
+    ("category list", "/api/v1/category/?page_size=50", "/api/v1/async/category/?page_size=50"),
+    ("store list", "/api/v1/store/?page_size=50", "/api/v1/async/store/?page_size=50"),
+    ("product detail", "/api/v1/product/{pk}/", "/api/v1/async/product/{pk}/"),
+]
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, round(pct / 100 * (len(samples) - 1)))
+    return samples[index]
+
+
+async def run(session, url, total, concurrency):
+    latencies, errors = [], 0
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(url)
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            target = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                async with session.get(target) as response:
+                    await response.read()
+                    if response.status >= 400:
+                        errors += 1
+            except aiohttp.ClientError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": total,
+        "errors": errors,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+async def main(args):
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    async with aiohttp.ClientSession(args.base_url, connector=connector) as session:
+        results = []
+        for name, sync_url, async_url in ENDPOINTS:
+            sync_url, async_url = sync_url.format(pk=args.pk), async_url.format(pk=args.pk)
+            # warm up connections and the server's import-time caches
+            await run(session, sync_url, args.concurrency, args.concurrency)
+            await run(session, async_url, args.concurrency, args.concurrency)
+            results.append({
+                "endpoint": name,
+                "sync": await run(session, sync_url, args.requests, args.concurrency),
+                "async": await run(session, async_url, args.requests, args.concurrency),
+            })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--pk", type=int, default=1, help="product id used for the detail endpoint")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = asyncio.run(main(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'endpoint':<16} {'path':<6} {'rps':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+        for row in results:
+            for path in ("sync", "async"):
+                stats = row[path]
+                print(
+                    f"{row['endpoint']:<16} {path:<6} {stats['rps']:>9} "
+                    f"{stats['p50_ms']:>9} {stats['p99_ms']:>9} {stats['errors']:>7}"
+                )
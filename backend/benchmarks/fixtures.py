@@ -0,0 +1,43 @@
+"""
+Deterministic catalog datasets for the benchmark suite. Each size is built
+once into benchmarks/.data/<size>.sqlite3 and copied for every run, so
+runs on different commits start from byte-identical data.
+"""
+import os
+import shutil
+import sqlite3
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+DATA_DIR = os.environ.get("BENCH_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data"))
+SEED = 20240101
+
+
+def template_path(size):
+    return os.path.join(DATA_DIR, f"{size}.sqlite3")
+
+
+def prepare_database(size, target):
+    """Copy the dataset for ``size`` to ``target``; returns False if it has to be built first."""
+    template = template_path(size)
+    if not os.path.exists(template):
+        return False
+    shutil.copyfile(template, target)
+    return True
+
+
+def save_template(size, source):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with sqlite3.connect(source) as db:
+        db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    shutil.copyfile(source, template_path(size) + ".tmp")
+    os.replace(template_path(size) + ".tmp", template_path(size))
+
+
+def build_dataset(products, stdout=None):
+    """Fill the (migrated, empty) default database through the generate_data command."""
+    from django.core.management import call_command
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    call_command("generate_data", products=products, seed=SEED, password="benchmark", stdout=stdout)
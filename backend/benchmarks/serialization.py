@@ -0,0 +1,81 @@
+"""
+Time the list serialization of ProductSerializer against the values()
+fast path of utils.values_serializer on the same rows:
+
+    python manage.py generate_data --products 10000     # once, on a scratch database
+    python benchmarks/serialization.py --rows 10000
+
+Runs against the database in the active Django settings. For each path it
+reports the best of --repeat runs of "query" (fetching the rows, planned
+prefetch included) and "serialize" (turning them into the response
+dicts), and checks that both paths produce the same output.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from api.v1.product.serializers import ProductSerializer  # noqa: E402
+from apps.product.models import Product  # noqa: E402
+from utils.query_planner import plan_queryset  # noqa: E402
+from utils.values_serializer import values_plan  # noqa: E402
+
+ORDERING = ("name", "id")
+
+
+def serializer_path(rows):
+    started = time.perf_counter()
+    queryset = plan_queryset(Product.objects.order_by(*ORDERING), ProductSerializer(), extra_fields=ORDERING)
+    instances = list(queryset[:rows])
+    fetched = time.perf_counter()
+    data = ProductSerializer(instances, many=True).data
+    return data, fetched - started, time.perf_counter() - fetched
+
+
+def values_path(rows):
+    started = time.perf_counter()
+    plan = values_plan(ProductSerializer())
+    page = list(plan.queryset(Product.objects.order_by(*ORDERING), extra_fields=ORDERING)[:rows])
+    fetched = time.perf_counter()
+    # the grouped category query is part of building the rows here
+    data = plan.serialize(page)
+    return data, fetched - started, time.perf_counter() - fetched
+
+
+def measure(path, rows, repeat):
+    timings = [path(rows)[1:] for _ in range(repeat)]
+    query, serialize = min(timings, key=sum)
+    return {"query_ms": round(query * 1000, 1), "serialize_ms": round(serialize * 1000, 1), "total_ms": round((query + serialize) * 1000, 1)}
+
+
+def main(args):
+    count = Product.objects.count()
+    if count < args.rows:
+        sys.exit(f"Only {count} products; run manage.py generate_data --products {args.rows} first")
+
+    same = [dict(item) for item in serializer_path(args.rows)[0]] == values_path(args.rows)[0]
+    serializer = measure(serializer_path, args.rows, args.repeat)
+    values = measure(values_path, args.rows, args.repeat)
+    return {
+        "rows": args.rows,
+        "same_output": same,
+        "serializer": serializer,
+        "values": values,
+        "serialize_speedup": round(serializer["serialize_ms"] / values["serialize_ms"], 1),
+        "total_speedup": round(serializer["total_ms"] / values["total_ms"], 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    print(json.dumps(main(parser.parse_args()), indent=2))
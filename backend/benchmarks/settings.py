@@ -0,0 +1,23 @@
+"""
+Settings for benchmarks/suite.py: the project settings on a throwaway
+SQLite file (BENCH_DB), with the response cache off unless --cache is given.
+"""
+import os
+
+os.environ.setdefault("CATALOG_CACHE_BACKEND", "django.core.cache.backends.dummy.DummyCache")
+
+from core.settings import *  # noqa: E402,F401,F403
+
+DEBUG = False
+ALLOWED_HOSTS = ["*"]
+
+DATABASES = {
+    "default": {
+        "ENGINE": "benchmarks.sqlite_immediate",
+        "NAME": os.environ["BENCH_DB"],
+        # concurrent writers wait for the lock instead of failing straight away
+        "OPTIONS": {"timeout": 30},
+    }
+}
+
+NOTIFICATION_COALESCE_WINDOW = float(os.environ.get("BENCH_COALESCE_WINDOW", "0.05"))
@@ -0,0 +1,13 @@
+"""
+SQLite backend whose transactions take the write lock up front
+(``BEGIN IMMEDIATE``, what Django 5.1 calls ``transaction_mode``). With the
+default deferred transactions, a request that reads and then writes fails
+with "database is locked" as soon as another writer is active, instead of
+waiting out the busy timeout.
+"""
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute("BEGIN IMMEDIATE")
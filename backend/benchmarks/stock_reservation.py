@@ -0,0 +1,139 @@
+"""
+Hammer one product's stock from many threads and check nothing is oversold:
+
+    python benchmarks/stock_reservation.py --threads 16 --stock 2000
+    python benchmarks/stock_reservation.py --naive      # read-modify-write, for comparison
+
+Runs against the database in the active Django settings (a scratch
+database, it creates its own store and products). Every thread reserves
+1-3 units of random products until they are sold out; the script then
+checks that units reserved + units left == initial stock for every product,
+and reports reservations per second. --naive does the same with the old
+read-modify-write save() to show the lost updates it produces.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import OperationalError, close_old_connections, connection  # noqa: E402
+
+from apps.accounts.models import CustomUser  # noqa: E402
+from apps.product.models import Product  # noqa: E402
+from apps.product.stock import InsufficientStock, reserve  # noqa: E402
+from apps.store.models import Store  # noqa: E402
+
+
+def naive_reserve(items):
+    # what a PUT of the whole product amounts to: read, check, write back
+    for product_id, quantity in items:
+        product = Product.objects.get(pk=product_id)
+        if product.quantity_in_stock < quantity:
+            raise InsufficientStock({product_id: product.quantity_in_stock})
+        product.quantity_in_stock -= quantity
+        product.save()
+
+
+def setup(products, stock):
+    manager, _ = CustomUser.objects.get_or_create(email="stock-benchmark@example.com")
+    store = Store.objects.create(name="stock benchmark", locations="-", manager=manager)
+    return [
+        Product.objects.create(
+            name=f"stock benchmark {index}", description="-", price="1.00",
+            quantity_in_stock=stock, store=store,
+        ).pk
+        for index in range(products)
+    ], store
+
+
+def worker(product_ids, reserve_func, batch, counters, lock):
+    rng = random.Random()
+    sold_out = set()
+    reserved, ok, failed, errors = {}, 0, 0, 0
+    try:
+        while len(sold_out) < len(product_ids):
+            candidates = [pk for pk in product_ids if pk not in sold_out]
+            items = [(pk, rng.randint(1, 3)) for pk in rng.sample(candidates, min(batch, len(candidates)))]
+            try:
+                reserve_func(items)
+            except InsufficientStock as ex:
+                failed += 1
+                sold_out.update(pk for pk, left in ex.shortages.items() if not left)
+                continue
+            except OperationalError:
+                errors += 1  # e.g. SQLite "database is locked" under heavy write contention
+                continue
+            ok += 1
+            for pk, quantity in items:
+                reserved[pk] = reserved.get(pk, 0) + quantity
+    finally:
+        close_old_connections()
+        connection.close()
+    with lock:
+        counters["ok"] += ok
+        counters["failed"] += failed
+        counters["errors"] += errors
+        for pk, quantity in reserved.items():
+            counters["reserved"][pk] = counters["reserved"].get(pk, 0) + quantity
+
+
+def main(args):
+    product_ids, store = setup(args.products, args.stock)
+    reserve_func = naive_reserve if args.naive else reserve
+    counters, lock = {"ok": 0, "failed": 0, "errors": 0, "reserved": {}}, threading.Lock()
+    threads = [
+        threading.Thread(target=worker, args=(product_ids, reserve_func, args.batch, counters, lock))
+        for _ in range(args.threads)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    left = dict(Product.objects.filter(pk__in=product_ids).values_list("pk", "quantity_in_stock"))
+    oversold = {
+        pk: counters["reserved"].get(pk, 0) + left[pk] - args.stock
+        for pk in product_ids
+        if counters["reserved"].get(pk, 0) + left[pk] != args.stock or left[pk] < 0
+    }
+    if not args.keep:
+        store.delete()
+    return {
+        "mode": "naive" if args.naive else "conditional update",
+        "threads": args.threads,
+        "reservations": counters["ok"],
+        "rejected": counters["failed"],
+        "db_errors": counters["errors"],
+        "seconds": round(elapsed, 3),
+        "reservations_per_second": round(counters["ok"] / elapsed, 1),
+        "units_sold": sum(counters["reserved"].values()),
+        "units_in_stock": args.stock * args.products,
+        "oversold": oversold,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--products", type=int, default=4)
+    parser.add_argument("--stock", type=int, default=1000, help="initial units per product")
+    parser.add_argument("--batch", type=int, default=1, help="products per reservation")
+    parser.add_argument("--naive", action="store_true", help="use read-modify-write instead of reserve()")
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark store and products")
+    args = parser.parse_args()
+
+    result = main(args)
+    print(json.dumps(result, indent=2))
+    sys.exit(1 if result["oversold"] and not args.naive else 0)
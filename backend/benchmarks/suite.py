@@ -0,0 +1,390 @@
+"""
+End-to-end benchmark of the HTTP API and the WebSocket fan-out, against an
+in-process daphne server on a throwaway copy of a generated SQLite dataset:
+
+    python benchmarks/suite.py --size 100k
+    python benchmarks/suite.py --size 100k --output bench-main.json
+    python benchmarks/suite.py --size 100k --compare bench-main.json
+
+Datasets (1k/10k/100k/1m products plus proportional users, stores and
+categories) are generated once per size and schema into benchmarks/.data/
+and reused, so two commits are measured on identical data. Read scenarios
+hit the list/detail/search endpoints; write scenarios create, update and
+then delete --writes objects of each entity; the WebSocket scenario
+subscribes --ws-clients sockets to one store and measures how fast product
+deltas and "new user" notifications reach all of them.
+
+The response cache is off unless --cache is given, so the numbers reflect
+the code path rather than cache hits. Reports requests/s and p50/p99
+latency; --json prints and --output writes the full machine-readable result.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.async_vs_sync import percentile  # noqa: E402
+from benchmarks.fixtures import SIZES, build_dataset, prepare_database, save_template  # noqa: E402
+
+
+def latency_stats(latencies, errors, elapsed):
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+    }
+
+
+async def run_requests(session, requests, concurrency):
+    """``requests`` is a list of (method, path, json body); returns stats and the parsed bodies."""
+    import aiohttp
+
+    pending = list(enumerate(requests))
+    pending.reverse()
+    latencies, bodies, errors = [], [None] * len(requests), 0
+
+    async def worker():
+        nonlocal errors
+        while pending:
+            index, (method, path, body) = pending.pop()
+            started = time.perf_counter()
+            try:
+                async with session.request(method, path, json=body) as response:
+                    content = await response.read()
+                    if response.status >= 400:
+                        errors += 1
+                    elif content and response.content_type == "application/json":
+                        bodies[index] = json.loads(content)
+            except aiohttp.ClientError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latency_stats(latencies, errors, time.perf_counter() - started), bodies
+
+
+def read_scenarios(data, count, rng):
+    from apps.product.generate import WORDS
+
+    products, stores = data["product_ids"], data["store_ids"]
+    return {
+        "user list": [("GET", "/api/v1/user/?page_size=50", None)] * count,
+        "category list": [("GET", "/api/v1/category/?page_size=50", None)] * count,
+        "store list": [("GET", "/api/v1/store/?page_size=50", None)] * count,
+        "product list": [("GET", "/api/v1/product/?page_size=50", None)] * count,
+        "product detail": [("GET", f"/api/v1/product/{rng.choice(products)}/", None) for _ in range(count)],
+        "product filter+facets": [
+            ("GET", f"/api/v1/product/?store={rng.choice(stores)}&price_min=10&facets=1", None)
+            for _ in range(count)
+        ],
+        "product search": [("GET", f"/api/v1/product/search/?q={rng.choice(WORDS)[:4]}", None) for _ in range(count)],
+    }
+
+
+def write_payloads(entity, index, data, rng):
+    if entity == "user":
+        return {"email": f"bench-{index}-{rng.random():.12f}@bench.local", "role": "user"}
+    if entity == "category":
+        return {"name": f"Категория {index}", "description": "Benchmark"}
+    if entity == "store":
+        return {"name": f"Магазин {index}", "locations": "Benchmark", "manager": rng.choice(data["user_ids"])}
+    return {
+        "name": f"Товар {index}",
+        "description": "Benchmark",
+        "price": "9.99",
+        "quantity_in_stock": 10,
+        "store": rng.choice(data["store_ids"]),
+    }
+
+
+WRITE_ROUTES = {
+    "user": ("user/create/", "user/update/{}/", "user/delete/{}/"),
+    "category": ("category/create/", "category/update/{}/", "category/delete/{}/"),
+    "store": ("store/create/", "store/update/{}/", "store/delete/{}/"),
+    "product": ("product/create/", "product/update/{}/", "product/delete/{}/"),
+}
+
+
+async def write_scenarios(session, data, writes, concurrency, rng):
+    results = {}
+    for entity, (create, update, delete) in WRITE_ROUTES.items():
+        payloads = [write_payloads(entity, index, data, rng) for index in range(writes)]
+        stats, bodies = await run_requests(
+            session, [("POST", f"/api/v1/{create}", payload) for payload in payloads], concurrency
+        )
+        results[f"{entity} create"] = stats
+        created = [(body["id"], payload) for body, payload in zip(bodies, payloads) if body and "id" in body]
+
+        updates = []
+        for pk, payload in created:
+            changed = dict(payload)
+            if entity == "user":
+                changed["role"] = "manager"
+            else:
+                changed["name"] = payload["name"] + " (изм.)"
+            updates.append(("PUT", f"/api/v1/{update.format(pk)}", changed))
+        results[f"{entity} update"], _ = await run_requests(session, updates, concurrency)
+
+        deletes = [("DELETE", f"/api/v1/{delete.format(pk)}", None) for pk, _ in created]
+        results[f"{entity} delete"], _ = await run_requests(session, deletes, concurrency)
+    return results
+
+
+async def websocket_fanout(session, data, clients, events):
+    """Product deltas on one store topic and "new user" notifications, each reaching ``clients`` sockets."""
+    store_id, product_ids = data["ws_store_id"], data["ws_product_ids"][:events]
+    topic = f"store:{store_id}:products"
+    sockets = [await session.ws_connect("/ws/notifications/") for _ in range(clients)]
+    for socket in sockets:
+        await socket.send_json({"action": "subscribe", "topic": topic})
+        while "ok" not in await socket.receive_json():
+            pass
+
+    sent, delta_latencies, frames = {}, [], 0
+    users_expected, user_counts = len(product_ids), [0] * clients
+
+    async def reader(position, socket):
+        nonlocal frames
+        seen = 0
+        while seen < len(product_ids) or user_counts[position] < users_expected:
+            message = await socket.receive_json()
+            frames += 1
+            now = time.perf_counter()
+            for delta in message.get("deltas", ()):
+                name = delta.get("changed", {}).get("name", "")
+                if name.startswith("ws-"):
+                    delta_latencies.append(now - sent[int(name[3:])])
+                    seen += 1
+            if "message" in message:
+                user_counts[position] += message.get("count", 1)
+
+    readers = [asyncio.create_task(reader(position, socket)) for position, socket in enumerate(sockets)]
+    started = time.perf_counter()
+    for index, product_id in enumerate(product_ids):
+        sent[index] = time.perf_counter()
+        payload = {"name": f"ws-{index}", "description": "ws", "price": "1.00", "quantity_in_stock": 1, "store": store_id}
+        async with session.put(f"/api/v1/product/update/{product_id}/", json=payload) as response:
+            await response.read()
+    for index in range(users_expected):
+        async with session.post("/api/v1/user/create/", json={"email": f"ws-{index}-{time.time()}@bench.local"}) as response:
+            await response.read()
+
+    try:
+        await asyncio.wait_for(asyncio.gather(*readers), timeout=30)
+    except asyncio.TimeoutError:
+        for task in readers:
+            task.cancel()
+    elapsed = time.perf_counter() - started
+    for socket in sockets:
+        await socket.close()
+
+    delivered = len(delta_latencies)
+    return {
+        "clients": clients,
+        "events": len(product_ids),
+        "deltas_expected": clients * len(product_ids),
+        "deltas_delivered": delivered,
+        "deltas_per_second": round(delivered / elapsed, 1),
+        "delta_p50_ms": round(statistics.median(delta_latencies) * 1000, 2) if delivered else None,
+        "delta_p99_ms": round(percentile(delta_latencies, 99) * 1000, 2) if delivered else None,
+        "clients_with_all_user_notifications": sum(count == users_expected for count in user_counts),
+        "frames": frames,
+    }
+
+
+async def run_suite(base_url, data, args):
+    import aiohttp
+
+    rng = random.Random(args.seed)
+    connector = aiohttp.TCPConnector(limit=max(args.concurrency, args.ws_clients) + 10)
+    async with aiohttp.ClientSession(base_url, connector=connector) as session:
+        http = {}
+        for name, requests in read_scenarios(data, args.requests, rng).items():
+            if args.only and args.only not in name:
+                continue
+            await run_requests(session, requests[: args.concurrency], args.concurrency)  # warm-up
+            http[name], _ = await run_requests(session, requests, args.concurrency)
+        if not args.only or "write" in args.only:
+            http.update(await write_scenarios(session, data, args.writes, args.concurrency, rng))
+        websocket = None
+        if args.ws_clients and (not args.only or "ws" in args.only):
+            websocket = await websocket_fanout(session, data, args.ws_clients, args.ws_events)
+    return http, websocket
+
+
+def schema_fingerprint():
+    from django.apps import apps
+
+    tables = sorted(
+        f"{model._meta.db_table}:{','.join(field.column for field in model._meta.concrete_fields)}"
+        for model in apps.get_models()
+    )
+    return hashlib.md5("\n".join(tables).encode(), usedforsecurity=False).hexdigest()[:10]
+
+
+def load_database(size, db_path):
+    from django.core.management import call_command
+    from django.db import connections
+
+    from apps.product.generate import VERSION
+
+    dataset = f"{size}-v{VERSION}-{schema_fingerprint()}"
+    if prepare_database(dataset, db_path):
+        return dataset, False
+    print(f"Generating the {size} dataset (once per size and schema)...", file=sys.stderr)
+    call_command("migrate", run_syncdb=True, verbosity=0)
+    build_dataset(SIZES[size], stdout=sys.stderr)
+    connections.close_all()
+    save_template(dataset, db_path)
+    return dataset, True
+
+
+def collect_ids(ws_events):
+    from django.db.models import Count
+
+    from apps.accounts.models import CustomUser
+    from apps.product.models import Product
+    from apps.store.models import Store
+
+    ws_store = Store.objects.annotate(count=Count("products")).order_by("-count").first()
+    return {
+        "user_ids": list(CustomUser.objects.values_list("pk", flat=True)[:1000]),
+        "store_ids": list(Store.objects.values_list("pk", flat=True)),
+        "product_ids": list(Product.objects.order_by("?").values_list("pk", flat=True)[:5000]),
+        "ws_store_id": ws_store.pk,
+        "ws_product_ids": list(ws_store.products.values_list("pk", flat=True)[:ws_events]),
+    }
+
+
+def start_server():
+    """daphne on an ephemeral port, in a background thread of this process."""
+    from daphne.server import Server
+
+    from core.asgi import application
+
+    server = Server(application, endpoints=["tcp:port=0:interface=127.0.0.1"], signal_handlers=False, verbosity=0)
+    threading.Thread(target=server.run, daemon=True).start()
+    deadline = time.monotonic() + 10
+    while not server.listening_addresses:
+        if time.monotonic() > deadline:
+            raise RuntimeError("daphne did not start")
+        time.sleep(0.05)
+    host, port = server.listening_addresses[0]
+    return f"http://{host}:{port}"
+
+
+def stop_server():
+    from twisted.internet import reactor
+
+    reactor.callFromThread(reactor.stop)
+
+
+def git_commit():
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True).strip()
+        dirty = subprocess.call(["git", "diff", "--quiet", "HEAD"], cwd=BACKEND_DIR) != 0
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("-dirty" if dirty else "")
+
+
+def print_report(result, baseline=None):
+    base_http = (baseline or {}).get("http", {})
+    print(f"{'scenario':<24} {'rps':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}" + ("   vs baseline" if baseline else ""))
+    for name, stats in result["http"].items():
+        line = f"{name:<24} {stats['rps']:>9} {stats['p50_ms'] or '-':>9} {stats['p99_ms'] or '-':>9} {stats['errors']:>7}"
+        old = base_http.get(name)
+        if old and old["rps"]:
+            line += f"   rps {100 * (stats['rps'] - old['rps']) / old['rps']:+.1f}%"
+            if old["p99_ms"] and stats["p99_ms"]:
+                line += f", p99 {100 * (stats['p99_ms'] - old['p99_ms']) / old['p99_ms']:+.1f}%"
+        print(line)
+    if result["websocket"]:
+        print("websocket:", json.dumps(result["websocket"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=SIZES, default="10k")
+    parser.add_argument("--requests", type=int, default=1000, help="requests per read scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--writes", type=int, default=200, help="objects created/updated/deleted per entity")
+    parser.add_argument("--ws-clients", type=int, default=100)
+    parser.add_argument("--ws-events", type=int, default=20)
+    parser.add_argument("--only", help="run only scenarios whose name contains this (or 'write', 'ws')")
+    parser.add_argument("--cache", action="store_true", help="keep the response cache on")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    parser.add_argument("--output", help="write the JSON result to this file")
+    parser.add_argument("--compare", help="JSON result of an earlier run to compare with")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    db_path = os.path.join(workdir, "db.sqlite3")
+    os.environ["BENCH_DB"] = db_path
+    os.environ["DJANGO_SETTINGS_MODULE"] = "benchmarks.settings"
+    if args.cache:
+        os.environ["CATALOG_CACHE_BACKEND"] = "utils.cache_backends.LRULocMemCache"
+
+    import django
+
+    django.setup()
+    dataset, generated = load_database(args.size, db_path)
+    data = collect_ids(args.ws_events)
+
+    base_url = start_server()
+    try:
+        http, websocket = asyncio.run(run_suite(base_url, data, args))
+    finally:
+        stop_server()
+
+    import django.db
+
+    result = {
+        "meta": {
+            "commit": git_commit(),
+            "dataset": dataset,
+            "generated": generated,
+            "products": SIZES[args.size],
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "writes": args.writes,
+            "cache": args.cache,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "sqlite": django.db.connection.Database.sqlite_version,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "http": http,
+        "websocket": websocket,
+    }
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(result, output, indent=2)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as previous:
+            baseline = json.load(previous)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result, baseline)
+
+
+if __name__ == "__main__":
+    main()
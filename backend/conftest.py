@@ -0,0 +1,63 @@
+from decimal import Decimal
+
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.test import APIClient
+
+from apps.accounts.models import CustomUser
+from apps.product.models import Category, Product
+from apps.store.models import Store
+
+
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix):
+    # a replica the way core.settings declares DB_REPLICAS entries: its own
+    # SQLite file, mirroring the test database. Reads only reach it in tests
+    # that list it in DATABASE_REPLICAS.
+    default = settings.DATABASES["default"]
+    settings.DATABASES["replica1"] = {
+        **default,
+        "NAME": settings.BASE_DIR / "replica1.sqlite3",
+        "TEST": {**default["TEST"], "NAME": None, "MIRROR": "default"},
+    }
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # version counters roll back with each test, cached responses would not
+    for alias in ("catalog", "auth"):
+        caches[alias].clear()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def manager(db):
+    return CustomUser.objects.create(email="manager@example.com", role="manager")
+
+
+@pytest.fixture
+def stores(manager):
+    return [Store.objects.create(name=f"Store {n}", locations="Бишкек", manager=manager) for n in range(2)]
+
+
+@pytest.fixture
+def categories(db):
+    return [Category.objects.create(name=f"Category {n}", description="") for n in range(3)]
+
+
+@pytest.fixture
+def make_product(stores):
+    def make(store=None, price="10.00", quantity=5, available=True, categories=()):
+        product = Product.objects.create(
+            name="Product", description="", price=Decimal(price), quantity_in_stock=quantity,
+            availability_status=available, store=store or stores[0],
+        )
+        product.categories.set(categories)
+        return product
+
+    return make
@@ -1,5 +1,5 @@
 from datetime import timedelta
-from decouple import config
+from decouple import Csv, config
 from pathlib import Path
 import os
 
@@ -31,14 +31,18 @@ INSTALLED_APPS = [
     'channels',
 
     # apps
+    'apps.common',
     'apps.product',
     'apps.store',
     'apps.accounts',
 ]
 
 MIDDLEWARE = [
+    'utils.metrics.PerformanceMiddleware',
+    'utils.compression.CompressionMiddleware',
+    'utils.db_router.ReplicaPinMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "utils.static_files.StaticFilesMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -66,6 +70,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'core.wsgi.application'
+ASGI_APPLICATION = 'core.asgi.application'
 
 DATABASES = {
     'default': {
@@ -74,6 +79,25 @@ DATABASES = {
     }
 }
 
+# Read replicas for the list/retrieve actions of the api/v1 viewsets
+# (utils.db_router). DB_REPLICAS lists SQLite files next to db.sqlite3, kept
+# in sync with ``manage.py sync_replicas``, or host[:port] of servers
+# replicating the primary when it is Postgres. Empty: everything on default.
+DATABASE_REPLICAS = []
+for _index, _replica in enumerate(config('DB_REPLICAS', default='', cast=Csv())):
+    _alias = f'replica{_index + 1}'
+    if DATABASES['default']['ENGINE'].endswith('sqlite3'):
+        DATABASES[_alias] = {**DATABASES['default'], 'NAME': BASE_DIR / _replica}
+    else:
+        _host, _, _port = _replica.partition(':')
+        DATABASES[_alias] = {**DATABASES['default'], 'HOST': _host, 'PORT': _port or DATABASES['default'].get('PORT', '')}
+    DATABASES[_alias]['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICAS.append(_alias)
+
+DATABASE_ROUTERS = ['utils.db_router.ReplicaRouter']
+# Seconds a client reads from the primary after it wrote, to cover replica lag.
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=int)
+
 # DATABASES = {
 #     "default": {
 #         "ENGINE": config("SQL_ENGINE"),
@@ -112,15 +136,98 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Rendered catalog responses. For several workers on one host use
+    # CATALOG_CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+    # with CATALOG_CACHE_LOCATION pointing at a shared directory.
+    'catalog': {
+        'BACKEND': config('CATALOG_CACHE_BACKEND', default='utils.cache_backends.LRULocMemCache'),
+        'LOCATION': config('CATALOG_CACHE_LOCATION', default='catalog'),
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': config('CATALOG_CACHE_MAX_ENTRIES', default=1000, cast=int),
+            'MAX_BYTES': config('CATALOG_CACHE_MAX_BYTES', default=64 * 1024 * 1024, cast=int),
+        },
+    },
+    # Users looked up by JWT and session authentication (apps.accounts.authentication).
+    # Entries are dropped on user save/delete and token blacklisting; TIMEOUT
+    # bounds staleness for writes that skip signals, like queryset.update().
+    # The LocMem default is per process: a user deactivated, deleted or whose
+    # password changed through one worker stays authenticated (JWT and
+    # sessions) on the others for up to AUTH_CACHE_TIMEOUT seconds. With
+    # several workers, point AUTH_CACHE_BACKEND at a shared cache (Redis,
+    # Memcached) or lower the timeout.
+    'auth': {
+        'BACKEND': config('AUTH_CACHE_BACKEND', default='utils.cache_backends.LRULocMemCache'),
+        'LOCATION': config('AUTH_CACHE_LOCATION', default='auth'),
+        'TIMEOUT': config('AUTH_CACHE_TIMEOUT', default=60, cast=int),
+        'OPTIONS': {
+            'MAX_ENTRIES': config('AUTH_CACHE_MAX_ENTRIES', default=10000, cast=int),
+            'MAX_BYTES': 16 * 1024 * 1024,
+        },
+    },
+}
+
+# ModelBackend stays listed: sessions created before CachedModelBackend
+# store its path, and django.contrib.auth drops sessions whose backend is
+# no longer configured.
+AUTHENTICATION_BACKENDS = [
+    'apps.accounts.authentication.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# In-process layer; several ASGI workers need a shared layer (e.g. channels_redis).
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+    },
+}
+
+# Seconds over which WebSocket notifications are folded into one message.
+NOTIFICATION_COALESCE_WINDOW = 0.5
+
+# log_error/log_warning: (burst, per seconds, sample rate beyond the burst),
+# counted per view action and exception type.
+LOG_RATE_LIMIT = (10, 1.0, 0.01)
+
+RESPONSE_CACHE_ALIAS = 'catalog'
+RESPONSE_CACHE_TIMEOUT = 300
+
+# zstd/br/gzip for API responses of at least this many bytes (and for all streams)
+COMPRESSION_PATHS = ('/api/v1/',)
+COMPRESSION_MIN_SIZE = 1024
+
+# Processes hashing passwords in bulk user imports; None: one per core.
+# The pool is started on first use and kept for the life of the process.
+PASSWORD_HASH_WORKERS = None
+
+
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.accounts.authentication.CachedJWTAuthentication',
         "rest_framework.authentication.SessionAuthentication",
     ],
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
     ),
+    # JSON (orjson) stays the default; MessagePack on Accept: application/msgpack
+    'DEFAULT_RENDERER_CLASSES': (
+        'utils.renderers.ORJSONRenderer',
+        'utils.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'utils.parsers.ORJSONParser',
+        'utils.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'utils.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
 }
 
 
@@ -4,11 +4,13 @@ from django.conf.urls.static import static
 from django.conf import settings
 from .yasg import urlpatterns as doc_ts
 from apps.accounts.consumers import NotificationConsumer
+from utils.metrics import metrics_view
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path("api/v1/", include("api.route")),
+    path("metrics", metrics_view, name="metrics"),
 
 ]
 urlpatterns += doc_ts
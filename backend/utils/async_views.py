@@ -0,0 +1,26 @@
+from asgiref.sync import sync_to_async
+from django.views import View
+
+
+class AsyncCatalogView(View):
+    """
+    Async entry point for the list/retrieve actions of ``viewset_class``.
+    The actions are the viewset's own, so authentication and permissions,
+    filters, ``fields``/``expand``, ETag/304 and the response cache behave
+    exactly as on the sync routes. DRF views are sync: the action runs in
+    one hop to the request's thread, while the view itself stays a
+    coroutine and keeps the ASGI middleware stack async.
+    """
+
+    viewset_class = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.viewset_class is not None:
+            cls.list_view = staticmethod(cls.viewset_class.as_view({"get": "list"}))
+            cls.retrieve_view = staticmethod(cls.viewset_class.as_view({"get": "retrieve"}))
+
+    async def get(self, request, pk=None):
+        if pk is None:
+            return await sync_to_async(self.list_view)(request)
+        return await sync_to_async(self.retrieve_view)(request, pk=pk)
@@ -0,0 +1,52 @@
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.locmem import LocMemCache
+
+# Shared per cache name, like LocMemCache's own module-level stores.
+_usage = {}
+
+
+class LRULocMemCache(LocMemCache):
+    """
+    LocMemCache bounded by the total size of the stored (pickled) values as
+    well as by ``MAX_ENTRIES``. Entries are evicted one at a time in
+    least-recently-used order instead of culling a random third of the cache.
+
+        "OPTIONS": {"MAX_ENTRIES": 1000, "MAX_BYTES": 64 * 1024 * 1024}
+    """
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        options = params.get("OPTIONS", {})
+        self._max_bytes = int(options.get("MAX_BYTES", 64 * 1024 * 1024))
+        self._usage = _usage.setdefault(name, {"bytes": 0, "sizes": {}})
+
+    def _set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        self._forget(key)
+        while self._cache and (
+            len(self._cache) >= self._max_entries
+            or self._usage["bytes"] + len(value) > self._max_bytes
+        ):
+            self._cull()
+        super()._set(key, value, timeout)
+        self._usage["sizes"][key] = len(value)
+        self._usage["bytes"] += len(value)
+
+    def _cull(self):
+        # the tail of the OrderedDict is the least recently used entry
+        key, _ = self._cache.popitem()
+        self._expire_info.pop(key, None)
+        self._forget(key)
+
+    def _delete(self, key):
+        self._forget(key)
+        return super()._delete(key)
+
+    def _forget(self, key):
+        self._usage["bytes"] -= self._usage["sizes"].pop(key, 0)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._expire_info.clear()
+            self._usage["sizes"].clear()
+            self._usage["bytes"] = 0
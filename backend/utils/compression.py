@@ -0,0 +1,221 @@
+import re
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import sync_and_async_middleware
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional codec
+    brotli = None
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional codec
+    zstandard = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # 11 is for static assets; 4-6 keeps up with dynamic responses
+ZSTD_LEVEL = 6  # about gzip -6 ratio at half its CPU on our JSON
+# streamed bodies are flushed to the client after this much input
+STREAM_FLUSH_SIZE = 64 * 1024
+# under ASGI, bigger bodies are compressed in a worker thread, off the event loop
+LOOP_COMPRESS_LIMIT = 64 * 1024
+
+ENCODED_ETAG_RE = re.compile(r'-(?:gzip|br|zstd)"')
+
+
+class GzipCodec:
+    def compress(self, data):
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self):
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+class BrotliCodec:
+    def compress(self, data):
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+
+    def stream(self):
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        return compressor.process, compressor.flush, compressor.finish
+
+
+class ZstdCodec:
+    def compress(self, data):
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+    def stream(self):
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        return (
+            compressor.compress,
+            lambda: compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+            compressor.flush,
+        )
+
+
+# server preference when the client rates several encodings the same
+CODECS = {
+    name: codec
+    for name, codec, available in (
+        ("zstd", ZstdCodec(), zstandard is not None),
+        ("br", BrotliCodec(), brotli is not None),
+        ("gzip", GzipCodec(), True),
+    )
+    if available
+}
+
+
+def negotiate_encoding(accept_encoding):
+    """The best of CODECS for an Accept-Encoding header, or None."""
+    ratings = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        match = re.search(r"q\s*=\s*([0-9.]+)", params)
+        if match:
+            try:
+                quality = float(match.group(1))
+            except ValueError:
+                quality = 0.0
+        if name:
+            ratings[name.strip().lower()] = quality
+    best, best_quality = None, 0.0
+    for name in CODECS:
+        quality = ratings.get(name, ratings.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+def request_encoding(request):
+    """Encoding the response to ``request`` gets, if it is compressed at all."""
+    if not request.path.startswith(tuple(getattr(settings, "COMPRESSION_PATHS", ("/api/v1/",)))):
+        return None
+    return negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+
+
+def encoded_etag(etag, encoding):
+    """``"abc"`` -> ``"abc-br"``: every encoding is a representation with its own strong ETag."""
+    if etag.startswith("W/") or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def set_encoded_content(response, content, encoding):
+    response.content = content
+    response["Content-Length"] = str(len(content))
+    response["Content-Encoding"] = encoding
+
+
+def _compress_stream(chunks, codec):
+    compress, flush, finish = codec.stream()
+    pending = 0
+    for chunk in chunks:
+        pending += len(chunk)
+        output = compress(chunk)
+        if pending >= STREAM_FLUSH_SIZE:
+            output += flush()
+            pending = 0
+        if output:
+            yield output
+    yield finish()
+
+
+async def _compress_async_stream(chunks, codec):
+    compress, flush, finish = codec.stream()
+    pending = 0
+    async for chunk in chunks:
+        pending += len(chunk)
+        output = compress(chunk)
+        if pending >= STREAM_FLUSH_SIZE:
+            output += flush()
+            pending = 0
+        if output:
+            yield output
+    yield finish()
+
+
+@sync_and_async_middleware
+class CompressionMiddleware:
+    """
+    gzip / brotli / zstd for API responses, picked from Accept-Encoding
+    (zstd, then br, then gzip on equal q-values). Bodies under
+    ``COMPRESSION_MIN_SIZE`` bytes go out as they are; streamed responses
+    are compressed chunk by chunk, flushed every STREAM_FLUSH_SIZE bytes.
+
+    utils.response_cache serves compressed bodies it has stored straight
+    away and hands the others a ``_store_encoded(encoding, body)`` callback,
+    so a cached response is compressed once, not on every hit.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.paths = tuple(getattr(settings, "COMPRESSION_PATHS", ("/api/v1/",)))
+        self.min_size = getattr(settings, "COMPRESSION_MIN_SIZE", 1024)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not request.path.startswith(self.paths):
+            return self.get_response(request)
+        self.prepare(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        if not request.path.startswith(self.paths):
+            return await self.get_response(request)
+        self.prepare(request)
+        response = await self.get_response(request)
+        if not response.streaming and len(response.content) > LOOP_COMPRESS_LIMIT:
+            return await sync_to_async(self.compress, thread_sensitive=False)(request, response)
+        return self.compress(request, response)
+
+    def prepare(self, request):
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+        if if_none_match:
+            # conditional checks compare against the ETag of the unencoded body
+            request.META["HTTP_IF_NONE_MATCH"] = ENCODED_ETAG_RE.sub('"', if_none_match)
+
+    def compress(self, request, response):
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None or response.status_code == 206:
+            return response
+        if response.has_header("Content-Encoding"):
+            if getattr(response, "_precompressed", False):
+                self.tag(response, response["Content-Encoding"])
+            return response
+
+        codec = CODECS[encoding]
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = _compress_async_stream(response.streaming_content, codec)
+            else:
+                response.streaming_content = _compress_stream(response.streaming_content, codec)
+            del response["Content-Length"]
+            response["Content-Encoding"] = encoding
+            self.tag(response, encoding)
+            return response
+
+        if len(response.content) < self.min_size:
+            return response
+        compressed = codec.compress(response.content)
+        if len(compressed) >= len(response.content):
+            return response
+        set_encoded_content(response, compressed, encoding)
+        self.tag(response, encoding)
+        store = getattr(response, "_store_encoded", None)
+        if store is not None:
+            store(encoding, compressed)
+        return response
+
+    def tag(self, response, encoding):
+        if response.has_header("ETag"):
+            response["ETag"] = encoded_etag(response["ETag"], encoding)
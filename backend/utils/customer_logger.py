@@ -1,16 +1,25 @@
+import atexit
+import copy
+import json
 import logging
+import queue
+import random
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+from django.conf import settings
 
 
 class CustomJsonFormatter(logging.Formatter):
+    """One JSON object per line, so log shippers don't have to stitch records back together."""
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.custom_fields = [
-            "asctime",
-            "levelname",
-            "pathname",
-            "message",
             "Exception",
             "Class",
+            "suppressed",
         ]
 
     def format(self, record):
@@ -19,48 +28,125 @@ class CustomJsonFormatter(logging.Formatter):
             "level": record.levelname,
             "message": record.getMessage(),
             "pathname": record.pathname,
-            "Class": getattr(record, "Class"),
-            "Exception": getattr(record, "Exception"),
         }
+        for field in self.custom_fields:
+            value = getattr(record, field, None)
+            if value is not None:
+                log_record[field] = value
+        traceback = getattr(record, "traceback", None)
+        if traceback is None and record.exc_info:
+            traceback = self.formatException(record.exc_info)
+        if traceback:
+            log_record["traceback"] = traceback
+        return json.dumps(log_record, ensure_ascii=False, default=str)
 
-        formatted_record = "\n".join(
-            [f"{key}: {value}" for key, value in log_record.items()]
-        )
-        return formatted_record
-    
-    @staticmethod
-    def run():
-        logger = logging.getLogger(__name__)
-        if not logger.handlers:
-            console_handler = logging.StreamHandler()
-            console_handler.setFormatter(CustomJsonFormatter())
-            logger.addHandler(console_handler)
-        return logger
 
+class TracebackQueueHandler(QueueHandler):
+    """
+    QueueHandler.prepare() folds the traceback into the message and drops
+    exc_info. This one formats it into ``record.traceback`` instead, still
+    in the logging thread since the frames may be gone by the time the
+    listener runs, so CustomJsonFormatter can emit it as its own key.
+    """
 
+    def prepare(self, record):
+        record = copy.copy(record)
+        if record.exc_info:
+            record.traceback = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        return record
 
-def log_warning(view, ex=None):
-    CustomJsonFormatter.run().warning(
-        f"Продукт не найден",
+
+class RateLimiter:
+    """
+    Per-key token bucket: ``burst`` records per ``period`` seconds go
+    through, beyond that only a ``sample_rate`` share does. The next record
+    that passes for a key reports how many were dropped before it.
+    """
+
+    def __init__(self, burst=10, period=1.0, sample_rate=0.01):
+        self.burst, self.period, self.sample_rate = burst, period, sample_rate
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key):
+        """Returns ``(allowed, suppressed_so_far)``."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated, suppressed = self._buckets.get(key, (self.burst, now, 0))
+            tokens = min(self.burst, tokens + (now - updated) * self.burst / self.period)
+            if tokens >= 1:
+                allowed, tokens = True, tokens - 1
+            else:
+                allowed = random.random() < self.sample_rate
+            self._buckets[key] = (tokens, now, 0 if allowed else suppressed + 1)
+        return allowed, suppressed
+
+
+_logger = None
+_logger_lock = threading.Lock()
+_rate_limiter = None
+
+
+def get_logger():
+    """
+    The request-path logger, built once: records go onto an in-memory
+    queue and a listener thread formats and writes them, so a slow stderr
+    never blocks a request.
+    """
+    global _logger, _rate_limiter
+    if _logger is not None:
+        return _logger
+    with _logger_lock:
+        if _logger is None:
+            stream_handler = logging.StreamHandler()
+            stream_handler.setFormatter(CustomJsonFormatter())
+            listener = QueueListener(queue.SimpleQueue(), stream_handler, respect_handler_level=True)
+
+            logger = logging.getLogger(__name__)
+            logger.addHandler(TracebackQueueHandler(listener.queue))
+            logger.propagate = False
+            listener.start()
+            atexit.register(listener.stop)
+
+            _rate_limiter = RateLimiter(*getattr(settings, "LOG_RATE_LIMIT", (10, 1.0, 0.01)))
+            _logger = logger
+    return _logger
+
+
+def _log(level, message, view, ex, exc_info=None):
+    logger = get_logger()
+    if not logger.isEnabledFor(level):
+        return
+    view_name = f"{view.__class__.__name__}.{view.action}"
+    allowed, suppressed = _rate_limiter.allow((level, view_name, type(ex).__name__))
+    if not allowed:
+        return
+    logger.log(
+        level,
+        message,
         extra={
             "Exception": f"{ex}",
-            "Class": f"{view.__class__.__name__}.{view.action}",
-        }
+            "Class": view_name,
+            "suppressed": suppressed or None,
+        },
+        exc_info=exc_info,
     )
 
 
+def log_warning(view, ex=None):
+    _log(logging.WARNING, "Продукт не найден", view, ex)
+
+
 def log_error(view, ex=None):
-    CustomJsonFormatter.run().error(
-        f"Ошибка при обработке запроса",
-        extra={
-            "Exception": f"{ex}",
-            "Class": f"{view.__class__.__name__}.{view.action}",
-        }
-    )
+    _log(logging.ERROR, "Ошибка при обработке запроса", view, ex, exc_info=ex)
 
 
 
 '''
 log_error(self, ex)
 log_warning(self, ex)
-'''
\ No newline at end of file
+'''
@@ -0,0 +1,130 @@
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.decorators import sync_and_async_middleware
+
+PIN_COOKIE = "primary_pin"
+# bookkeeping rows written alongside other writes, never on their own
+# behalf; writing them doesn't make a request read its own writes
+UNPINNED_MODELS = {"common.modelversion"}
+
+_routing = ContextVar("db_routing", default=None)
+
+
+class RoutingState:
+    """Per-request routing: the replica reads go to, and whether they must stay on the primary."""
+
+    __slots__ = ("pinned", "wrote", "replica")
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+        self.replica = None
+
+
+def replicas():
+    return list(getattr(settings, "DATABASE_REPLICAS", ()))
+
+
+def read_from_replica():
+    """
+    Send the rest of this request's reads to one replica, picked now so
+    every query of the request sees the same snapshot. No-op for clients
+    pinned to the primary, after a write, or outside ReplicaPinMiddleware.
+    """
+    state = _routing.get()
+    aliases = replicas()
+    if state is None or state.pinned or state.wrote or not aliases:
+        return
+    if state.replica is None:
+        state.replica = random.choice(aliases)
+
+
+class ReplicaRouter:
+    """
+    Writes, and reads outside ``read_from_replica``, go to the primary
+    (``default``). Once a request has written, or while a transaction is
+    open on the primary, its reads stay on the primary too. Replicas are
+    copies of the primary and are never migrated.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None or state.replica is None or state.wrote:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None and model._meta.label_lower not in UNPINNED_MODELS:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replicas():
+            return False
+        return None
+
+
+@sync_and_async_middleware
+class ReplicaPinMiddleware:
+    """
+    Routing state for each request. A client that wrote gets a
+    ``primary_pin`` cookie for ``REPLICA_PIN_SECONDS``; while it is set its
+    reads skip the replicas, so it reads its own writes despite replica lag.
+    The state is a context variable, so it follows the request into the
+    thread of a sync view under ASGI.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, "REPLICA_PIN_SECONDS", 5)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RoutingState(pinned=PIN_COOKIE in request.COOKIES)
+        token = _routing.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        return self.pin(state, response)
+
+    async def __acall__(self, request):
+        state = RoutingState(pinned=PIN_COOKIE in request.COOKIES)
+        token = _routing.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+        return self.pin(state, response)
+
+    def pin(self, state, response):
+        if state.wrote and replicas():
+            response.set_cookie(PIN_COOKIE, "1", max_age=self.pin_seconds, httponly=True, samesite="Lax")
+        return response
+
+
+class ReplicaReadMixin:
+    """Viewset mixin: ``replica_actions`` read from a replica, see ``read_from_replica``."""
+
+    replica_actions = ("list", "retrieve")
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.action in self.replica_actions:
+            read_from_replica()
@@ -0,0 +1,234 @@
+import bisect
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.utils.decorators import sync_and_async_middleware
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, rendered in the Prometheus text format."""
+
+    def __init__(self, name, help_text, labels, buckets=LATENCY_BUCKETS):
+        self.name, self.help_text, self.labels, self.buckets = name, help_text, labels, buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._series.get(label_values)
+            if counts is None:
+                # one slot per bucket plus +Inf, then the sum
+                counts = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[index] += 1
+            counts[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(counts) for labels, counts in self._series.items()}
+        for label_values, counts in sorted(series.items()):
+            labels = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, label_values))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {counts[-1]}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return "\n".join(lines)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Total request latency.", ("view", "method", "status")
+)
+DB_DURATION = Histogram(
+    "db_query_duration_seconds", "Time spent in SQL per request.", ("view", "method")
+)
+DB_QUERIES = Histogram(
+    "db_queries_per_request", "SQL statements per request.", ("view", "method"), QUERY_COUNT_BUCKETS
+)
+SERIALIZE_DURATION = Histogram(
+    "response_serialize_duration_seconds",
+    "Time spent turning objects into response data, SQL excluded.",
+    ("view", "method"),
+)
+RENDER_DURATION = Histogram(
+    "response_render_duration_seconds", "Time spent rendering the response data to bytes.", ("view", "method")
+)
+METRICS = (REQUEST_DURATION, DB_DURATION, DB_QUERIES, SERIALIZE_DURATION, RENDER_DURATION)
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint. Numbers are per process: scrape every
+    worker, or put the endpoint behind something that aggregates them.
+    """
+    body = "\n".join(metric.render() for metric in METRICS) + "\n"
+    return HttpResponse(body, content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+_timer = ContextVar("request_timer", default=None)
+
+
+class RequestTimer:
+    """
+    What one request spent its time on. The active timer is a context
+    variable, so it follows the request into the thread a sync view or an
+    async ORM call runs in under ASGI.
+    """
+
+    __slots__ = ("queries", "db", "serialize", "render")
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+        self.render = 0.0
+
+
+def record_query(execute, sql, params, many, context):
+    """``execute_wrapper`` on every connection: counts statements for the active timer."""
+    timer = _timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    started = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.db += perf_counter() - started
+        timer.queries += 1
+
+
+def install_query_recorder(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(install_query_recorder)
+
+
+@contextmanager
+def _timed(entry):
+    timer = _timer.get()
+    if timer is None:
+        yield
+        return
+    started, db = perf_counter(), timer.db
+    try:
+        yield
+    finally:
+        setattr(timer, entry, getattr(timer, entry) + perf_counter() - started - (timer.db - db))
+
+
+def timed_serialization():
+    """Adds the time spent in the block, minus its SQL, to the request's ``serialize`` entry."""
+    return _timed("serialize")
+
+
+def view_label(view_func, method):
+    """
+    ``ProductViewSet.list``-style name, the same pair customer_logger
+    reports; plain Django views get their class or function name.
+    """
+    cls = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+    if cls is None:
+        return f"{view_func.__module__}.{view_func.__name__}"
+    actions = getattr(view_func, "actions", None) or {}
+    return f"{cls.__name__}.{actions.get(method.lower(), method.lower())}"
+
+
+@sync_and_async_middleware
+class PerformanceMiddleware:
+    """
+    Measures every request: SQL statements and their time, serialization
+    (the ``timed_serialization`` blocks of the views), rendering of the
+    response data to bytes and total latency. Sends them back as a
+    ``Server-Timing`` header and records them in the histograms served by
+    ``metrics_view``.
+
+    Runs in the handler's mode: a sync-only middleware would put every
+    ASGI request, async views included, through a thread.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Django runs sync hooks of an async stack in a thread
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = perf_counter()
+        timer, token = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _timer.reset(token)
+        return self.finish(request, response, timer, started)
+
+    async def __acall__(self, request):
+        started = perf_counter()
+        timer, token = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _timer.reset(token)
+        return self.finish(request, response, timer, started)
+
+    def start(self):
+        # connections opened before this module was imported missed connection_created
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+        timer = RequestTimer()
+        return timer, _timer.set(timer)
+
+    def finish(self, request, response, timer, started):
+        total = perf_counter() - started
+        match = getattr(request, "resolver_match", None)
+        view = view_label(match.func, request.method) if match is not None else "unresolved"
+        method = request.method
+        REQUEST_DURATION.observe(total, view, method, response.status_code)
+        DB_DURATION.observe(timer.db, view, method)
+        DB_QUERIES.observe(timer.queries, view, method)
+        SERIALIZE_DURATION.observe(timer.serialize, view, method)
+        RENDER_DURATION.observe(timer.render, view, method)
+
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={timer.db * 1000:.2f};desc="{timer.queries} queries"',
+            f"serialize;dur={timer.serialize * 1000:.2f}",
+            f"render;dur={timer.render * 1000:.2f}",
+            f"total;dur={total * 1000:.2f}",
+        ])
+        return response
+
+    def process_template_response(self, request, response):
+        return self.time_render(request, response)
+
+    async def aprocess_template_response(self, request, response):
+        return self.time_render(request, response)
+
+    def time_render(self, request, response):
+        # called right before DRF renders the Response
+        timer = _timer.get()
+        started = perf_counter()
+
+        def rendered(response):
+            timer.render += perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
@@ -0,0 +1,100 @@
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def encode_cursor(values):
+    raw = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (TypeError, ValueError):
+        raise NotFound("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise NotFound("Invalid cursor")
+    return values
+
+
+def keyset_filter(ordering, values):
+    """
+    Row-value comparison ``(a, b, id) > (va, vb, vid)`` spelled out as
+    ``a > va OR (a = va AND b > vb) OR ...`` so it works on every backend
+    and can use the composite ``(sort_key, id)`` index.
+    """
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        condition |= equal & Q(**{f"{name}__{lookup}": value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over ``view.keyset_ordering`` (last field must be unique).
+    Every page is a single indexed range scan, so page N costs the same as page 1.
+    """
+
+    page_size = 50
+    max_page_size = 1000
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    ordering = ("id",)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = tuple(getattr(view, "keyset_ordering", self.ordering))
+        self.page_size = self.get_page_size(request)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            values = decode_cursor(cursor, len(self.ordering))
+            queryset = queryset.filter(keyset_filter(self.ordering, values))
+
+        rows = list(queryset.order_by(*self.ordering)[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        page = rows[: self.page_size]
+        self.next_position = self.get_position(page[-1]) if self.has_next else None
+        return page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_position(self, obj):
+        names = [field.lstrip("-") for field in self.ordering]
+        if isinstance(obj, dict):
+            return [obj[name] for name in names]
+        return [getattr(obj, name) for name in names]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
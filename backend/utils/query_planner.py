@@ -0,0 +1,104 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def plan_queryset(queryset, serializer, extra_fields=()):
+    """
+    Narrow ``queryset`` to what ``serializer`` is going to read:
+    nested FK/one-to-one serializers become ``select_related``, to-many
+    fields become ``prefetch_related`` and plain columns become ``only()``.
+    """
+    serializer = getattr(serializer, "child", serializer)
+    only, select_related, prefetch = _collect(queryset.model, serializer.fields.values())
+
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    if only is not None:
+        queryset = queryset.only(*dict.fromkeys([*only, *extra_fields]))
+    return queryset
+
+
+def _collect(model, fields, prefix=""):
+    opts = model._meta
+    only = [prefix + opts.pk.name]
+    select_related, prefetch = [], []
+    narrowable = True
+
+    for field in fields:
+        if field.write_only:
+            continue
+        if field.source == "*" or "." in field.source:
+            # SerializerMethodField, dotted sources and the like can touch
+            # anything on the instance, so leave the columns alone.
+            narrowable = False
+            continue
+        try:
+            model_field = opts.get_field(field.source)
+        except FieldDoesNotExist:
+            narrowable = False
+            continue
+
+        path = prefix + field.source
+
+        if isinstance(field, (serializers.ListSerializer, serializers.ManyRelatedField)):
+            if model_field.many_to_many or model_field.one_to_many:
+                prefetch.append(_prefetch(model_field, field, path))
+            continue
+
+        if model_field.is_relation and (model_field.many_to_one or model_field.one_to_one):
+            if model_field.concrete:
+                only.append(path)
+            if isinstance(field, serializers.BaseSerializer):
+                nested_only, nested_select, nested_prefetch = _collect(
+                    model_field.related_model, field.fields.values(), prefix=f"{path}__"
+                )
+                select_related.append(path)
+                select_related.extend(nested_select)
+                prefetch.extend(nested_prefetch)
+                if nested_only is not None:
+                    only.extend(nested_only)
+            elif not model_field.concrete:
+                narrowable = False
+            continue
+
+        if model_field.concrete:
+            only.append(path)
+        else:
+            narrowable = False
+
+    return (only if narrowable else None), select_related, prefetch
+
+
+def _prefetch(model_field, field, path):
+    related_model = model_field.related_model
+    queryset = related_model._default_manager.all()
+    # reverse FK prefetches are matched back to the parent through the FK column
+    extra_fields = (model_field.field.name,) if model_field.one_to_many else ()
+
+    child = getattr(field, "child", None) or getattr(field, "child_relation", None)
+    if isinstance(child, serializers.BaseSerializer):
+        queryset = plan_queryset(queryset, child, extra_fields)
+    else:
+        queryset = queryset.only(related_model._meta.pk.name, *extra_fields)
+    return Prefetch(path, queryset=queryset)
+
+
+class QueryPlanMixin:
+    """
+    Applies ``plan_queryset`` to the viewset queryset for read requests,
+    so list/retrieve run a fixed number of queries regardless of page size.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if getattr(self, "swagger_fake_view", False):
+            return queryset
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            return queryset
+        # keyset pagination reads its sort keys off every row of the page
+        ordering = [field.lstrip("-") for field in getattr(self, "keyset_ordering", ())]
+        return plan_queryset(queryset, self.get_serializer(), extra_fields=ordering)
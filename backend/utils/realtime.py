@@ -0,0 +1,175 @@
+import asyncio
+import re
+import threading
+from decimal import Decimal
+
+from asgiref.sync import AsyncToSync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import transaction
+
+TOPIC_RE = re.compile(r"^(store:\d+(:products)?|category:\d+)$")
+
+_consumer_loop = None
+
+
+def bind_consumer_loop():
+    """
+    Called by consumers on connect: flushes are sent from their loop. Sync
+    views can run under a short-lived loop of their own (an async-capable
+    middleware such as WhiteNoise puts an async_to_sync between the server
+    and the view), and a flush parked on that loop would never fire.
+    """
+    global _consumer_loop
+    _consumer_loop = asyncio.get_running_loop()
+
+
+def _event_loop():
+    """
+    The loop channel-layer sends should run on: the loop consumers live on,
+    else the ASGI server's loop when called from it or from one of its
+    sync_to_async worker threads, else None.
+    """
+    if _consumer_loop is not None and _consumer_loop.is_running():
+        return _consumer_loop
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        loop = AsyncToSync(asyncio.sleep).main_event_loop
+        return loop if loop is not None and loop.is_running() else None
+
+
+class Coalescer:
+    """
+    Collects notifications for ``window`` seconds and sends one group message
+    per (group, key) with the number of events folded into it, e.g.
+    "37 new users" instead of 37 frames. ``add()`` never blocks on the channel
+    layer: the flush runs as a task on the ASGI loop, or on a timer thread
+    when there is no loop (WSGI workers, management commands).
+    """
+
+    def __init__(self, window=None):
+        self.window = window
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._flush_loop = None
+
+    def get_window(self):
+        if self.window is not None:
+            return self.window
+        return getattr(settings, "NOTIFICATION_COALESCE_WINDOW", 0.5)
+
+    def add(self, group, key, render, count=1):
+        """``render(count)`` builds the channel-layer event at flush time."""
+        loop = _event_loop()
+        with self._lock:
+            entry = self._pending.setdefault((group, key), [0, render])
+            entry[0] += count
+            schedule = self._needs_flush(loop)
+        if schedule:
+            self._schedule_flush(loop)
+
+    def append(self, group, key, item, render):
+        """Queue ``item``; ``render(items)`` builds the event at flush time."""
+        loop = _event_loop()
+        with self._lock:
+            entry = self._pending.setdefault((group, key), [[], render])
+            entry[0].append(item)
+            schedule = self._needs_flush(loop)
+        if schedule:
+            self._schedule_flush(loop)
+
+    def _needs_flush(self, loop):
+        # Reschedule when the pending flush is parked on a loop that has shut
+        # down, or on a timer thread while consumers live on this ASGI loop.
+        stale = self._flush_loop is not loop and (
+            loop is not None or self._flush_loop.is_closed()
+        )
+        schedule = not self._scheduled or stale
+        self._scheduled = True
+        if schedule:
+            self._flush_loop = loop
+        return schedule
+
+    def _schedule_flush(self, loop):
+        if loop is not None:
+            loop.call_soon_threadsafe(
+                loop.call_later, self.get_window(), lambda: loop.create_task(self.flush())
+            )
+        else:
+            timer = threading.Timer(self.get_window(), AsyncToSync(self.flush))
+            timer.daemon = True
+            timer.start()
+
+    async def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._scheduled = False
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        for (group, _), (collected, render) in pending.items():
+            await channel_layer.group_send(group, render(collected))
+
+
+notifications = Coalescer()
+
+
+def changed_by_name(model, changed):
+    """Re-key ``get_changed_fields()`` output from attnames to API field names ("store_id" -> "store")."""
+    names = {field.attname: field.name for field in model._meta.concrete_fields}
+    return {names[attname]: value for attname, value in changed.items() if attname != model._meta.pk.attname}
+
+
+def topic_group(topic):
+    """Channel-layer group for a subscription topic ("store:5:products" -> "topic.store.5.products")."""
+    return "topic." + topic.replace(":", ".")
+
+
+def _plain(value):
+    return str(value) if isinstance(value, Decimal) else value
+
+
+def merge_deltas(deltas):
+    """Fold several deltas of one object inside a window into a single one."""
+    merged = {}
+    for index, delta in enumerate(deltas):
+        # bulk deltas carry "ids" instead of one id and are kept as they are
+        key = (delta["entity"], delta["id"]) if delta["id"] is not None else index
+        if key in merged and delta["op"] != "delete":
+            merged[key]["changed"].update(delta["changed"])
+            if merged[key]["op"] != "create":
+                merged[key]["op"] = delta["op"]
+            if delta.get("seq") is not None:
+                merged[key]["seq"] = delta["seq"]
+        else:
+            merged[key] = {**delta, "changed": dict(delta["changed"])}
+    return list(merged.values())
+
+
+def topic_event(topic):
+    def render(deltas):
+        return {"type": "send_deltas", "topic": topic, "deltas": merge_deltas(deltas)}
+    return render
+
+
+def publish_delta(topics, entity, pk, op, changed=None, **extra):
+    """
+    Queue ``{"entity", "id", "op", "changed"}`` for every topic once the
+    current transaction commits; subscribers get the batch of a window as
+    one frame.
+    """
+    delta = {
+        "entity": entity,
+        "id": pk,
+        "op": op,
+        "changed": {name: _plain(value) for name, value in (changed or {}).items()},
+        **extra,
+    }
+
+    def dispatch():
+        for topic in dict.fromkeys(topics):
+            notifications.append(topic_group(topic), "delta", delta, topic_event(topic))
+
+    transaction.on_commit(dispatch)
@@ -0,0 +1,57 @@
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_encoder = JSONEncoder()
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def encode_default(obj):
+    """
+    Anything the fast encoders don't handle natively goes through DRF's
+    JSONEncoder, so dates, decimals and lazy strings come out exactly as
+    with the stock JSONRenderer.
+    """
+    return _encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer on top of orjson, with the same output for compact UTF-8
+    JSON (the defaults). Indented output (the browsable API,
+    ``Accept: application/json; indent=4``) and non-default
+    UNICODE_JSON/COMPACT_JSON settings are left to JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        content = orjson.dumps(data, default=encode_default, option=ORJSON_OPTIONS)
+        if b"\xe2\x80\xa8" in content or b"\xe2\x80\xa9" in content:
+            # escaped like JSONRenderer does, to stay a strict javascript subset
+            content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return content
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Compact binary alternative to JSON for service-to-service traffic
+    (``Accept: application/msgpack`` or ``?format=msgpack``). Values are the
+    ones JSON would carry: decimals stay strings, dates ISO 8601 strings.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
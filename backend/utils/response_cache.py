@@ -0,0 +1,118 @@
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from apps.common.models import ModelVersion
+from utils.compression import request_encoding, set_encoded_content
+from utils.sparse_fields import expanded_fields
+
+
+def get_response_cache():
+    return caches[getattr(settings, "RESPONSE_CACHE_ALIAS", "default")]
+
+
+def get_version_keys(view, request):
+    """
+    ``view.version_keys``, plus the keys of the relations the request
+    expands inline (``view.expand_version_keys``, ``{"store": "store"}``):
+    an expanded response also goes stale when those objects change.
+    """
+    expand_keys = getattr(view, "expand_version_keys", {})
+    expanded = [expand_keys[name] for name in expanded_fields(request) if name in expand_keys]
+    return (*view.version_keys, *expanded)
+
+
+def get_versions(view, request):
+    """
+    ``{key: ModelVersion}`` for the version keys the view's response reads
+    from. Looked up once per request and shared by the ETag and the cache key.
+    """
+    if getattr(request, "_model_versions", None) is None:
+        request._model_versions = ModelVersion.objects.current(get_version_keys(view, request))
+    return request._model_versions
+
+
+def response_fingerprint(request, versions):
+    parts = [
+        request.path,
+        "&".join(sorted(f"{k}={v}" for k, v in request.query_params.lists())),
+        request.accepted_media_type or "",
+        ",".join(f"{key}:{versions[key].version}" for key in sorted(versions)),
+    ]
+    return hashlib.md5("|".join(parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def cache_response(func):
+    """
+    Read-through cache for the rendered body of a DRF action.
+    The key includes the current version of every ``get_version_keys``
+    entry; writes bump the versions, so stale entries are never looked up
+    again and simply age out of the LRU.
+
+    Bodies compressed by utils.compression.CompressionMiddleware are kept
+    next to the plain one, one entry per encoding.
+    """
+
+    @wraps(func)
+    def wrapper(self, request, *args, **kwargs):
+        cache = get_response_cache()
+        key = "response:" + response_fingerprint(request, get_versions(self, request))
+        encoding = request_encoding(request)
+        encoded_key = f"{key}:{encoding}"
+
+        def store_encoded(encoding, content):
+            cache.set(f"{key}:{encoding}", content, settings.RESPONSE_CACHE_TIMEOUT)
+
+        cached = cache.get_many([key, encoded_key] if encoding else [key])
+        if key in cached:
+            content, content_type = cached[key]
+            response = HttpResponse(content, content_type=content_type)
+            if encoded_key in cached:
+                set_encoded_content(response, cached[encoded_key], encoding)
+                response._precompressed = True
+            else:
+                response._store_encoded = store_encoded
+            return response
+
+        response = func(self, request, *args, **kwargs)
+        if response.status_code == 200 and hasattr(response, "add_post_render_callback"):
+
+            def store(rendered):
+                cache.set(key, (rendered.content, rendered["Content-Type"]), settings.RESPONSE_CACHE_TIMEOUT)
+
+            response.add_post_render_callback(store)
+            response._store_encoded = store_encoded
+        return response
+
+    return wrapper
+
+
+def conditional_response(func):
+    """
+    Strong ETag / Last-Modified for a read action, derived from the version
+    counters only. A matching If-None-Match or If-Modified-Since is answered
+    with 304 before the action runs.
+    """
+
+    @wraps(func)
+    def wrapper(self, request, *args, **kwargs):
+        versions = get_versions(self, request)
+        etag = quote_etag(response_fingerprint(request, versions))
+        last_modified = int(max(row.updated_at for row in versions.values()).timestamp())
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        response = func(self, request, *args, **kwargs)
+        if response.status_code == 200:
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    return wrapper
@@ -0,0 +1,60 @@
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+def _names(request, param):
+    value = request.query_params.get(param, "")
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def expanded_fields(request):
+    """The relation names ``?expand=`` asks for, unvalidated."""
+    return _names(request, EXPAND_PARAM)
+
+
+class SparseFieldsMixin:
+    """
+    ``?fields=id,name,price`` limits a read response to those fields and
+    ``?expand=store`` swaps a related id for the nested object, from
+    ``Meta.expandable_fields = {"store": (StoreSerializer, {})}``.
+    Expanded fields are always part of the response.
+
+    Only the top-level serializer of GET/HEAD requests is affected; the
+    field set decides what utils.query_planner loads, so unrequested
+    columns and relations are never fetched.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get("request")
+        if request is None or request.method not in SAFE_METHODS or not self._is_top_level():
+            return fields
+
+        expandable = getattr(self.Meta, "expandable_fields", {})
+        expand = _names(request, EXPAND_PARAM)
+        unknown = [name for name in expand if name not in expandable]
+        if unknown:
+            raise ParseError(f"Cannot expand: {', '.join(unknown)}")
+        for name in expand:
+            serializer_class, kwargs = expandable[name]
+            source = fields[name].source
+            if source and source != name:
+                kwargs = {**kwargs, "source": source}
+            fields[name] = serializer_class(read_only=True, **kwargs)
+
+        requested = _names(request, FIELDS_PARAM)
+        if not requested:
+            return fields
+        unknown = [name for name in requested if name not in fields]
+        if unknown:
+            raise ParseError(f"Unknown fields: {', '.join(unknown)}")
+        keep = {*requested, *expand}
+        return type(fields)((name, field) for name, field in fields.items() if name in keep)
+
+    def _is_top_level(self):
+        parent = self.parent
+        return parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None)
@@ -0,0 +1,37 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.utils.decorators import sync_and_async_middleware
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+@sync_and_async_middleware
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that can sit in an async middleware stack. WhiteNoise itself
+    is sync-only, which makes Django run every ASGI request (async views
+    included) through a thread; here only requests under STATIC_URL take
+    one, everything else is passed on in the handler's mode.
+    """
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if request.path_info.startswith(self.static_prefix):
+            response = await sync_to_async(self.static_response)(request)
+            if response is not None:
+                return response
+        return await self.get_response(request)
+
+    def static_response(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        return self.serve(static_file, request) if static_file is not None else None
@@ -0,0 +1,238 @@
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from utils.metrics import timed_serialization
+
+# to_representation() returns the database value of these fields unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.EmailField,
+    serializers.ReadOnlyField,
+)
+
+
+def _decimal_converter(field):
+    coerce = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce or field.localize or field.decimal_places is None:
+        return field.to_representation
+    exponent = -field.decimal_places
+
+    def convert(value):
+        # the database hands decimals back at the column's scale, which
+        # makes DecimalField.quantize() a no-op
+        if isinstance(value, Decimal) and value.as_tuple().exponent == exponent:
+            return format(value, "f")
+        return field.to_representation(value)
+
+    return convert
+
+
+def _converter(field):
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        # values() already yields the raw foreign key
+        return field.pk_field.to_representation if field.pk_field is not None else None
+    if type(field) in PASSTHROUGH_FIELDS:
+        return None
+    if type(field) is serializers.DecimalField:
+        return _decimal_converter(field)
+    return field.to_representation
+
+
+def _columns(model, fields):
+    """``[(name, column, converter)]`` for plain fields, or None if one of them needs an instance."""
+    columns = []
+    for field in fields:
+        if field.source == "*" or "." in field.source:
+            return None
+        if isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField)):
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+        if model_field.is_relation and not isinstance(field, serializers.PrimaryKeyRelatedField):
+            return None
+        columns.append((field.field_name, field.source, _converter(field)))
+    return columns
+
+
+def _readable(serializer):
+    return [field for field in serializer.fields.values() if not field.write_only]
+
+
+def _represent(values, columns):
+    return {
+        name: value if convert is None or value is None else convert(value)
+        for (name, _, convert), value in zip(columns, values)
+    }
+
+
+class ValuesPlan:
+    """
+    Serializes a page the way the serializer it was built from does, but
+    from ``values()`` rows: no model instances and no per-object serializer
+    calls. Nested foreign key serializers come from the same row through a
+    join; nested many-to-many serializers and primary key lists are filled
+    from one query on the through table per page.
+    """
+
+    COLUMN, NESTED, MANY = "column", "nested", "many"
+
+    def __init__(self, model, layout):
+        # layout: [(name, kind, spec)] with spec
+        #   COLUMN: (column, converter)
+        #   NESTED: (foreign key column, [(name, related column, converter)])
+        #   MANY:   (many-to-many field, [(name, column, converter)] or None for a pk list)
+        self.model = model
+        self.layout = layout
+
+    def queryset(self, queryset, extra_fields=()):
+        names = [self.model._meta.pk.name]
+        for _, kind, spec in self.layout:
+            if kind == self.COLUMN:
+                names.append(spec[0])
+            elif kind == self.NESTED:
+                names.append(spec[0])
+                names.extend(column for _, column, _ in spec[1])
+        names = dict.fromkeys([*names, *extra_fields])
+        return queryset.prefetch_related(None).values(*names)
+
+    def serialize(self, rows):
+        rows = list(rows)
+        pk_name = self.model._meta.pk.name
+        pks = [row[pk_name] for row in rows]
+        related = {name: self._related(*spec, pks) for name, kind, spec in self.layout if kind == self.MANY}
+        data = []
+        for row, pk in zip(rows, pks):
+            item = {}
+            for name, kind, spec in self.layout:
+                if kind == self.COLUMN:
+                    value = row[spec[0]]
+                    convert = spec[1]
+                    item[name] = value if convert is None or value is None else convert(value)
+                elif kind == self.NESTED:
+                    if row[spec[0]] is None:
+                        item[name] = None
+                    else:
+                        item[name] = _represent([row[column] for _, column, _ in spec[1]], spec[1])
+                else:
+                    item[name] = related[name].get(pk, [])
+            data.append(item)
+        return data
+
+    def _related(self, model_field, columns, pks):
+        """``{pk: [related item, ...]}``: the links of the page, then each related row once."""
+        through = model_field.remote_field.through
+        source, target = model_field.m2m_field_name(), model_field.m2m_reverse_field_name()
+        related_model = model_field.related_model
+        # the order a prefetch of the relation would give
+        ordering = related_model._meta.ordering
+        if not ordering or not all(isinstance(name, str) for name in ordering):
+            ordering = ["pk"]
+        ordering = [
+            f"-{target}__{name[1:]}" if name.startswith("-") else f"{target}__{name}" for name in ordering
+        ]
+        links = list(
+            through._default_manager.filter(**{f"{source}_id__in": pks})
+            .order_by(*ordering)
+            .values_list(f"{source}_id", f"{target}_id")
+        )
+        grouped = {}
+        if columns is None:
+            for owner, related_pk in links:
+                grouped.setdefault(owner, []).append(related_pk)
+            return grouped
+
+        rows = related_model._default_manager.filter(pk__in={related_pk for _, related_pk in links})
+        items = {
+            related_pk: _represent(values, columns)
+            for related_pk, *values in rows.values_list("pk", *(column for _, column, _ in columns))
+        }
+        for owner, related_pk in links:
+            grouped.setdefault(owner, []).append(dict(items[related_pk]))
+        return grouped
+
+
+def _relation(model, field):
+    try:
+        return model._meta.get_field(field.source)
+    except FieldDoesNotExist:
+        return None
+
+
+def values_plan(serializer):
+    """
+    ``ValuesPlan`` for a (non-``many``) ModelSerializer instance, or None
+    when it has fields that need model instances: method fields, dotted
+    sources, reverse relations, nested serializers more than one level
+    deep and the like.
+    """
+    model = serializer.Meta.model
+    layout = []
+    for field in _readable(serializer):
+        if isinstance(field, serializers.ModelSerializer):
+            model_field = _relation(model, field)
+            if model_field is None or not model_field.concrete or not model_field.is_relation:
+                return None
+            if not (model_field.many_to_one or model_field.one_to_one):
+                return None
+            columns = _columns(field.Meta.model, _readable(field))
+            if columns is None:
+                return None
+            columns = [(name, f"{field.source}__{column}", convert) for name, column, convert in columns]
+            layout.append((field.field_name, ValuesPlan.NESTED, (model_field.attname, columns)))
+            continue
+        if not isinstance(field, (serializers.ListSerializer, serializers.ManyRelatedField)):
+            columns = _columns(model, [field])
+            if columns is None:
+                return None
+            name, column, convert = columns[0]
+            layout.append((name, ValuesPlan.COLUMN, (column, convert)))
+            continue
+        model_field = _relation(model, field)
+        if model_field is None or not (model_field.many_to_many and model_field.concrete):
+            return None
+        if isinstance(field, serializers.ManyRelatedField):
+            if field.child_relation.pk_field is not None:
+                return None
+            layout.append((field.field_name, ValuesPlan.MANY, (model_field, None)))
+            continue
+        if not isinstance(field.child, serializers.ModelSerializer):
+            return None
+        columns = _columns(field.child.Meta.model, _readable(field.child))
+        if columns is None:
+            return None
+        layout.append((field.field_name, ValuesPlan.MANY, (model_field, columns)))
+    return ValuesPlan(model, layout)
+
+
+class ValuesListMixin:
+    """
+    List actions serialize pages through ``values_plan`` when the
+    serializer allows it, falling back to the serializer otherwise. The
+    serializer stays the only place that lists the fields. Both paths, and
+    ``serialize_object``, are timed as the request's serialization.
+    """
+
+    def serialize_page(self, queryset):
+        """Paginate ``queryset`` and return the serialized rows of the page."""
+        plan = values_plan(self.get_serializer())
+        if plan is None:
+            page = self.paginate_queryset(queryset)
+            with timed_serialization():
+                return self.get_serializer(page, many=True).data
+        ordering = [field.lstrip("-") for field in getattr(self, "keyset_ordering", ())]
+        page = self.paginate_queryset(plan.queryset(queryset, extra_fields=ordering))
+        with timed_serialization():
+            return plan.serialize(page)
+
+    def serialize_object(self, instance):
+        with timed_serialization():
+            return self.get_serializer(instance).data